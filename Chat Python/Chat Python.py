@@ -1,26 +1,22 @@
-import nltk
-import json
-from nltk.chat.util import Chat, reflections
+import os
+import argparse
+from chat_corpus import DEFAULT_CORPUS, load_intents, flatten_pairs
+from chat_reload import CorpusWatcher
+from chat_server import ChatEngine, Session
+
+# 语料路径：可用环境变量 CHAT_PYTHON_CORPUS 或命令行参数 --corpus 指定
+CORPUS_PATH = os.environ.get('CHAT_PYTHON_CORPUS', DEFAULT_CORPUS)
 
 # 读取聊天机器人的响应规则从 JSON 文件
-def load_chat_pairs(filename='The_path_to_the_folder/Chat Python/Chat Python training files/chat_pairs.json'):
-    with open(filename, 'r', encoding='utf-8') as file:
-        data = json.load(file)
-        pairs = []
-        
-        for item in data['pairs']:
-            patterns = item.get('patterns', [])
-            responses = item.get('responses', [])
-            
-            for pattern in patterns:
-                pairs.append((pattern, responses))  # 创建 (模式, 响应) 的元组
-        
-        return pairs
+def load_chat_pairs(filename=CORPUS_PATH):
+    return flatten_pairs(load_intents(filename))  # [(模式, 响应), ...]
 
 # 创建聊天机器人
-def chatbot():
-    # 加载聊天对话语料
-    pairs = load_chat_pairs()
+def chatbot(corpus_path=CORPUS_PATH, timings=False):
+    # 加载聊天对话语料（优先读取 chat_pairs.idx 缓存，nltk 只在需要时才导入）
+    # JSON 修改后会在后台重新加载，无需重启
+    # 与多会话服务器共用 ChatEngine，context 跟进规则在控制台下同样生效
+    engine = ChatEngine(CorpusWatcher(corpus_path).start(), timings)
 
     print("   @@@@@@@@@@@@@@@@@    ")
     print("@                                                                        @")
@@ -37,16 +33,20 @@ def chatbot():
     print("")
     print("Chat Python")
     print('Hello! I am Chat Python the ChatBot. Enter "quit" to exit Chat Python. ')
-    chat = Chat(pairs, reflections)  # 这里使用处理后的 pairs 变量
-    username = input("Please enter your username first: ")
+    session = Session(input("Please enter your username first: "))
     
     while True:
-        user_input = input(f"{username}: ")  # 使用格式化字符串传递用户名作为提示信息
+        user_input = input(f"{session.username}: ")  # 使用格式化字符串传递用户名作为提示信息
         if user_input == "quit":
             break
         
-        response = chat.respond(user_input)
-        print("Chat Python: ", response)
+        # 上一轮回答带 context 时先交给对应 tag，否则先按正则匹配（与 nltk 的
+        # Chat 结果相同），匹配不到时做模糊意图识别
+        print("Chat Python: ", engine.reply(session, user_input))
 
 if __name__ == "__main__":
-    chatbot()
+    parser = argparse.ArgumentParser(description="Chat Python")
+    parser.add_argument('--corpus', default=CORPUS_PATH, help="chat_pairs.json 路径")
+    parser.add_argument('--timings', action='store_true', help="在 stderr 输出每条消息的响应耗时")
+    args = parser.parse_args()
+    chatbot(args.corpus, args.timings)
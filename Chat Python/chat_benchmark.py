@@ -0,0 +1,140 @@
+import argparse
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+from chat_corpus import build_artifact, load_artifact, load_intents, build_models
+
+SYLLABLES = ["ba", "ko", "ri", "mu", "te", "sa", "lo", "pe", "ni", "da",
+             "vu", "ge", "zo", "hi", "fa", "ju", "we", "qi", "xo", "ye"]
+
+
+def synth_word(rng):
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 3)))
+
+
+def synth_corpus(n_patterns, patterns_per_tag=10, seed=0):
+    """生成与 chat_pairs.json 结构相同、约 n_patterns 条模式的语料"""
+    rng = random.Random(seed)
+    vocab = [synth_word(rng) for _ in range(max(200, n_patterns // 5))]
+    pairs = []
+    for t in range(max(1, n_patterns // patterns_per_tag)):
+        patterns = [" ".join(rng.choice(vocab) for _ in range(rng.randint(2, 6)))
+                    for _ in range(patterns_per_tag)]
+        pairs.append({"tag": "tag{}".format(t), "patterns": patterns,
+                      "responses": ["response {}".format(t)], "context": [""]})
+    pairs.append({"tag": "noanswer", "patterns": [], "responses": ["?"], "context": [""]})
+    return {"pairs": pairs}
+
+
+def synth_messages(intents, count, seed=1):
+    """回放用消息：1/3 原样命中，1/3 带拼写错误，1/3 随机词"""
+    rng = random.Random(seed)
+    patterns = [p for item in intents for p in item["patterns"]]
+    messages = []
+    for i in range(count):
+        text = rng.choice(patterns)
+        if i % 3 == 1:
+            pos = rng.randrange(len(text))
+            text = text[:pos] + text[pos + 1:]
+        elif i % 3 == 2:
+            text = " ".join(synth_word(rng) for _ in range(3))
+        messages.append(text)
+    return messages
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    pick = lambda p: samples[min(len(samples) - 1, int(len(samples) * p / 100))]
+    return pick(50) * 1e6, pick(99) * 1e6
+
+
+def time_each(fn, messages):
+    """先完整跑一遍预热（正则按需编译），再逐条计时"""
+    for text in messages:
+        fn(text)
+    samples = []
+    for text in messages:
+        start = time.perf_counter()
+        fn(text)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def bench_corpus(json_path, messages, with_nltk=False):
+    result = {}
+    intents = load_intents(json_path)
+    result["patterns"] = sum(len(item["patterns"]) for item in intents)
+
+    start = time.perf_counter()
+    build_artifact(json_path)
+    result["build_s"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matcher, classifier = load_artifact(json_path)
+    result["startup_s"] = time.perf_counter() - start
+
+    tracemalloc.start()
+    models = build_models(intents)
+    result["memory_mb"] = tracemalloc.get_traced_memory()[0] / 2 ** 20
+    tracemalloc.stop()
+    del models
+
+    result["match_us"] = percentiles(time_each(matcher.match, messages))
+    result["classify_us"] = percentiles(time_each(classifier.predict, messages))
+    if with_nltk:
+        from nltk.chat.util import Chat
+        chat = Chat([(p, item["responses"]) for item in intents for p in item["patterns"]])
+        result["nltk_us"] = percentiles(time_each(chat.respond, messages))
+    return result
+
+
+def print_result(r):
+    line = ("{patterns:>7} 模式 | 构建 {build_s:7.2f}s | 启动 {startup_s:7.3f}s | "
+            "内存 {memory_mb:7.1f}MB | 正则 p50/p99 {m[0]:8.1f}/{m[1]:8.1f}µs | "
+            "意图 p50/p99 {c[0]:8.1f}/{c[1]:8.1f}µs").format(
+        m=r["match_us"], c=r["classify_us"], **r)
+    if "nltk_us" in r:
+        line += " | nltk p50/p99 {:8.1f}/{:8.1f}µs".format(*r["nltk_us"])
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chat Python 匹配性能基准")
+    parser.add_argument("--sizes", default="100,1000,10000,100000",
+                        help="合成语料的模式数量，逗号分隔")
+    parser.add_argument("--messages", type=int, default=1000, help="每个语料回放的消息数")
+    parser.add_argument("--log", help="回放的消息日志（每行一条），默认从语料合成")
+    parser.add_argument("--corpus", help="同时测试指定的 chat_pairs.json")
+    parser.add_argument("--nltk", action="store_true", help="对比 nltk 的 Chat.respond")
+    args = parser.parse_args()
+
+    log = None
+    if args.log:
+        with open(args.log, encoding="utf-8") as f:
+            log = [line.rstrip("\n") for line in f if line.strip()]
+
+    tmp_dir = tempfile.mkdtemp(prefix="chat_bench_")
+    try:
+        targets = []
+        if args.corpus:
+            targets.append(args.corpus)
+        for size in [int(s) for s in args.sizes.split(",") if s]:
+            path = os.path.join(tmp_dir, "corpus_{}.json".format(size))
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(synth_corpus(size), f)
+            targets.append(path)
+
+        for path in targets:
+            messages = log or synth_messages(load_intents(path), args.messages)
+            print_result(bench_corpus(path, messages, args.nltk))
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+if __name__ == "__main__":
+    main()
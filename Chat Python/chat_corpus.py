@@ -0,0 +1,113 @@
+import json
+import os
+import pickle
+import struct
+import sys
+
+from chat_matcher import PatternMatcher
+from chat_intent import IntentClassifier
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                              'Chat Python training files', 'chat_pairs.json')
+
+# 缓存文件格式：MAGIC + 头部（版本号、源 JSON 的 mtime_ns 和大小）+ pickle 数据
+# 修改 PatternMatcher / IntentClassifier 的内部结构时需要递增 ARTIFACT_VERSION
+MAGIC = b"CHATPYIX"
+ARTIFACT_VERSION = 3
+HEADER = struct.Struct("<8sHqq")
+
+
+def artifact_path(json_path):
+    """缓存文件与 chat_pairs.json 放在同一目录：chat_pairs.idx"""
+    return os.path.splitext(json_path)[0] + ".idx"
+
+
+def load_intents(json_path):
+    with open(json_path, 'r', encoding='utf-8') as file:
+        return json.load(file)['pairs']
+
+
+def flatten_pairs(intents):
+    """把按 tag 分组的意图展开为 [(模式, 响应列表), ...]"""
+    return [(pattern, item.get('responses', []))
+            for item in intents for pattern in item.get('patterns', [])]
+
+
+def build_models(intents, ngram_cache=None, previous=None):
+    """构建 (matcher, classifier)；previous 为上一版模型时沿用其中未变化的桶正则"""
+    matcher = PatternMatcher(flatten_pairs(intents))
+    if previous is not None:
+        matcher.reuse_compiled(previous[0])
+    return matcher, IntentClassifier(intents, ngram_cache=ngram_cache)
+
+
+def _source_stamp(json_path):
+    stat = os.stat(json_path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def write_artifact(models, json_path, out_path=None, stamp=None):
+    """把 (matcher, classifier) 写入缓存文件；先写临时文件再替换，读者不会读到半个文件
+
+    stamp 为读取 JSON 之前记录的 (mtime_ns, 大小)，避免构建期间文件
+    再次变化时把旧内容标记为最新。
+    """
+    out_path = out_path or artifact_path(json_path)
+    mtime_ns, size = stamp or _source_stamp(json_path)
+    tmp_path = out_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, ARTIFACT_VERSION, mtime_ns, size))
+        pickle.dump(models, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, out_path)
+    return out_path
+
+
+def build_artifact(json_path, out_path=None):
+    """从 JSON 构建匹配器与分类器并写入缓存文件，返回 (matcher, classifier)"""
+    stamp = _source_stamp(json_path)
+    models = build_models(load_intents(json_path))
+    write_artifact(models, json_path, out_path, stamp)
+    return models
+
+
+def load_artifact(json_path, path=None):
+    """缓存存在、版本一致且比 JSON 新时，读取并返回 (matcher, classifier)，否则返回 None
+
+    先只读头部做校验，再用 pickle.load 直接从文件流反序列化。整个对象
+    图仍会完整地载入内存；缓存省掉的是 JSON 解析和 n-gram、倒排表的构建。
+    """
+    path = path or artifact_path(json_path)
+    try:
+        if os.path.getmtime(path) < os.path.getmtime(json_path):
+            return None
+        with open(path, "rb") as f:
+            magic, version, mtime_ns, size = HEADER.unpack(f.read(HEADER.size))
+            if (magic, version) != (MAGIC, ARTIFACT_VERSION):
+                return None
+            if (mtime_ns, size) != _source_stamp(json_path):
+                return None
+            return pickle.load(f)
+    except (OSError, ValueError, struct.error, pickle.UnpicklingError, EOFError):
+        return None
+
+
+def load_models(json_path):
+    """优先读取缓存，缓存过期或损坏时重新构建并写回"""
+    models = load_artifact(json_path)
+    if models is None:
+        stamp = _source_stamp(json_path)
+        models = build_models(load_intents(json_path))
+        try:
+            write_artifact(models, json_path, stamp=stamp)
+        except OSError:
+            pass  # 目录只读时不写缓存
+    return models
+
+
+if __name__ == "__main__":
+    # 构建步骤：python chat_corpus.py <chat_pairs.json>
+    if len(sys.argv) != 2:
+        print("用法: python chat_corpus.py <chat_pairs.json>")
+        sys.exit(1)
+    build_artifact(sys.argv[1])
+    print("已生成: {}".format(artifact_path(sys.argv[1])))
@@ -0,0 +1,150 @@
+import heapq
+import math
+import random
+import re
+from array import array
+from collections import Counter, defaultdict
+
+_NON_WORD = re.compile(r"[^\w\s]+")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize(text):
+    """小写、去标点、合并空白，并在两端补空格以便提取词首/词尾 n-gram"""
+    text = _SPACES.sub(" ", _NON_WORD.sub(" ", text.lower())).strip()
+    return " {} ".format(text)
+
+
+def char_ngrams(text, ngram_range=(2, 4)):
+    text = normalize(text)
+    low, high = ngram_range
+    return Counter(text[i:i + n] for n in range(low, high + 1)
+                   for i in range(len(text) - n + 1))
+
+
+class IntentClassifier:
+    """基于字符 n-gram TF-IDF 的意图分类器
+
+    载入时把所有 patterns 向量化，同一 tag 的模式向量求和并归一化为该
+    意图的中心向量，再按 n-gram 建立倒排表，相当于一个按列存储的稀疏
+    矩阵（n-gram → (意图序号数组, 权重数组)）。出现在超过 max_df 比例模式
+    中的 n-gram 区分度很低，直接丢弃。
+
+    分类时按倒排表从短到长（即从罕见到常见）累加查询 n-gram 的得分，
+    累计读取的倒排项超过 max_postings 后停止，再对得分最高的 candidates
+    个意图用完整查询向量精确计算余弦相似度。因此每条消息的开销有上限，
+    不随语料规模增长。
+
+    最高得分不低于 threshold 时直接采用；得分不低于 min_score 且至少是
+    第二名的 margin 倍（只明显指向一个意图，如 "thx so much"）时也采用；
+    否则回退到 fallback_tag（默认 noanswer）。
+
+    ngram_cache 为 {tag: (patterns 元组, [Counter, ...])}，传入上一次构建
+    使用的缓存后，patterns 未变化的 tag 不再重新提取 n-gram，缓存会被
+    原地更新。
+    """
+
+    def __init__(self, intents, ngram_range=(2, 4), threshold=0.35, min_score=0.18,
+                 margin=2.0, max_df=0.5, max_postings=2000, candidates=16,
+                 fallback_tag="noanswer", ngram_cache=None):
+        self.ngram_range = ngram_range
+        self.threshold = threshold
+        self.min_score = min_score
+        self.margin = margin
+        self.max_postings = max_postings
+        self.candidates = candidates
+        self.fallback_tag = fallback_tag
+        self.responses = {item['tag']: item.get('responses', []) for item in intents}
+        # 回答某个 tag 后，下一条消息应交给哪个 tag 处理（空串表示无后续）
+        self.contexts = {item['tag']: (item.get('context') or [''])[0] for item in intents}
+        self.row_tags = []  # 与 flatten_pairs 展开后的模式顺序一致
+        self.tags = []      # 有模式的意图，序号即倒排表中的意图序号
+
+        if ngram_cache is None:
+            ngram_cache = {}
+        rows = []
+        for item in intents:
+            patterns = tuple(item.get('patterns', []))
+            cached = ngram_cache.get(item['tag'])
+            if cached is None or cached[0] != patterns:
+                cached = ngram_cache[item['tag']] = (
+                    patterns, [char_ngrams(p, ngram_range) for p in patterns])
+            rows.extend(cached[1])
+            self.row_tags.extend([item['tag']] * len(patterns))
+
+        df = Counter(gram for row in rows for gram in row)
+        n_rows = len(rows)
+        self.idf = {gram: math.log((1 + n_rows) / (1 + count)) + 1
+                    for gram, count in df.items() if count <= max_df * n_rows}
+
+        centroids = {}
+        for tag, row in zip(self.row_tags, rows):
+            centroid = centroids.get(tag)
+            if centroid is None:
+                centroid = centroids[tag] = Counter()
+                self.tags.append(tag)
+            centroid.update(self._weigh(row))
+
+        self.centroids = []  # 与 tags 对应的 {n-gram: 权重}，用于精确重算
+        self.columns = {}
+        for tag_id, tag in enumerate(self.tags):
+            centroid = centroids[tag]
+            norm = math.sqrt(sum(w * w for w in centroid.values()))
+            centroid = {gram: weight / norm for gram, weight in centroid.items()}
+            self.centroids.append(centroid)
+            for gram, weight in centroid.items():
+                column = self.columns.get(gram)
+                if column is None:
+                    column = self.columns[gram] = (array('I'), array('d'))
+                column[0].append(tag_id)
+                column[1].append(weight)
+
+    def _weigh(self, counts):
+        """次线性 TF × IDF，再做 L2 归一化；未见过或被丢弃的 n-gram 不计"""
+        vec = {gram: (1 + math.log(tf)) * self.idf[gram]
+               for gram, tf in counts.items() if gram in self.idf}
+        norm = math.sqrt(sum(w * w for w in vec.values()))
+        if not norm:
+            return {}
+        return {gram: w / norm for gram, w in vec.items()}
+
+    def scores(self, text):
+        """返回 {意图序号: 与中心向量的余弦相似度}，只含候选意图"""
+        query = self._weigh(char_ngrams(text, self.ngram_range))
+        columns = self.columns
+        partial = defaultdict(float)
+        budget = self.max_postings
+        for gram in sorted(query, key=lambda g: len(columns[g][0])):
+            tag_ids, weights = columns[gram]
+            if partial and len(tag_ids) > budget:
+                break
+            budget -= len(tag_ids)
+            q = query[gram]
+            for tag_id, weight in zip(tag_ids, weights):
+                partial[tag_id] += q * weight
+        top = heapq.nlargest(self.candidates, partial, key=partial.get)
+        return {tag_id: sum(q * self.centroids[tag_id].get(gram, 0.0)
+                            for gram, q in query.items())
+                for tag_id in top}
+
+    def classify(self, text, k=3):
+        """返回得分最高的 k 个意图 [(tag, 得分), ...]"""
+        top = heapq.nlargest(k, self.scores(text).items(), key=lambda item: item[1])
+        return [(self.tags[tag_id], score) for tag_id, score in top]
+
+    def predict(self, text):
+        """返回 (tag, 得分)，置信度不足时返回 (fallback_tag, 得分)"""
+        top = self.classify(text, k=2)
+        if not top:
+            return self.fallback_tag, 0.0
+        tag, score = top[0]
+        runner_up = top[1][1] if len(top) > 1 else 0.0
+        if score >= self.threshold or (
+                score >= self.min_score and score >= self.margin * runner_up):
+            return tag, score
+        return self.fallback_tag, score
+
+    def respond(self, text):
+        tag, _ = self.predict(text)
+        responses = self.responses.get(tag)
+        return random.choice(responses) if responses else None
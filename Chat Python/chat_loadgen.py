@@ -0,0 +1,68 @@
+import argparse
+import asyncio
+import random
+import time
+
+from chat_corpus import DEFAULT_CORPUS, load_intents
+
+
+def sample_messages(corpus, extra=("hii", "thx so much", "qwerty", "byee")):
+    """从语料中取测试消息，另加几条需要模糊匹配或无法回答的消息"""
+    messages = [p for item in load_intents(corpus) for p in item.get('patterns', [])]
+    return messages + list(extra)
+
+
+async def run_client(host, port, messages, count, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(b'loadgen\n')
+    await writer.drain()
+    await reader.readline()  # 欢迎语
+
+    for _ in range(count):
+        text = random.choice(messages)
+        start = time.perf_counter()
+        writer.write((text + '\n').encode('utf-8'))
+        await writer.drain()
+        await reader.readline()
+        latencies.append(time.perf_counter() - start)
+
+    writer.write(b'quit\n')
+    await writer.drain()
+    writer.close()
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p / 100))]
+
+
+async def run(host, port, clients, count, corpus):
+    messages = sample_messages(corpus)
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(run_client(host, port, messages, count, latencies)
+                           for _ in range(clients)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print("会话数: {}  消息数: {}  用时: {:.2f}s".format(clients, len(latencies), elapsed))
+    print("吞吐量: {:.0f} 条/秒".format(len(latencies) / elapsed))
+    print("延迟 p50: {:.2f}ms  p99: {:.2f}ms  max: {:.2f}ms".format(
+        percentile(latencies, 50) * 1000, percentile(latencies, 99) * 1000,
+        latencies[-1] * 1000 if latencies else 0))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chat Python 服务器压测")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--clients', type=int, default=100, help="并发会话数")
+    parser.add_argument('--messages', type=int, default=100, help="每个会话发送的消息数")
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS, help="用于抽取测试消息的 chat_pairs.json")
+    args = parser.parse_args()
+    asyncio.run(run(args.host, args.port, args.clients, args.messages, args.corpus))
+
+
+if __name__ == "__main__":
+    main()
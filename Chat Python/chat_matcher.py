@@ -0,0 +1,184 @@
+import random
+import re
+
+# 正则元字符：模式的字面量前缀到这些字符为止
+_META = set('.^$*+?{}[]\\|()')
+_QUANTIFIERS = set('?*{')
+
+
+def literal_prefix(pattern):
+    """返回模式开头的字面量部分（小写），用于建立索引
+
+    只要模式里出现 '|'，就无法保证所有分支共享前缀，此时返回空串。
+    """
+    if '|' in pattern:
+        return ''
+    prefix = []
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if c == '\\' and i + 1 < len(pattern) and not pattern[i + 1].isalnum():
+            c = pattern[i + 1]
+            i += 1
+        elif c in _META:
+            break
+        if i + 1 < len(pattern) and pattern[i + 1] in _QUANTIFIERS:
+            break  # 后面跟着量词，这个字符可有可无
+        if not (c.isascii() or c.lower() == c.upper()):
+            break  # 有大小写的非 ASCII 字符，lower() 后长度可能变化
+        prefix.append(c)
+        i += 1
+    return ''.join(prefix).lower()
+
+
+def nltk_reflections():
+    """按需导入 nltk，只在第一次需要替换 %1 等通配符时才付出导入开销"""
+    from nltk.chat.util import reflections
+    return reflections
+
+
+class PatternMatcher:
+    """与 nltk.chat.util.Chat 行为一致的响应匹配器
+
+    所有模式按字面量前缀的前 prefix_len 个字符分桶，每个桶预编译成一个
+    大的分支正则。一条消息最多查 prefix_len + 1 个桶，因此匹配耗时
+    基本不随语料规模增长；多个桶都命中时取原始顺序最靠前的模式，
+    结果与 Chat 逐条尝试完全相同。
+
+    正则只在第一次用到时编译，序列化时也只保存模式字符串和分桶表，
+    因此从缓存文件恢复几乎没有启动开销。reflections 为 None 时使用
+    nltk 的默认表（延迟导入）。
+    """
+
+    def __init__(self, pairs, reflections=None, prefix_len=4):
+        self.prefix_len = prefix_len
+        self._sources = [p for p, _ in pairs]
+        self._responses = [r for _, r in pairs]
+        self._reflections = reflections
+
+        self._bucket_orders = {}
+        for order, pattern in enumerate(self._sources):
+            key = literal_prefix(pattern)[:prefix_len]
+            self._bucket_orders.setdefault(key, []).append(order)
+        self._reset_caches()
+
+    def _reset_caches(self):
+        self._patterns = {}
+        self._buckets = {}
+        self._regex = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for cache in ('_patterns', '_buckets', '_regex'):
+            del state[cache]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._reset_caches()
+
+    def _pattern(self, order):
+        pattern = self._patterns.get(order)
+        if pattern is None:
+            pattern = self._patterns[order] = re.compile(self._sources[order], re.IGNORECASE)
+        return pattern
+
+    def _bucket(self, key):
+        """返回 (合并后的分支正则, 模式序号列表)，合并失败时正则为 None"""
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            orders = self._bucket_orders.get(key)
+            if orders is None:
+                return None
+            bucket = self._buckets[key] = (self._compile_bucket(orders), orders)
+        return bucket
+
+    def _compile_bucket(self, orders):
+        """分支按桶内位置命名（p0, p1, ...），正则只取决于桶内的模式字符串"""
+        try:
+            return re.compile('|'.join(
+                '(?P<p{}>{})'.format(i, self._sources[order])
+                for i, order in enumerate(orders)), re.IGNORECASE)
+        except re.error:
+            return None
+
+    def reuse_compiled(self, previous):
+        """从上一版匹配器接过模式字符串完全相同的桶里已编译的正则
+
+        热重载时只有内容变化的桶需要重新编译，其余桶即使模式序号整体
+        平移也可以直接沿用。previous 仍可能被其他线程使用，这里只读取它
+        缓存的副本。
+        """
+        compiled = dict(previous._buckets)
+        for key, orders in self._bucket_orders.items():
+            old = compiled.get(key)
+            if old is None or len(old[1]) != len(orders):
+                continue
+            if all(previous._sources[a] == self._sources[b]
+                   for a, b in zip(old[1], orders)):
+                self._buckets[key] = (old[0], orders)
+
+    def _compile_reflections(self):
+        if self._reflections is None:
+            self._reflections = nltk_reflections()
+        sorted_refl = sorted(self._reflections, key=len, reverse=True)
+        return re.compile(
+            r"\b({})\b".format("|".join(map(re.escape, sorted_refl))), re.IGNORECASE
+        )
+
+    def _substitute(self, text):
+        if self._regex is None:
+            self._regex = self._compile_reflections()
+        return self._regex.sub(
+            lambda mo: self._reflections[mo.string[mo.start():mo.end()]], text.lower())
+
+    def _wildcards(self, response, match):
+        pos = response.find("%")
+        while pos >= 0:
+            num = int(response[pos + 1:pos + 2])
+            response = (response[:pos] + self._substitute(match.group(num))
+                        + response[pos + 2:])
+            pos = response.find("%")
+        return response
+
+    def match(self, text):
+        """返回 (模式序号, re.Match)，没有匹配时返回 None"""
+        lowered = text.lower()
+        best = None
+        for length in range(min(self.prefix_len, len(lowered)) + 1):
+            bucket = self._bucket(lowered[:length])
+            if bucket is None:
+                continue
+            combined, orders = bucket
+            if combined is not None:
+                m = combined.match(text)
+                if m is None:
+                    continue
+                order = orders[int(m.lastgroup[1:])]
+            else:
+                order = next((o for o in orders if self._pattern(o).match(text)), None)
+                if order is None:
+                    continue
+            if best is None or order < best:
+                best = order
+        if best is None:
+            return None
+        return best, self._pattern(best).match(text)
+
+    def respond(self, text):
+        """与 Chat.respond 相同：随机选一条响应并替换 %1 等通配符"""
+        found = self.match(text)
+        if found is None:
+            return None
+        return self.render(*found)
+
+    def render(self, order, match):
+        """根据 match() 的结果生成响应文本"""
+        resp = random.choice(self._responses[order])
+        resp = self._wildcards(resp, match)
+
+        if resp[-2:] == "?.":
+            resp = resp[:-2] + "."
+        if resp[-2:] == "??":
+            resp = resp[:-2] + "?"
+        return resp
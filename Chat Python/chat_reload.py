@@ -0,0 +1,77 @@
+import os
+import threading
+
+from chat_corpus import load_intents, build_models, load_models, write_artifact
+
+
+class CorpusWatcher:
+    """监视 chat_pairs.json，文件变化时在后台线程重建匹配器
+
+    models 始终是一个完整的 (matcher, classifier) 元组，重建完成后整体
+    替换（单次属性赋值是原子的），读者每条消息取一次 models 即可，
+    不会被重建阻塞，也不会看到新旧混合的状态。
+
+    重建时复用上一次按 tag 缓存的 n-gram，只有 patterns 变化的 tag 才重新
+    提取；匹配器中模式字符串没变的桶直接沿用已编译的正则。分类器的 IDF
+    和归一化取决于全部模式，任何改动都会影响所有权重，因此中心向量和
+    倒排表每次都完整重算（10 万条模式约 8 秒，在后台线程进行）。
+    """
+
+    def __init__(self, json_path, interval=1.0, on_reload=None):
+        self.json_path = json_path
+        self.interval = interval
+        self.on_reload = on_reload
+        self._ngram_cache = {}
+        self._stamp = self._current_stamp()
+        self.models = load_models(json_path)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _current_stamp(self):
+        try:
+            stat = os.stat(self.json_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def check(self):
+        """文件有变化时重建，返回是否完成了一次替换"""
+        stamp = self._current_stamp()
+        if stamp is None or stamp == self._stamp:
+            return False
+        try:
+            intents = load_intents(self.json_path)
+        except (OSError, ValueError, KeyError):
+            return False  # 文件正在写入或格式有误，保留旧索引，下次再试
+
+        models = build_models(intents, self._ngram_cache, self.models)
+        tags = {item['tag'] for item in intents}
+        for tag in list(self._ngram_cache):
+            if tag not in tags:
+                del self._ngram_cache[tag]
+
+        self.models = models
+        self._stamp = stamp
+        try:
+            write_artifact(models, self.json_path, stamp=stamp)
+        except OSError:
+            pass
+        if self.on_reload is not None:
+            self.on_reload(self)
+        return True
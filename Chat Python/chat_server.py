@@ -0,0 +1,112 @@
+import argparse
+import asyncio
+import random
+import sys
+import time
+
+from chat_corpus import DEFAULT_CORPUS
+from chat_reload import CorpusWatcher
+
+
+class Session:
+    """单个连接的会话状态"""
+    __slots__ = ('username', 'context', 'messages')
+
+    def __init__(self, username):
+        self.username = username
+        self.context = ''   # chat_pairs.json 中的 context：下一条消息交给哪个 tag
+        self.messages = 0
+
+
+class ChatEngine:
+    """所有连接共享的只读匹配器：正则匹配 → 模糊意图识别 → 上下文跟进
+
+    source 为带 models 属性（(matcher, classifier) 元组）的对象，例如
+    CorpusWatcher；每条消息只读取一次 models，热更新时不会用到一半旧一半新。
+    """
+
+    def __init__(self, source, timings=False):
+        self.source = source
+        self.timings = timings
+
+    def reply(self, session, text):
+        if not self.timings:
+            return self._reply(session, text)
+        start = time.perf_counter()
+        response = self._reply(session, text)
+        print("[timing] {} {:.1f}µs".format(
+            session.username, (time.perf_counter() - start) * 1e6), file=sys.stderr)
+        return response
+
+    def _reply(self, session, text):
+        session.messages += 1
+        matcher, classifier = self.source.models
+        responses = classifier.responses.get(session.context)
+        if responses:
+            tag = session.context
+            response = random.choice(responses)
+        else:
+            found = matcher.match(text)
+            if found is not None:
+                tag = classifier.row_tags[found[0]]
+                response = matcher.render(*found)
+            else:
+                tag, _ = classifier.predict(text)
+                candidates = classifier.responses.get(tag)
+                response = random.choice(candidates) if candidates else None
+        session.context = classifier.contexts.get(tag, '')
+        return response
+
+
+async def handle_client(engine, reader, writer):
+    """按行通信：第一行为用户名，之后每行一条消息，每条消息回复一行"""
+    try:
+        line = await reader.readline()
+        if not line:
+            return
+        session = Session(line.decode('utf-8', 'replace').strip() or 'guest')
+        writer.write('Hello {}! I am Chat Python the ChatBot.\n'.format(
+            session.username).encode('utf-8'))
+        await writer.drain()
+
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            text = line.decode('utf-8', 'replace').rstrip('\r\n')
+            if text == 'quit':
+                break
+            response = engine.reply(session, text)
+            writer.write('Chat Python: {}\n'.format(response).encode('utf-8'))
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(corpus, host='127.0.0.1', port=8765, timings=False):
+    watcher = CorpusWatcher(corpus, on_reload=lambda w: print("语料已重新加载: {}".format(corpus)))
+    engine = ChatEngine(watcher.start(), timings)
+    server = await asyncio.start_server(
+        lambda r, w: handle_client(engine, r, w), host, port)
+    print("Chat Python server listening on {}:{}".format(host, port))
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chat Python 多会话服务器")
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS, help="chat_pairs.json 路径")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--timings', action='store_true', help="在 stderr 输出每条消息的处理耗时")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.corpus, args.host, args.port, args.timings))
+    except KeyboardInterrupt:
+        print("\n服务器已停止")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,340 +1,76 @@
-# Author: Austin Li
-
-# Import necessary modules
-# ---- DO NOT CHANGE THE CODE BELOW UNTIL THE "STOP" LINE ----
-import turtle as t
-import math
-# ---- STOP ----
-
-t.title("港鐵路綫圖  MTR system map")    # The title of the window (RECOMMENDED: DO NOT CHANGE)
-t.bgcolor("white")    # The Background color (RECOMMENDED: DO NOT CHANGE)
-t.speed(0)    # The fastest speed for drawing (RECOMMENDED: DO NOT CHANGE unless you want to get a slower speed)
-t.pensize(5)    # DO NOT CHANGE
-
-# ---- For the best picture, DO NOT CHANGE THE CODE BELOW UNTIL THE "STOP" LINE ----
-# ---- Light Rail ----
-t.color("#DBB400")
-t.pensize(2)
-t.penup()
-t.goto(-525, 200)
-t.setheading(135)
-t.pendown()
-t.forward(10)
-t.setheading(90)
-t.forward(40)
-t.setheading(45)
-t.forward(10)
-t.setheading(315)
-t.pendown()
-t.forward(10)
-t.setheading(270)
-t.forward(40)
-t.setheading(225)
-t.forward(10)
-t.penup()
-t.goto(-525, 253)
-t.setheading(180)
-t.pendown()
-t.forward(35)
-t.setheading(270)
-t.forward(75)
-t.setheading(0)
-t.forward(35)
-t.setheading(90)
-t.forward(25)
-t.penup()
-t.goto(-532, 228)
-t.setheading(180)
-t.pendown()
-t.forward(29)
-t.penup()
-t.goto(-525, 200)
-t.setheading(180)
-t.pendown()
-t.forward(34)
-t.penup()
-t.goto(-525, 253)
-t.setheading(0)
-t.pendown()
-t.forward(15)
-t.setheading(90)
-t.forward(68)
-t.penup()
-t.goto(-510, 287)
-t.setheading(0)
-t.pendown()
-t.forward(10)
-t.setheading(270)
-t.forward(34)
-t.setheading(0)
-t.forward(15)
-t.penup()
-t.goto(-510, 321)
-t.setheading(180)
-t.pendown()
-t.forward(50)
-t.setheading(90)
-t.forward(34)
-t.setheading(0)
-t.forward(30)
-t.setheading(315)
-t.forward(14)
-t.setheading(270)
-t.forward(14)
-t.setheading(315)
-t.forward(14)
-t.penup()
-t.goto(-560, 338)
-t.setheading(0)
-t.pendown()
-t.forward(39)
-t.penup()
-
-# ---- High Speed Rail ----
-t.color("#9C948A")
-t.pensize(5)
-t.goto(-175, -70)
-t.setheading(90)
-t.pendown()
-t.forward(300)
-t.circle(45, 90)
-t.forward(90)
-t.circle(-45, 90)
-t.forward(500)
-t.penup()
-
-# ---- Disneyland Resort Line ----
-t.color("#EB6EA5")
-t.goto(-464, 0)
-t.pendown()
-t.setheading(50)
-t.forward(15)
-t.circle(-20, 135)
-t.setheading(270)
-t.forward(50)
-t.penup()
-
-# ---- Island Line ----
-t.color("#0B5FB4")
-t.goto(-400, -175)
-t.pendown()
-t.setheading(0)
-t.forward(750)
-corner_radius = 40
-t.circle(-corner_radius, 45)
-t.setheading(-45)
-t.forward(120)
-t.circle(-corner_radius, 45)
-t.setheading(-90)
-t.forward(75)
-t.penup()
-
-# ---- Kwun Tong Line ----
-t.color("#009F40")
-t.goto(205, -75)
-t.pendown()
-t.setheading(135)
-t.forward(20)
-t.circle(45, 35)
-t.setheading(180)
-t.forward(122)
-t.circle(-45, 90)
-t.setheading(90)
-t.forward(100)
-t.circle(-45, 90)
-t.setheading(0)
-t.forward(210)
-t.circle(-45, 90)
-t.forward(125)
-t.circle(45, 90)
-t.forward(10)
-t.penup()
-
-# ---- South Island Line ----
-t.color("#CBD401")
-t.goto(-50, -185)
-t.pendown()
-t.setheading(0)
-t.forward(75)
-t.circle(-45, 90)
-t.setheading(-90)
-t.forward(25)
-t.circle(-45, 90)
-t.setheading(180)
-t.forward(125)
-t.circle(45, 35)
-t.setheading(-145)
-t.forward(55)
-t.circle(-45, 35)
-t.setheading(180)
-t.forward(75)
-t.penup()
-
-# ---- Tseung Kwan O Line ----
-t.color("#7E3C93")
-t.goto(230, -170)
-t.pendown()
-t.setheading(0)
-t.forward(10)
-t.circle(45, 90)
-t.setheading(90)
-t.forward(2)
-t.circle(-45, 90)
-t.setheading(0)
-t.forward(75)
-t.circle(45, 90)
-t.setheading(90)
-t.forward(75)
-t.penup()
-t.goto(405, -77)
-t.pendown()
-t.setheading(0)
-t.circle(-45, 90)
-t.setheading(270)
-t.forward(20)
-t.penup()
-
-# ---- Tsuen Wan Line ----
-t.color("#E60012")
-t.goto(-125, -170)
-t.pendown()
-t.setheading(0)
-t.forward(75)
-t.circle(45, 90)
-t.setheading(90)
-t.forward(225)
-t.circle(45, 90)
-t.setheading(180)
-t.forward(425)
-t.penup()
-
-# ---- Tung Chung Line ----
-t.color("#F3992D")
-t.goto(-125, -155)
-t.pendown()
-t.setheading(180)
-t.forward(75)
-t.circle(-45, 90)
-t.forward(205)
-t.circle(45, 90)
-t.forward(50)
-t.circle(45, 50)
-t.forward(100)
-t.circle(35, 25)
-t.circle(-35, 25)
-t.forward(125)
-t.penup()
-
-# ---- Airport Express ----
-t.color("#00888F")
-t.goto(-125, -160)
-t.pendown()
-t.setheading(180)
-t.forward(75)
-t.circle(-50, 90)
-t.forward(200)
-t.circle(45, 90)
-t.forward(40)
-t.circle(50, 50)
-t.forward(100)
-t.circle(-35, 25)
-t.circle(35, 25)
-t.forward(75)
-t.circle(-20, 180)
-t.forward(40)
-t.penup()
-
-# ---- Tuen Ma Line ----
-t.color("#9C2E00")
-t.goto(-525, 200)
-t.pendown()
-t.setheading(90)
-t.forward(100)
-t.circle(-20, 180)
-t.setheading(270)
-t.forward(75)
-t.circle(45, 90)
-t.forward(155)
-t.circle(-45, 90)
-t.forward(50)
-t.circle(45, 35)
-t.forward(200)
-t.circle(45, 35)
-t.setheading(0)
-t.forward(136)
-t.circle(45, 35)
-t.forward(94)
-t.circle(-45, 35)
-t.circle(45, 35)
-t.forward(50)
-t.circle(45, 35)
-t.setheading(90)
-t.forward(125)
-t.circle(45, 90)
-t.forward(83)
-t.circle(-20, 90)
-t.forward(10)
-t.circle(-20, 90)
-t.forward(50)
-t.circle(20, 90)
-t.forward(80)
-t.circle(-20, 90)
-t.forward(225)
-t.penup()
-
-# ---- East Rail Line ----
-t.color("#5EB7E8")
-t.goto(-50, -180)
-t.pendown()
-t.setheading(0)
-t.forward(15)
-t.circle(45, 35)
-t.forward(125)
-t.setheading(60)
-t.circle(45, 35)
-t.setheading(90)
-t.forward(375)
-t.circle(45, 90)
-t.setheading(180)
-t.forward(200)
-t.penup()
-t.goto(-75, 345)
-t.setheading(270)
-t.pendown()
-t.circle(-45, 90)
-t.forward(80)
-def dashed_arc(radius, extent, dash_len, gap_len, pensize=8):
-    t.pensize(pensize)
-    arc_length = 2 * math.pi * radius * (extent / 360)
-    dash_count = int(arc_length / (dash_len + gap_len))
-
-    step_angle = extent / dash_count
-    step_arc = (dash_len / arc_length) * extent
-
-    for _ in range(dash_count):
-        
-        t.pendown()
-        t.circle(radius, step_arc)
-        t.penup()
-
-        t.circle(radius, step_angle - step_arc)
-
-
-t.penup()
-t.goto(100, 250)
-t.setheading(270)
-t.forward(0)
-t.setheading(0)
-
-dashed_arc(
-    radius=20,
-    extent=200,
-    dash_len=3,
-    gap_len=10,
-    pensize=5
-)
-t.penup()
-
-t.hideturtle()
-t.done()
-# ---- STOP ----
+# Author: Austin Li
+
+# Import necessary modules
+# ---- DO NOT CHANGE THE CODE BELOW UNTIL THE "STOP" LINE ----
+import sys
+import turtle as t
+from mtr_map import load_map, draw_map
+from mtr_stations import StationLayer, load_stations, draw_stations
+from mtr_routes import RouteFinder, draw_route
+# ---- STOP ----
+
+t.title("港鐵路綫圖  MTR system map")    # The title of the window (RECOMMENDED: DO NOT CHANGE)
+t.bgcolor("white")    # The Background color (RECOMMENDED: DO NOT CHANGE)
+
+# The lines (colors, paths, corner radii, dashes) are defined in mtr_lines.json.
+# Add or move lines there; this script does not need to change.
+map_data = load_map()
+draw_map(t, map_data)
+
+# Stations and interchanges (mtr_stations.json); click the map to identify a station or line
+layer = StationLayer(map_data, load_stations())
+draw_stations(t, layer)
+t.update()
+
+info = t.Turtle(visible=False)
+info.penup()
+route_pen = t.Turtle(visible=False)
+finder = RouteFinder(map_data, layer.stations)
+picked = []
+
+
+def identify(x, y):
+    info.clear()
+    text = layer.describe(x, y)
+    if text:
+        info.goto(x + 8, y + 8)
+        info.write(text, font=("Arial", 10, "bold"))
+    t.update()
+
+
+def show_route(origin, destination):
+    route_pen.clear()
+    info.clear()
+    route = finder.route(origin, destination)
+    if route is None:
+        return
+    draw_route(route_pen, finder, route)
+    x, y = finder.stations[destination]["pos"]
+    info.goto(x + 12, y + 12)
+    info.write(finder.describe(route), font=("Arial", 10, "bold"))
+    t.update()
+
+
+def pick(x, y):
+    # right-click the origin, then the destination
+    station = layer.nearest_station(x, y, 15)
+    if station is None:
+        return
+    picked.append(finder.find(station["id"]))
+    if len(picked) == 2:
+        show_route(*picked)
+        picked.clear()
+
+
+# python "Draw MTR route_map (2025).py" ORIGIN DESTINATION highlights that journey
+if len(sys.argv) == 3:
+    try:
+        show_route(finder.find(sys.argv[1]), finder.find(sys.argv[2]))
+    except KeyError as e:
+        print(e.args[0])
+elif len(sys.argv) != 1:
+    print('usage: python "Draw MTR route_map (2025).py" [ORIGIN DESTINATION]')
+
+t.onscreenclick(identify)
+t.onscreenclick(pick, btn=3)
+t.done()
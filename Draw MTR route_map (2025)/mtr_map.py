@@ -0,0 +1,188 @@
+# Data-driven renderer for the MTR route map: the lines live in mtr_lines.json,
+# this module only knows how to draw them.
+
+import json
+import math
+import os
+
+MAP_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mtr_lines.json")
+
+
+def load_map(path=MAP_FILE):
+    """Read the line definitions.
+
+    File layout:
+        {"lines": [{"id", "name", "name_zh", "color", "width", "paths": [...]}]}
+
+    Each path is one pen-down stroke, either
+        {"points": [[x, y], [x, y, r], ...]}   polyline; an optional third
+                                               value rounds that corner with
+                                               radius r
+        {"arc": {"start": [x, y], "heading": h, "radius": r, "extent": e}}
+    and may carry "dash": [dash_len, gap_len] and its own "width".
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    for line in data["lines"]:
+        for path in line["paths"]:
+            if "points" in path and len(path["points"]) < 2:
+                raise ValueError("{}: a path needs at least two points".format(line["id"]))
+    return data
+
+
+def dashed_arc(t, radius, extent, dash_len, gap_len):
+    """Arc drawn as dash_count equal dashes, spreading the slack over the gaps."""
+    arc_length = 2 * math.pi * abs(radius) * (abs(extent) / 360)
+    dash_count = int(arc_length / (dash_len + gap_len))
+    if dash_count == 0:
+        t.circle(radius, extent)
+        return
+    step_angle = extent / dash_count
+    step_arc = (dash_len / arc_length) * extent
+    for _ in range(dash_count):
+        t.pendown()
+        t.circle(radius, step_arc)
+        t.penup()
+        t.circle(radius, step_angle - step_arc)
+    t.pendown()
+
+
+def dashed_line(t, length, dash_len, gap_len):
+    """Straight counterpart of dashed_arc, with the same spacing rule."""
+    dash_count = int(length / (dash_len + gap_len))
+    if dash_count == 0:
+        t.forward(length)
+        return
+    step = length / dash_count
+    for _ in range(dash_count):
+        t.pendown()
+        t.forward(dash_len)
+        t.penup()
+        t.forward(step - dash_len)
+    t.pendown()
+
+
+def _heading(dx, dy):
+    return math.degrees(math.atan2(dy, dx))
+
+
+def _turn(h_in, h_out):
+    """Signed turn in degrees, left positive, in (-180, 180]."""
+    turn = (h_out - h_in) % 360
+    return turn - 360 if turn > 180 else turn
+
+
+def _segment(t, x, y, dash):
+    """Straight move from the current position to (x, y), solid or dashed."""
+    length = math.hypot(x - t.xcor(), y - t.ycor())
+    if length < 1e-9:
+        return
+    t.setheading(t.towards(x, y))
+    if dash:
+        dashed_line(t, length, *dash)
+    else:
+        t.forward(length)
+
+
+def _arc(t, radius, extent, dash):
+    if dash:
+        dashed_arc(t, radius, extent, *dash)
+    else:
+        t.circle(radius, extent)
+
+
+def _corners(points):
+    """The geometry of a polyline with rounded [x, y, r] corners, piece by piece.
+
+    Yields ("line", x, y) for a straight leg from the current position to
+    (x, y) and ("arc", heading, radius, extent) for a tangent arc starting
+    there; a negative radius turns right, as in turtle.circle. Both
+    draw_polyline and path_points are built on this.
+    """
+    for i in range(1, len(points) - 1):
+        (px, py), (x, y, *corner), (nx, ny) = points[i - 1][:2], points[i], points[i + 1][:2]
+        radius = corner[0] if corner else 0
+        h_in, h_out = _heading(x - px, y - py), _heading(nx - x, ny - y)
+        turn = _turn(h_in, h_out)
+        if radius == 0 or abs(turn) < 1e-6:
+            yield "line", x, y
+            continue
+        # the arc touches both legs at the tangent length from the corner
+        tangent = radius * math.tan(math.radians(abs(turn)) / 2)
+        a = math.radians(h_in)
+        yield "line", x - tangent * math.cos(a), y - tangent * math.sin(a)
+        yield "arc", h_in, radius if turn > 0 else -radius, abs(turn)
+    yield "line", points[-1][0], points[-1][1]
+
+
+def draw_polyline(t, points, dash=None):
+    """Polyline through points, rounding each [x, y, r] corner with a tangent arc."""
+    t.penup()
+    t.goto(points[0][0], points[0][1])
+    t.pendown()
+    for kind, *args in _corners(points):
+        if kind == "line":
+            _segment(t, *args, dash)
+        else:
+            heading, radius, extent = args
+            t.setheading(heading)
+            _arc(t, radius, extent, dash)
+    t.penup()
+
+
+def _arc_points(x, y, heading, radius, extent, step=10):
+    """Points along circle(radius, extent) from (x, y) facing heading, end included."""
+    h = math.radians(heading)
+    cx, cy = x - radius * math.sin(h), y + radius * math.cos(h)
+    start = math.atan2(y - cy, x - cx)
+    sweep = math.radians(extent if radius > 0 else -extent)
+    n = max(1, int(abs(extent) / step) + 1)
+    r = abs(radius)
+    return [(cx + r * math.cos(start + sweep * i / n), cy + r * math.sin(start + sweep * i / n))
+            for i in range(1, n + 1)]
+
+
+def path_points(path, step=10):
+    """The path as a plain polyline (arcs sampled every step degrees), for
+    geometry queries that do not go through turtle."""
+    if "arc" in path:
+        arc = path["arc"]
+        x, y = arc["start"]
+        return [(x, y)] + _arc_points(x, y, arc["heading"], arc["radius"], arc["extent"], step)
+    points = path["points"]
+    out = [tuple(points[0][:2])]
+    for kind, *args in _corners(points):
+        if kind == "line":
+            out.append(tuple(args))
+        else:
+            x, y = out[-1]
+            out += _arc_points(x, y, *args, step)
+    return out
+
+
+def draw_arc(t, arc, dash=None):
+    t.penup()
+    t.goto(*arc["start"])
+    t.setheading(arc["heading"])
+    t.pendown()
+    _arc(t, arc["radius"], arc["extent"], dash)
+    t.penup()
+
+
+def draw_line(t, line):
+    t.color(line["color"])
+    for path in line["paths"]:
+        t.pensize(path.get("width", line["width"]))
+        if "arc" in path:
+            draw_arc(t, path["arc"], path.get("dash"))
+        else:
+            draw_polyline(t, path["points"], path.get("dash"))
+
+
+def draw_map(t, data):
+    """Draw every line in file order with animation off, then show one frame."""
+    t.tracer(0)
+    t.hideturtle()
+    for line in data["lines"]:
+        draw_line(t, line)
+    t.update()
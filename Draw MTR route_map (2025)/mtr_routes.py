@@ -0,0 +1,287 @@
+# Journey planner over the MTR map: stations from mtr_stations.json become a
+# graph along the drawn line geometry, shortest travel times for every pair
+# of stations are precomputed with Dijkstra, and a route can be highlighted
+# on the turtle map.
+
+import argparse
+import heapq
+import math
+import random
+import time
+from collections import namedtuple
+
+from mtr_map import load_map, path_points
+from mtr_stations import load_stations, segment_distance
+
+UNITS_PER_MINUTE = 40      # train speed in map units per minute
+DWELL_MINUTES = 0.5        # stop time added to every hop
+TRANSFER_MINUTES = 3.0     # walking between platforms at an interchange
+WALK = "walk"              # Leg.line of a walk between two stations ("walks" in the JSON)
+WALK_COLOR = "gray"
+SNAP_DISTANCE = 8          # a station belongs to a path if it is this close
+
+Leg = namedtuple("Leg", "line stations")
+Route = namedtuple("Route", "minutes legs")
+
+
+def _project(points, cumulative, x, y):
+    """(distance from (x, y) to the polyline, arc length of the closest point)."""
+    best = (math.inf, 0.0)
+    for i, ((x0, y0), (x1, y1)) in enumerate(zip(points, points[1:])):
+        d = segment_distance(x, y, x0, y0, x1, y1)
+        if d < best[0]:
+            seg = cumulative[i + 1] - cumulative[i]
+            t = 0.0 if seg == 0 else ((x - x0) * (x1 - x0) + (y - y0) * (y1 - y0)) / (seg * seg)
+            best = (d, cumulative[i] + max(0.0, min(1.0, t)) * seg)
+    return best
+
+
+def _cut(points, cumulative, s0, s1):
+    """The part of the polyline between arc lengths s0 and s1, in that direction."""
+    lo, hi = min(s0, s1), max(s0, s1)
+
+    def at(s):
+        for i in range(len(points) - 1):
+            if cumulative[i + 1] >= s:
+                seg = cumulative[i + 1] - cumulative[i]
+                t = 0.0 if seg == 0 else (s - cumulative[i]) / seg
+                (x0, y0), (x1, y1) = points[i], points[i + 1]
+                return x0 + t * (x1 - x0), y0 + t * (y1 - y0)
+        return points[-1]
+
+    out = [at(lo)] + [p for p, s in zip(points, cumulative) if lo < s < hi] + [at(hi)]
+    return out if s0 <= s1 else out[::-1]
+
+
+class RouteFinder:
+    """Shortest journeys between stations.
+
+    Graph nodes are (station, line) pairs, so changing lines costs
+    TRANSFER_MINUTES; hops along a line cost DWELL_MINUTES plus their drawn
+    length at UNITS_PER_MINUTE, and a station's "walks" link every platform
+    of it to every platform of the other station (West Kowloon, the only
+    XRL station, reaches the network this way). precompute() runs Dijkstra once from every
+    station and keeps the distance and predecessor tables, after which
+    travel_time() is a table lookup and route() a walk back along
+    predecessors.
+    """
+
+    def __init__(self, map_data, stations, transfer=TRANSFER_MINUTES):
+        self.lines = {line["id"]: line for line in map_data["lines"]}
+        self.stations = stations
+        self.by_id = {s["id"]: i for i, s in enumerate(stations)}
+        self.nodes = []              # node -> (station index, line id)
+        self.node_of = {}            # (station index, line id) -> node
+        self.station_nodes = [[] for _ in stations]
+        for i, s in enumerate(stations):
+            for line_id in s["lines"]:
+                self.node_of[(i, line_id)] = len(self.nodes)
+                self.station_nodes[i].append(len(self.nodes))
+                self.nodes.append((i, line_id))
+        self.adjacency = [[] for _ in self.nodes]   # node -> [(minutes, node)]
+        self.geometry = {}           # (node, node) -> polyline drawn between them
+        self.walk_edges = set()      # (node, node) pairs that are walks, not line hops
+        self._build_line_edges(map_data)
+        self._build_walk_edges()
+        for nodes in self.station_nodes:
+            for a in nodes:
+                for b in nodes:
+                    if a != b:
+                        self.adjacency[a].append((transfer, b))
+        self._dist = [None] * len(stations)
+        self._prev = [None] * len(stations)
+
+    def _build_line_edges(self, map_data):
+        for line in map_data["lines"]:
+            members = [i for i, s in enumerate(self.stations) if line["id"] in s["lines"]]
+            for path in line["paths"]:
+                points = path_points(path, 2)
+                cumulative = [0.0]
+                for (x0, y0), (x1, y1) in zip(points, points[1:]):
+                    cumulative.append(cumulative[-1] + math.hypot(x1 - x0, y1 - y0))
+                on_path = []
+                for i in members:
+                    d, s = _project(points, cumulative, *self.stations[i]["pos"])
+                    if d <= SNAP_DISTANCE:
+                        on_path.append((s, i))
+                on_path.sort()
+                for (s0, a), (s1, b) in zip(on_path, on_path[1:]):
+                    minutes = DWELL_MINUTES + (s1 - s0) / UNITS_PER_MINUTE
+                    na, nb = self.node_of[(a, line["id"])], self.node_of[(b, line["id"])]
+                    self.adjacency[na].append((minutes, nb))
+                    self.adjacency[nb].append((minutes, na))
+                    way = _cut(points, cumulative, s0, s1)
+                    self.geometry[(na, nb)] = way
+                    self.geometry[(nb, na)] = way[::-1]
+
+    def _build_walk_edges(self):
+        for a, s in enumerate(self.stations):
+            for other, minutes in s.get("walks", {}).items():
+                b = self.by_id[other]
+                way = [tuple(s["pos"]), tuple(self.stations[b]["pos"])]
+                for na in self.station_nodes[a]:
+                    for nb in self.station_nodes[b]:
+                        self.adjacency[na].append((minutes, nb))
+                        self.adjacency[nb].append((minutes, na))
+                        self.walk_edges.update(((na, nb), (nb, na)))
+                        self.geometry[(na, nb)] = way
+                        self.geometry[(nb, na)] = way[::-1]
+
+    def find(self, name):
+        """Station index by id, English or Chinese name (case-insensitive)."""
+        if name in self.by_id:
+            return self.by_id[name]
+        key = name.strip().lower()
+        for i, s in enumerate(self.stations):
+            if key in (s["id"].lower(), s["name"].lower(), s["name_zh"]):
+                return i
+        raise KeyError("unknown station: {}".format(name))
+
+    def dijkstra(self, source):
+        """Minutes to every node from any platform of station source, plus predecessors."""
+        dist = [math.inf] * len(self.nodes)
+        prev = [-1] * len(self.nodes)
+        heap = []
+        for node in self.station_nodes[source]:
+            dist[node] = 0.0
+            heap.append((0.0, node))
+        heapq.heapify(heap)
+        adjacency = self.adjacency
+        while heap:
+            d, node = heapq.heappop(heap)
+            if d > dist[node]:
+                continue
+            for w, nxt in adjacency[node]:
+                nd = d + w
+                if nd < dist[nxt]:
+                    dist[nxt] = nd
+                    prev[nxt] = node
+                    heapq.heappush(heap, (nd, nxt))
+        return dist, prev
+
+    def _tables(self, source):
+        if self._dist[source] is None:
+            self._dist[source], self._prev[source] = self.dijkstra(source)
+        return self._dist[source], self._prev[source]
+
+    def precompute(self):
+        """Build the all-pairs tables up front (one Dijkstra per station)."""
+        for source in range(len(self.stations)):
+            self._tables(source)
+        return self
+
+    def _best_node(self, source, target):
+        dist, _ = self._tables(source)
+        return min(self.station_nodes[target], key=dist.__getitem__)
+
+    def travel_time(self, a, b):
+        """Minutes from station a to station b (indices), math.inf if unreachable."""
+        dist, _ = self._tables(a)
+        return min(dist[node] for node in self.station_nodes[b])
+
+    def route(self, a, b):
+        """Route(minutes, legs) from station a to station b, or None if unreachable."""
+        dist, prev = self._tables(a)
+        target = self._best_node(a, b)
+        if dist[target] == math.inf:
+            return None
+        chain = [target]
+        while prev[chain[-1]] != -1:
+            chain.append(prev[chain[-1]])
+        chain.reverse()
+
+        legs = []
+        for i, node in enumerate(chain):
+            station, line_id = self.nodes[node]
+            if i and (chain[i - 1], node) in self.walk_edges:
+                legs.append(Leg(WALK, [self.nodes[chain[i - 1]][0], station]))
+            if legs and legs[-1].line == line_id:
+                legs[-1].stations.append(station)
+            else:
+                legs.append(Leg(line_id, [station]))
+        # a one-station leg is only the platform side of a transfer
+        legs = [leg for leg in legs if len(leg.stations) > 1] or legs[:1]
+        return Route(dist[target], legs)
+
+    def leg_geometry(self, leg):
+        """Polyline along the drawn line for one leg of a route."""
+        if leg.line == WALK:
+            a, b = leg.stations
+            return [tuple(self.stations[a]["pos"]), tuple(self.stations[b]["pos"])]
+        points = []
+        for a, b in zip(leg.stations, leg.stations[1:]):
+            way = self.geometry[(self.node_of[(a, leg.line)], self.node_of[(b, leg.line)])]
+            points.extend(way if not points else way[1:])
+        return points
+
+    def describe(self, route):
+        lines = []
+        for leg in route.legs:
+            first, last = self.stations[leg.stations[0]], self.stations[leg.stations[-1]]
+            if leg.line == WALK:
+                lines.append("Walk {} -> {}".format(first["name"], last["name"]))
+                continue
+            lines.append("{} {} -> {} ({} stops)".format(
+                self.lines[leg.line]["name"], first["name"], last["name"], len(leg.stations) - 1))
+        lines.append("about {:.0f} min".format(route.minutes))
+        return "\n".join(lines)
+
+
+def draw_route(t, finder, route, width=11):
+    """Highlight a route on the map: wide line colour casing with a white core."""
+    t.penup()
+    for leg in route.legs:
+        points = finder.leg_geometry(leg)
+        if len(points) < 2:
+            continue
+        color = WALK_COLOR if leg.line == WALK else finder.lines[leg.line]["color"]
+        for size, color in ((width, color), (width // 3, "white")):
+            t.pensize(size)
+            t.color(color)
+            t.goto(*points[0])
+            t.pendown()
+            for x, y in points[1:]:
+                t.goto(x, y)
+            t.penup()
+    for station in (route.legs[0].stations[0], route.legs[-1].stations[-1]):
+        t.goto(*finder.stations[station]["pos"])
+        t.dot(18, "black")
+        t.dot(10, "white")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MTR shortest-route queries")
+    parser.add_argument("origin", nargs="?", help="station id, English or Chinese name")
+    parser.add_argument("destination", nargs="?")
+    parser.add_argument("--bench", type=int, metavar="N", help="time N random queries")
+    args = parser.parse_args()
+    if (args.origin is None) != (args.destination is None):
+        parser.error("give both an origin and a destination")
+    if args.origin is None and not args.bench:
+        parser.error("give an origin and a destination, or --bench N")
+
+    finder = RouteFinder(load_map(), load_stations())
+    if args.origin is not None:
+        try:
+            origin, destination = finder.find(args.origin), finder.find(args.destination)
+        except KeyError as e:
+            parser.error(e.args[0])
+        route = finder.route(origin, destination)
+        print(finder.describe(route) if route else "No route")
+    if args.bench:
+        start = time.perf_counter()
+        finder.precompute()
+        print("tables for {} stations: {:.3f}s".format(len(finder.stations), time.perf_counter() - start))
+        rng = random.Random(0)
+        pairs = [(rng.randrange(len(finder.stations)), rng.randrange(len(finder.stations)))
+                 for _ in range(args.bench)]
+        for label, query in (("travel_time", finder.travel_time), ("route", finder.route)):
+            start = time.perf_counter()
+            for a, b in pairs:
+                query(a, b)
+            elapsed = time.perf_counter() - start
+            print("{}: {:.0f} queries/s".format(label, len(pairs) / elapsed))
+
+
+if __name__ == "__main__":
+    main()
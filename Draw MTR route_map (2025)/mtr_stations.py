@@ -0,0 +1,248 @@
+# Station and interchange layer for the MTR route map: a uniform grid index
+# over stations and line geometry answers nearest-station, "which lines pass
+# here" and label-collision queries by looking at a few cells, not every item.
+
+import json
+import math
+import os
+
+from mtr_map import path_points
+
+STATIONS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mtr_stations.json")
+
+
+def load_stations(path=STATIONS_FILE):
+    """[{"id", "name", "name_zh", "pos": [x, y], "lines": [line ids]}, ...]
+
+    A station may also carry "walks": {station id: minutes}, a walking
+    interchange to another station (mtr_routes.py uses it for routing).
+    """
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["stations"]
+
+
+class GridIndex:
+    """Items bucketed by the square cells their bounding box touches.
+
+    A cell size around the typical query radius keeps each lookup to a
+    handful of cells; items spanning several cells are stored in each.
+    """
+
+    def __init__(self, cell=40):
+        self.cell = cell
+        self.cells = {}
+        self.bounds = None   # (cx_min, cy_min, cx_max, cy_max) over occupied cells
+
+    def _range(self, lo, hi):
+        return range(int(math.floor(lo / self.cell)), int(math.floor(hi / self.cell)) + 1)
+
+    def insert(self, item, xmin, ymin, xmax=None, ymax=None):
+        xmax = xmin if xmax is None else xmax
+        ymax = ymin if ymax is None else ymax
+        xs, ys = self._range(xmin, xmax), self._range(ymin, ymax)
+        for cx in xs:
+            for cy in ys:
+                self.cells.setdefault((cx, cy), []).append(item)
+        b = self.bounds or (xs[0], ys[0], xs[-1], ys[-1])
+        self.bounds = (min(b[0], xs[0]), min(b[1], ys[0]), max(b[2], xs[-1]), max(b[3], ys[-1]))
+
+    def query(self, xmin, ymin, xmax, ymax):
+        """Items whose cells overlap the box (may include near misses, never duplicates)."""
+        seen = set()
+        for cx in self._range(xmin, xmax):
+            for cy in self._range(ymin, ymax):
+                for item in self.cells.get((cx, cy), ()):
+                    if id(item) not in seen:
+                        seen.add(id(item))
+                        yield item
+
+    def rings(self, x, y):
+        """Items in growing square rings of cells around (x, y): ring 0 is the
+        cell itself, ring k the cells at Chebyshev distance k."""
+        if self.bounds is None:
+            return
+        cx0, cy0 = int(math.floor(x / self.cell)), int(math.floor(y / self.cell))
+        bx0, by0, bx1, by1 = self.bounds
+        limit = max(abs(cx0 - bx0), abs(cx0 - bx1), abs(cy0 - by0), abs(cy0 - by1))
+        for k in range(limit + 1):
+            ring = []
+            for cx in range(cx0 - k, cx0 + k + 1):
+                for cy in range(cy0 - k, cy0 + k + 1):
+                    if max(abs(cx - cx0), abs(cy - cy0)) == k:
+                        ring.extend(self.cells.get((cx, cy), ()))
+            yield k, ring
+
+
+def segment_distance(x, y, x0, y0, x1, y1):
+    dx, dy = x1 - x0, y1 - y0
+    length2 = dx * dx + dy * dy
+    t = 0.0 if length2 == 0 else max(0.0, min(1.0, ((x - x0) * dx + (y - y0) * dy) / length2))
+    return math.hypot(x - x0 - t * dx, y - y0 - t * dy)
+
+
+def segment_hits_box(x0, y0, x1, y1, box):
+    """Liang-Barsky clip: does the segment cross the box (xmin, ymin, xmax, ymax)?"""
+    xmin, ymin, xmax, ymax = box
+    t0, t1 = 0.0, 1.0
+    dx, dy = x1 - x0, y1 - y0
+    for p, q in ((-dx, x0 - xmin), (dx, xmax - x0), (-dy, y0 - ymin), (dy, ymax - y0)):
+        if p == 0:
+            if q < 0:
+                return False
+        else:
+            r = q / p
+            if p < 0:
+                t0 = max(t0, r)
+            else:
+                t1 = min(t1, r)
+            if t0 > t1:
+                return False
+    return True
+
+
+def boxes_overlap(a, b):
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+class StationLayer:
+    """Stations, interchanges and line geometry, spatially indexed."""
+
+    def __init__(self, map_data, stations, cell=40):
+        self.lines = {line["id"]: line for line in map_data["lines"]}
+        self.line_order = [line["id"] for line in map_data["lines"]]
+        self.stations = stations
+        self.by_id = {s["id"]: s for s in stations}
+        self.station_index = GridIndex(cell)
+        for s in stations:
+            self.station_index.insert(s, *s["pos"])
+        # each segment is (line id, x0, y0, x1, y1), stored in every cell its bbox touches
+        self.segment_index = GridIndex(cell)
+        for line in map_data["lines"]:
+            for path in line["paths"]:
+                points = path_points(path)
+                for (x0, y0), (x1, y1) in zip(points, points[1:]):
+                    self.segment_index.insert((line["id"], x0, y0, x1, y1),
+                                              min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1))
+
+    @staticmethod
+    def is_interchange(station):
+        return len(station["lines"]) > 1
+
+    def nearest_station(self, x, y, max_dist=None):
+        """Closest station to (x, y), or None if none lies within max_dist.
+
+        Searches rings of cells outwards and stops once the next ring can
+        only be farther than the best station found so far.
+        """
+        best, best_d = None, math.inf
+        cell = self.station_index.cell
+        for k, ring in self.station_index.rings(x, y):
+            # every cell at ring k is at least (k - 1) * cell away from (x, y)
+            if (k - 1) * cell > best_d or (max_dist is not None and (k - 1) * cell > max_dist):
+                break
+            for s in ring:
+                d = math.hypot(s["pos"][0] - x, s["pos"][1] - y)
+                if d < best_d:
+                    best, best_d = s, d
+        if max_dist is not None and best_d > max_dist:
+            return None
+        return best
+
+    def stations_within(self, x, y, radius):
+        return [s for s in self.station_index.query(x - radius, y - radius, x + radius, y + radius)
+                if math.hypot(s["pos"][0] - x, s["pos"][1] - y) <= radius]
+
+    def lines_at(self, x, y, tolerance=6):
+        """Ids of the lines drawn within tolerance of (x, y), in map order."""
+        found = set()
+        for line_id, x0, y0, x1, y1 in self.segment_index.query(
+                x - tolerance, y - tolerance, x + tolerance, y + tolerance):
+            if line_id not in found and segment_distance(x, y, x0, y0, x1, y1) <= tolerance:
+                found.add(line_id)
+        return [line_id for line_id in self.line_order if line_id in found]
+
+    def identify(self, x, y, station_radius=10, tolerance=6):
+        """What is under a click: ("station", station), ("lines", [ids]) or None."""
+        station = self.nearest_station(x, y, station_radius)
+        if station is not None:
+            return "station", station
+        lines = self.lines_at(x, y, tolerance)
+        return ("lines", lines) if lines else None
+
+    def describe(self, x, y):
+        hit = self.identify(x, y)
+        if hit is None:
+            return None
+        kind, value = hit
+        if kind == "station":
+            names = ", ".join(self.lines[i]["name"] for i in value["lines"])
+            return "{} {} ({})".format(value["name_zh"], value["name"], names)
+        return " / ".join("{} {}".format(self.lines[i]["name_zh"], self.lines[i]["name"])
+                          for i in value)
+
+    def place_labels(self, font_size=7, gap=6, marker=6):
+        """Choose a position for every station name without overlaps.
+
+        Interchanges are placed first. Each label tries the right, left,
+        top, bottom and right-hand diagonals of its station and takes the
+        first box that hits no placed label or station marker, preferring one
+        that crosses no line. Placed boxes go into a grid, so each test only
+        looks at nearby labels.
+        Returns [(station, x, y, align)] with the write() anchor; stations
+        whose label fits nowhere are left out.
+        """
+        height = font_size * 4 / 3.0
+        taken = GridIndex(self.station_index.cell)
+        for s in self.stations:
+            x, y = s["pos"]
+            taken.insert((x - marker, y - marker, x + marker, y + marker),
+                         x - marker, y - marker, x + marker, y + marker)
+
+        placed = []
+        order = sorted(self.stations, key=lambda s: not self.is_interchange(s))
+        for s in order:
+            x, y = s["pos"]
+            width = 0.6 * height * len(s["name"])
+            candidates = [
+                ((x + gap, y - height / 2, x + gap + width, y + height / 2), (x + gap, y - height / 2, "left")),
+                ((x - gap - width, y - height / 2, x - gap, y + height / 2), (x - gap, y - height / 2, "right")),
+                ((x - width / 2, y + gap, x + width / 2, y + gap + height), (x, y + gap, "center")),
+                ((x - width / 2, y - gap - height, x + width / 2, y - gap), (x, y - gap - height, "center")),
+                ((x + gap, y + gap, x + gap + width, y + gap + height), (x + gap, y + gap, "left")),
+                ((x + gap, y - gap - height, x + gap + width, y - gap), (x + gap, y - gap - height, "left")),
+            ]
+            fallback = None
+            for box, anchor in candidates:
+                # gap >= marker, so a label only touches its own station's marker
+                if any(boxes_overlap(box, b) for b in taken.query(*box)):
+                    continue
+                if not any(segment_hits_box(x0, y0, x1, y1, box)
+                           for _, x0, y0, x1, y1 in self.segment_index.query(*box)):
+                    fallback = (box, anchor)
+                    break
+                if fallback is None:
+                    fallback = (box, anchor)
+            if fallback is None:
+                continue
+            box, (ax, ay, align) = fallback
+            taken.insert(box, *box)
+            placed.append((s, ax, ay, align))
+        return placed
+
+
+def draw_stations(t, layer, labels=True, font=("Arial", 7, "normal")):
+    """Markers for every station (white rings for interchanges) and their labels."""
+    t.penup()
+    for s in layer.stations:
+        t.goto(*s["pos"])
+        if layer.is_interchange(s):
+            t.dot(12, "black")
+            t.dot(8, "white")
+        else:
+            t.dot(7, layer.lines[s["lines"][0]]["color"])
+            t.dot(3, "white")
+    if labels:
+        t.color("black")
+        for s, x, y, align in layer.place_labels(font[1]):
+            t.goto(x, y)
+            t.write(s["name"], align=align, font=font)
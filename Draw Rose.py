@@ -1,18 +1,15 @@
+import turtle
 from turtle import *
-from random import randint
-import math
+
+from spiral_geometry import spiral, random_colors, draw_path
+
+
 def main():
     bgcolor('black')
-    x = 1
-    while x < 400:
-        r = randint(0, 255)
-        g = randint(0, 255)
-        b = randint(0, 255)
-        colormode(255)
-        pencolor(r, g, b)
-        speed(100)
-        fd(50 + x)
-        rt(90.911)
-        x = x+1
+    # 先算好399段螺旋线的顶点(每段长50+x, 右转90.911度)和每段的随机颜色,
+    # 再关掉动画一次画完
+    points = spiral(399, first=51, step=1, turn=-90.911)
+    colors = random_colors(399)
+    draw_path(turtle, points, colors)
     exitonclick()
 main()
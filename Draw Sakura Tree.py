@@ -1,76 +1,18 @@
+import sys
+import turtle
 from turtle import *
-from random import *
-from math import *
 
-def tree(n,l):
-    pd()#下笔
-    #阴影效果
-    t = cos(radians(heading()+45))/8+0.25
-    pencolor(t,t,t)
-#    color('pink')
-    pensize(n/3)
-    forward(l)#画树枝
+from sakura_tree import grow, draw
 
-    if n>0:
-        b = random()*15+10 #右分支偏转角度
-        c = random()*15+10 #左分支偏转角度
-        d = l*(random()*0.25+0.7) #下一个分支的长度
-        #右转一定角度,画右分支
-        speed(0)
-        right(b)
-        tree(n-1,d)
-        #左转一定角度，画左分支
-        left(b+c)
-        tree(n-1,d)
-        #转回来
-        right(c)
-    else:
-        #画叶子
-        right(90)
-        n=cos(radians(heading()-45))/4+0.5
-#        pencolor(n,n*0.8,n*0.8)
-        speed(0)
-        color('pink')
-#        begin_fill()#用于实心
-        circle(3)
-        left(90)
-#        end_fill()
-        #添加0.3倍的飘落叶子
-#        if(random()>0.7):
-#            pu()
-#            #飘落
-#            t = heading()
-#            an = -40 +random()*40
-#            setheading(an)
-#            dis = int(800*random()*0.5 + 400*random()*0.3 + 200*random()*0.2)
-#            forward(dis)
-#            setheading(t)
-#            #画叶子
-#            pd()
-#            right(90)
-#            n = cos(radians(heading()-45))/4+0.5
-#            pencolor(n*0.5+0.5,0.4+n*0.4,0.4+n*0.4)
-#            circle(2)
-#            left(90)
-#            pu()
-#            #返回
-#            t=heading()
-#            setheading(an)
-#            backward(dis)
-#            setheading(t)
-    pu()
-    backward(l)#退回
+# 用法: python "Draw Sakura Tree.py" [种子] [层数]
+# 同一个种子每次画出同一棵树; 不给种子则每次随机
+SEED = int(sys.argv[1]) if len(sys.argv) > 1 else None
+DEPTH = int(sys.argv[2]) if len(sys.argv) > 2 else 12  # 分支层数, 2**DEPTH 朵花; 14-16 层也能很快画完
 
 #bgcolor(0.5,0.5,0.5)#背景色
 bgcolor(1,1,1)#背景色
 ht()#隐藏turtle
-speed(1)#速度 1-10渐进，0 最快
-# tracer(0,0)#若想直接看最后结果，取消此注释
-pu()#抬笔
-backward(100)
-left(90)#左转90度
-pu()#抬笔
-backward(300)#后退300
-tree(12,100)#递归7层
+# 先算好所有树枝和花朵的位置(非递归), 再关掉动画一次画完
+tree = grow(DEPTH, 100, seed=SEED)#树干长100, 从(-100,-300)向上生长
+draw(turtle, tree)
 done()
-
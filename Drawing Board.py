@@ -1,6 +1,45 @@
 import tkinter as tk
 from tkinter import messagebox
 
+# A stroke is drawn live as a few line items of at most CHUNK_POINTS points,
+# so each coords() update stays small however long the stroke gets. Each
+# full piece is simplified straight away, and on release the pieces are
+# replaced by one polyline item.
+CHUNK_POINTS = 256
+SIMPLIFY_TOLERANCE = 1.0  # pixels a simplified stroke may deviate from the input
+
+def simplify(points, tolerance=SIMPLIFY_TOLERANCE):
+    # Ramer-Douglas-Peucker on a flat [x0, y0, x1, y1, ...] list: keep the
+    # point farthest from the chord while it is more than tolerance away,
+    # then repeat on both halves. Uses an explicit stack: recursing would
+    # hit the recursion limit on long strokes.
+    n = len(points) // 2
+    if n < 3:
+        return list(points)
+    keep = bytearray(n)
+    keep[0] = keep[n - 1] = 1
+    limit = tolerance * tolerance
+    stack = [(0, n - 1)]
+    while stack:
+        first, last = stack.pop()
+        x0, y0 = points[2 * first], points[2 * first + 1]
+        dx, dy = points[2 * last] - x0, points[2 * last + 1] - y0
+        length2 = dx * dx + dy * dy
+        farthest, index = limit, -1
+        for i in range(first + 1, last):
+            px, py = points[2 * i] - x0, points[2 * i + 1] - y0
+            # squared distance to the chord segment (strokes can double back)
+            t = 0.0 if length2 == 0 else max(0.0, min(1.0, (px * dx + py * dy) / length2))
+            ex, ey = px - t * dx, py - t * dy
+            d = ex * ex + ey * ey
+            if d > farthest:
+                farthest, index = d, i
+        if index >= 0:
+            keep[index] = 1
+            stack.append((first, index))
+            stack.append((index, last))
+    return [c for i in range(n) if keep[i] for c in (points[2 * i], points[2 * i + 1])]
+
 class Drawing_Board:
     def __init__(self, master):
         self.master = master
@@ -13,6 +52,7 @@ class Drawing_Board:
         # Bind mouse events for drawing
         self.canvas.bind("<ButtonPress-1>", self.start_draw)
         self.canvas.bind("<B1-Motion>", self.draw)
+        self.canvas.bind("<ButtonRelease-1>", self.end_draw)
         
         # Color input frame
         color_frame = tk.Frame(master)
@@ -50,6 +90,9 @@ class Drawing_Board:
         # Drawing variables
         self.drawing = False
         self.last_x, self.last_y = 0, 0
+        self.points = []        # simplified points of the finished pieces, flat
+        self.chunk = []         # samples shown by the newest live item
+        self.stroke_items = []  # live line items of the current stroke
         self.color = "black"
         self.line_width = 1  # Default line width
         
@@ -85,6 +128,7 @@ class Drawing_Board:
 
     def delete_all(self):
         self.canvas.delete("all")
+        self.points, self.chunk, self.stroke_items = [], [], []
 
     def update_line_width(self, value):
         self.line_width = int(value)
@@ -117,12 +161,45 @@ class Drawing_Board:
     def start_draw(self, event):
         self.drawing = True
         self.last_x, self.last_y = event.x, event.y
+        self.points, self.chunk, self.stroke_items = [], [], []
 
     def draw(self, event):
-        if self.drawing:
-            current_x, current_y = event.x, event.y
-            self.canvas.create_line(self.last_x, self.last_y, current_x, current_y, width=self.line_width, fill=self.color, capstyle=tk.ROUND)
-            self.last_x, self.last_y = current_x, current_y
+        if not self.drawing:
+            return
+        current_x, current_y = event.x, event.y
+        if (current_x, current_y) == (self.last_x, self.last_y):
+            return
+        if self.stroke_items and len(self.chunk) < 2 * CHUNK_POINTS:
+            # extend the live item instead of adding one item per segment
+            self.chunk += (current_x, current_y)
+            self.canvas.coords(self.stroke_items[-1], self.chunk)
+        else:
+            if self.stroke_items:
+                self.finish_piece()
+            self.chunk = [self.last_x, self.last_y, current_x, current_y]
+            self.stroke_items.append(self.canvas.create_line(
+                self.chunk, width=self.line_width, fill=self.color, capstyle=tk.ROUND))
+        self.last_x, self.last_y = current_x, current_y
+
+    def finish_piece(self):
+        # simplify a full piece now, so releasing a long stroke stays quick
+        piece = simplify(self.chunk)
+        self.canvas.coords(self.stroke_items[-1], piece)
+        # consecutive pieces share their joining point
+        self.points += piece[2:] if self.points else piece
+
+    def end_draw(self, event):
+        self.drawing = False
+        if not self.stroke_items:
+            return
+        self.finish_piece()
+        # swap the live pieces for one polyline item
+        width = self.canvas.itemcget(self.stroke_items[0], "width")
+        fill = self.canvas.itemcget(self.stroke_items[0], "fill")
+        self.canvas.delete(*self.stroke_items)
+        self.canvas.create_line(self.points, width=width, fill=fill,
+                                capstyle=tk.ROUND, joinstyle=tk.ROUND)
+        self.points, self.chunk, self.stroke_items = [], [], []
 
     def update_preview(self, event=None):
         r = int(self.r_entry.get())
@@ -1,17 +1,35 @@
 import os
 import sys
+import csv
 import platform
 from datetime import datetime
-from collections import defaultdict
+from SubmissionMatrix import SubmissionMatrix
+from HomeworkStore import HomeworkStore
+from RankingIndex import RankedStats, status_thresholds, status_label
+from ReportWriters import WRITERS, render_reports, safe_filename
 
 class HomeworkSystem:
-    def __init__(self):
+    def __init__(self, class_name="默认班级", term="默认学期"):
         self.names = {}
-        self.homework_stats = defaultdict(int)
+        self.homework_stats = RankedStats()
         self.total_required = 0  # 初始化为0
         self.report_dir = "StatisticsResult"
         self._init_console_encoding()
         self.load_names()
+        self.matrix = SubmissionMatrix(self.names)
+        self.store = HomeworkStore(class_name=class_name, term=term)
+        self.store.save_roster(self.names)  # 记下本班名单，供全班级报告查姓名
+        self.load_state()
+
+    def load_state(self):
+        """从数据库恢复当前班级、学期的登记数据"""
+        self.total_required = self.store.load_total_required()
+        self.homework_stats.update(self.store.load_stats())
+        for name, missing_ids in self.store.load_assignments():
+            for sid in missing_ids:
+                self.matrix.add_student(sid)
+            col = self.matrix.add_assignment(name)
+            self.matrix.mark_missing(col, missing_ids)
 
     def _init_console_encoding(self):
         """处理不同系统的控制台编码问题"""
@@ -52,7 +70,8 @@ class HomeworkSystem:
         """增强型菜单系统"""
         while True:
             print("\n" + "="*50)
-            print("作业登记系统（当前总次数：{}）".format(
+            print("作业登记系统 - {} {}（当前总次数：{}）".format(
+                self.store.key[0], self.store.key[1],
                 self.total_required if self.total_required > 0 else "未设置"
             ))
             print("="*50)
@@ -60,6 +79,10 @@ class HomeworkSystem:
             print("2. 批量登记缺交")
             print("3. 查看实时统计")
             print("4. 生成统计报告")
+            print("5. 批量导入缺交记录（CSV替换次数/扫描导出累加次数）")
+            print("6. 按作业登记缺交名单")
+            print("7. 查看作业明细")
+            print("8. 导出多格式报告")
             print("Q. 保存退出")
             choice = input("请选择操作：").strip().upper()
 
@@ -77,13 +100,31 @@ class HomeworkSystem:
             elif choice == '4':
                 self.generate_report()
                 input("\n按回车返回主菜单...")
+            elif choice == '5':
+                if not self.check_required_set():
+                    continue
+                print("CSV“学号,缺交次数”会替换这些学生原有的缺交次数；"
+                      "扫描导出（每行一个学号）在原有次数上累加")
+                path = input("请输入导入文件路径（输入Q返回）: ").strip().strip('"')
+                if path.upper() != 'Q':
+                    self.import_records(path)
+                input("\n按回车返回主菜单...")
+            elif choice == '6':
+                self.record_assignment()
+            elif choice == '7':
+                self.display_assignment_stats()
+                input("\n按回车返回主菜单...")
+            elif choice == '8':
+                self.export_reports()
+                input("\n按回车返回主菜单...")
             elif choice == 'Q':
                 self.generate_report()
                 print("\n最终报告路径：{}".format(
                     os.path.abspath(self.report_dir).replace("\\", "/")))
+                self.store.close()
                 break
             else:
-                print("无效输入，请重新输入1-4或Q")
+                print("无效输入，请重新输入1-8或Q")
                 input("按回车继续...")
 
     def check_required_set(self):
@@ -113,6 +154,7 @@ class HomeworkSystem:
                         return
                 
                 self.total_required = new_total
+                self.store.save_total_required(new_total)
                 print("总次数已更新为：", self.total_required)
                 return
             except ValueError:
@@ -150,11 +192,152 @@ class HomeworkSystem:
                     continue
                     
                 self.homework_stats[student_id] = missed
+                self.store.save_stats({student_id: missed})
                 print("成功记录：{} 缺交{}次".format(self.names[student_id], missed))
                 
             except ValueError:
                 print("错误：请输入有效数字")
 
+    def parse_import_file(self, file_path):
+        """解析批量导入文件，返回 (记录字典, 错误列表)
+
+        支持两种格式，返回的都是导入后的缺交次数：
+        - CSV：每行“学号,缺交次数”，首行可为表头，次数直接替换原有记录
+        - 扫描导出：每行一个学号，学号每出现一次在原有次数上加1
+        """
+        records = {}
+        errors = []
+        with open(file_path, "rb") as f:
+            content = f.read().decode('utf-8-sig').splitlines()
+
+        rows = [(lineno, row) for lineno, row in
+                enumerate(csv.reader(content), 1) if any(c.strip() for c in row)]
+        is_csv = any(len(row) > 1 for _, row in rows)
+
+        for lineno, row in rows:
+            student_id = row[0].strip().upper()
+            if is_csv and lineno == rows[0][0] and student_id not in self.names:
+                try:
+                    int(row[1])
+                except (IndexError, ValueError):
+                    continue  # 跳过表头
+
+            if student_id not in self.names:
+                errors.append("第{}行：无效的学生学号 {}".format(lineno, student_id))
+                continue
+
+            if not is_csv:
+                if student_id not in records:
+                    records[student_id] = self.homework_stats.get(student_id, 0)
+                records[student_id] += 1
+                continue
+
+            if len(row) < 2:
+                errors.append("第{}行：缺少缺交次数".format(lineno))
+                continue
+            if student_id in records:
+                errors.append("第{}行：学号 {} 重复登记".format(lineno, student_id))
+                continue
+            try:
+                missed = int(row[1].strip())
+            except ValueError:
+                errors.append("第{}行：无效的缺交次数 {}".format(lineno, row[1].strip()))
+                continue
+            if missed < 0:
+                errors.append("第{}行：次数不能为负数".format(lineno))
+                continue
+            records[student_id] = missed
+
+        for student_id, missed in records.items():
+            if missed > self.total_required:
+                errors.append("学号 {}：缺交次数{}超过总次数（{}次）".format(
+                    student_id, missed, self.total_required))
+        return records, errors
+
+    def import_records(self, file_path):
+        """批量导入缺交记录，全部校验通过后一次性写入"""
+        try:
+            records, errors = self.parse_import_file(file_path)
+        except IOError as e:
+            print("导入文件读取失败: {}".format(str(e)))
+            return False
+
+        if errors:
+            print("导入失败，共发现{}处错误（未写入任何记录）：".format(len(errors)))
+            for error in errors:
+                print("- " + error)
+            return False
+
+        self.homework_stats.update(records)
+        self.store.save_stats(records)
+        print("成功导入{}条缺交记录".format(len(records)))
+        return True
+
+    def record_assignment(self):
+        """按作业登记：输入作业名称和该次缺交学号，自动累计总次数"""
+        name = input("\n请输入作业名称（输入Q返回）: ").strip()
+        if not name or name.upper() == 'Q':
+            return
+        ids = input("请输入缺交学号，以空格或逗号分隔（无人缺交直接回车）: ")
+        student_ids = [sid.upper() for sid in ids.replace(',', ' ').split()]
+        invalid = [sid for sid in student_ids if sid not in self.names]
+        if invalid:
+            print("错误：无效的学生学号 {}（本次作业未登记）".format(' '.join(invalid)))
+            return
+
+        col = self.matrix.add_assignment(name)
+        self.matrix.mark_missing(col, student_ids)
+        self.store.save_assignment(col, name, student_ids)
+        self.merge_assignment(set(student_ids))
+        print("成功登记作业“{}”：缺交{}人，当前总次数{}".format(
+            name, len(set(student_ids)), self.total_required))
+
+    def merge_assignment(self, missing_ids):
+        """把一次作业累加到总次数与缺交统计上并写入数据库
+
+        只做增量：手工设置的总次数、批量登记和导入的缺交次数都保留，
+        没有缺交的学生也不会被加入统计。
+        """
+        self.total_required += 1
+        changed = {sid: self.homework_stats.get(sid, 0) + 1 for sid in missing_ids}
+        self.homework_stats.update(changed)
+        self.store.save_total_required(self.total_required)
+        self.store.save_stats(changed)
+
+    def display_assignment_stats(self):
+        """按作业显示完成率、连续缺交和个人缺交明细"""
+        if not self.matrix.n_assignments:
+            print("暂无按作业登记的记录")
+            return
+
+        print("\n{:=^50}".format(" 作业完成率 "))
+        for name, rate in zip(self.matrix.assignments,
+                              self.matrix.completion_rates().tolist()):
+            print("{:<20}{:.1f}%".format(name, rate * 100))
+
+        streaks = self.matrix.current_missing_streaks()
+        warned = [(sid, n) for sid, n in
+                  zip(self.matrix.student_ids, streaks.tolist()) if n >= 3]
+        print("\n{:=^50}".format(" 连续缺交≥3次 "))
+        if not warned:
+            print("{:^50}".format("无"))
+        for sid, n in warned:
+            print("{:<12}{:<10}连续缺交{}次".format(sid, self.names.get(sid, '未知'), n))
+
+        longest = self.matrix.streaks_at_least(3)
+        print("\n{:=^50}".format(" 曾连续缺交≥3次 "))
+        if not longest:
+            print("{:^50}".format("无"))
+        for sid, n in longest:
+            print("{:<12}{:<10}最长连续缺交{}次".format(sid, self.names.get(sid, '未知'), n))
+
+        sid = input("\n输入学号查看缺交明细（直接回车跳过）: ").strip().upper()
+        if sid in self.names:
+            missing = self.matrix.missing_list(sid)
+            print("{} 缺交：{}".format(self.names[sid], '、'.join(missing) or "无"))
+        elif sid:
+            print("错误：无效的学生学号")
+
     def display_enhanced_stats(self):
         """增强统计显示"""
         print("\n{:=^50}".format(" 实时统计 "))
@@ -165,10 +348,10 @@ class HomeworkSystem:
             print("\n{:^50}".format("暂无缺交记录"))
             return
 
-        for sid, missed in sorted(self.homework_stats.items(),
-                                key=lambda x: x[1], reverse=True):
+        thresholds = status_thresholds(self.total_required)
+        for sid, missed in self.homework_stats.ranked():
             rate = missed / self.total_required * 100
-            status = "严重缺交" if rate >= 20 else "需关注" if rate >= 10 else "正常"
+            status = status_label(missed, thresholds)
             print("{:<12}{:<10}{:<12}{:<10.1f}% {:<12}".format(
                 sid,
                 self.names.get(sid, '未知'),
@@ -182,45 +365,88 @@ class HomeworkSystem:
             len(self.homework_stats), 
             len(self.names)))
         print("- 平均缺交率：{:.1f}%".format(
-            sum(self.homework_stats.values())/self.total_required/len(self.homework_stats)*100 
+            self.homework_stats.total_missed/self.total_required/len(self.homework_stats)*100
             if self.homework_stats else 0))
+        print("- 严重缺交人数：{}（缺交率≥20%）".format(
+            self.homework_stats.count_at_least(thresholds[1])))
+        print("- 缺交次数中位数：{}".format(self.homework_stats.percentile(50)))
+
+    def report_rows(self, stats, total_required, names):
+        """按排名逐行生成报告行 (学号, 姓名, 缺交次数, 缺交率)"""
+        for sid, missed in stats.ranked():
+            yield sid, names.get(sid, '未知'), missed, missed / total_required * 100
+
+    def report_job(self, class_name, term, timestamp):
+        """构造一个报告任务，数据和该班名单在工作线程中按需从数据库读取"""
+        def load():
+            store = HomeworkStore(self.store.db_path, class_name, term)
+            try:
+                total_required = store.load_total_required()
+                stats = RankedStats(store.load_stats())
+                names = store.load_roster()
+            finally:
+                store.close()
+            meta = {
+                'title': "作业统计报告 - {} {}".format(class_name, term),
+                'generated': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                'total_required': total_required,
+            }
+            if not total_required:
+                return meta, lambda: []
+            return meta, lambda: self.report_rows(stats, total_required, names)
+
+        filename = safe_filename("{}_{}_{}_Report".format(timestamp, class_name, term))
+        return os.path.join(self.report_dir, filename), load
 
-    def generate_report(self):
+    def generate_report(self, formats=("txt",), compress=False):
         """增强版报告生成"""
         try:
-            if not os.path.exists(self.report_dir):
-                os.makedirs(self.report_dir)
-                
             timestamp = datetime.now().strftime("%Y%m%d_%H%M")
-            filename = "{}_Report.txt".format(timestamp)
-            file_path = os.path.join(self.report_dir, filename)
-            
-            sorted_stats = sorted(self.homework_stats.items(),
-                                key=lambda x: x[1], reverse=True)
-            
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write("作业统计报告\n")
-                f.write("生成时间: {}\n".format(
-                    datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
-                f.write("总应交次数: {}\n".format(self.total_required))
-                f.write("-"*60 + "\n")
-                f.write("{:<10}{:<10}{:<12}{:<10}\n".format(
-                    '学号', '姓名', '缺交次数', '缺交率'))
-                
-                for sid, missed in sorted_stats:
-                    rate = (missed / self.total_required) * 100
-                    f.write("{:<10}{:<10}{:<12}{:.1f}%\n".format(
-                        sid,
-                        self.names.get(sid, '未知'),
-                        missed,
-                        rate))
-                        
-            print("报告已生成: {}".format(
-                os.path.abspath(file_path).replace("\\", "/")))
-            
+            base_path = os.path.join(self.report_dir, "{}_Report".format(timestamp))
+
+            def load():
+                meta = {
+                    'title': "作业统计报告",
+                    'generated': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    'total_required': self.total_required,
+                }
+                return meta, lambda: self.report_rows(
+                    self.homework_stats, self.total_required, self.names)
+
+            for path in render_reports([(base_path, load)], formats, compress):
+                print("报告已生成: {}".format(
+                    os.path.abspath(path).replace("\\", "/")))
+
         except Exception as e:
             print("报告生成失败: {}".format(str(e)))
 
+    def generate_all_reports(self, formats, compress=False):
+        """并行生成数据库中所有班级、学期的报告"""
+        try:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M")
+            jobs = [self.report_job(class_name, term, timestamp)
+                    for class_name, term, _ in self.store.list_sessions()]
+            paths = render_reports(jobs, formats, compress)
+            print("共生成{}份报告，目录: {}".format(
+                len(paths), os.path.abspath(self.report_dir).replace("\\", "/")))
+        except Exception as e:
+            print("报告生成失败: {}".format(str(e)))
+
+    def export_reports(self):
+        """多格式导出菜单"""
+        choice = input("请输入导出格式，以逗号分隔（{}，默认txt）: ".format(
+            "/".join(WRITERS))).strip().lower()
+        formats = [f.strip() for f in choice.split(',') if f.strip()] or ["txt"]
+        invalid = [f for f in formats if f not in WRITERS]
+        if invalid:
+            print("错误：不支持的格式 {}".format(", ".join(invalid)))
+            return
+        compress = input("是否gzip压缩？(Y/N): ").strip().upper() == 'Y'
+        if input("是否导出全部班级？(Y/N): ").strip().upper() == 'Y':
+            self.generate_all_reports(formats, compress)
+        else:
+            self.generate_report(formats, compress)
+
 if __name__ == "__main__":
     # 环境检查
     if sys.version_info < (3, 0):
@@ -232,7 +458,9 @@ if __name__ == "__main__":
         os.environ['OBJC_DISABLE_INITIALIZE_FORK_SAFETY'] = 'YES'
     
     try:
-        system = HomeworkSystem()
+        class_name = input("请输入班级名称（直接回车使用默认）: ").strip() or "默认班级"
+        term = input("请输入学期（直接回车使用默认）: ").strip() or "默认学期"
+        system = HomeworkSystem(class_name, term)
         system.show_menu()
     except KeyboardInterrupt:
         print("\n程序已中断")
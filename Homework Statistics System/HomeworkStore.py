@@ -0,0 +1,132 @@
+import os
+import sqlite3
+
+
+class HomeworkStore:
+    """基于 SQLite 的登记数据持久化
+
+    每个（班级, 学期）是一组独立的数据，启动时只读取当前选择的那一组；
+    每次登记立即写入对应的行，不会整体重写数据库。
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sessions (
+            class_name TEXT NOT NULL,
+            term TEXT NOT NULL,
+            total_required INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (class_name, term)
+        );
+        CREATE TABLE IF NOT EXISTS stats (
+            class_name TEXT NOT NULL,
+            term TEXT NOT NULL,
+            student_id TEXT NOT NULL,
+            missed INTEGER NOT NULL,
+            PRIMARY KEY (class_name, term, student_id)
+        );
+        CREATE TABLE IF NOT EXISTS assignments (
+            class_name TEXT NOT NULL,
+            term TEXT NOT NULL,
+            col INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            PRIMARY KEY (class_name, term, col)
+        );
+        CREATE TABLE IF NOT EXISTS missing (
+            class_name TEXT NOT NULL,
+            term TEXT NOT NULL,
+            col INTEGER NOT NULL,
+            student_id TEXT NOT NULL,
+            PRIMARY KEY (class_name, term, col, student_id)
+        );
+        CREATE TABLE IF NOT EXISTS roster (
+            class_name TEXT NOT NULL,
+            student_id TEXT NOT NULL,
+            name TEXT NOT NULL,
+            PRIMARY KEY (class_name, student_id)
+        );
+    """
+
+    def __init__(self, db_path="HomeworkData.db", class_name="默认班级", term="默认学期"):
+        self.db_path = db_path
+        self.key = (class_name, term)
+        self._conn = None
+
+    @property
+    def conn(self):
+        """首次访问时才打开数据库"""
+        if self._conn is None:
+            folder = os.path.dirname(self.db_path)
+            if folder and not os.path.exists(folder):
+                os.makedirs(folder)
+            self._conn = sqlite3.connect(self.db_path)
+            self._conn.executescript(self.SCHEMA)
+            self._conn.execute(
+                "INSERT OR IGNORE INTO sessions (class_name, term) VALUES (?, ?)", self.key)
+            self._conn.commit()
+        return self._conn
+
+    def list_sessions(self):
+        return self.conn.execute(
+            "SELECT class_name, term, total_required FROM sessions "
+            "ORDER BY class_name, term").fetchall()
+
+    def load_total_required(self):
+        row = self.conn.execute(
+            "SELECT total_required FROM sessions WHERE class_name = ? AND term = ?",
+            self.key).fetchone()
+        return row[0] if row else 0
+
+    def load_stats(self):
+        return dict(self.conn.execute(
+            "SELECT student_id, missed FROM stats WHERE class_name = ? AND term = ?",
+            self.key))
+
+    def load_assignments(self):
+        """返回 [(作业名称, [缺交学号...]), ...]，按登记顺序"""
+        missing = {}
+        for col, sid in self.conn.execute(
+                "SELECT col, student_id FROM missing WHERE class_name = ? AND term = ?",
+                self.key):
+            missing.setdefault(col, []).append(sid)
+        return [(name, missing.get(col, [])) for col, name in self.conn.execute(
+            "SELECT col, name FROM assignments WHERE class_name = ? AND term = ? "
+            "ORDER BY col", self.key)]
+
+    def load_roster(self):
+        """返回当前班级的名单 {学号: 姓名}（各学期共用）"""
+        return dict(self.conn.execute(
+            "SELECT student_id, name FROM roster WHERE class_name = ?", self.key[:1]))
+
+    def save_roster(self, names):
+        """用 names（{学号: 姓名}）替换当前班级的名单"""
+        with self.conn:
+            self.conn.execute("DELETE FROM roster WHERE class_name = ?", self.key[:1])
+            self.conn.executemany(
+                "INSERT INTO roster VALUES (?, ?, ?)",
+                [self.key[:1] + (sid, name) for sid, name in names.items()])
+
+    def save_total_required(self, total_required):
+        with self.conn:
+            self.conn.execute(
+                "UPDATE sessions SET total_required = ? WHERE class_name = ? AND term = ?",
+                (total_required,) + self.key)
+
+    def save_stats(self, records):
+        """写入/覆盖若干学生的缺交次数，records 为 {学号: 次数}"""
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO stats VALUES (?, ?, ?, ?)",
+                [self.key + (sid, missed) for sid, missed in records.items()])
+
+    def save_assignment(self, col, name, missing_ids):
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO assignments VALUES (?, ?, ?, ?)",
+                self.key + (col, name))
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO missing VALUES (?, ?, ?, ?)",
+                [self.key + (col, sid) for sid in missing_ids])
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
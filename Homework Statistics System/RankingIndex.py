@@ -0,0 +1,87 @@
+from bisect import bisect_left, insort
+
+
+class RankedStats(dict):
+    """{学号: 缺交次数} 字典，同时维护按缺交次数降序的有序索引
+
+    每次写入都用二分查找更新索引，排名、前N名、阈值人数和百分位查询
+    无需再对整个名单排序。
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self._keys = []  # (-缺交次数, 学号)，升序即缺交次数降序
+        self._sum = 0
+        self.update(*args, **kwargs)
+
+    def __setitem__(self, student_id, missed):
+        if student_id in self:
+            self._discard(student_id)
+        super().__setitem__(student_id, missed)
+        insort(self._keys, (-missed, student_id))
+        self._sum += missed
+
+    def __delitem__(self, student_id):
+        self._discard(student_id)
+        super().__delitem__(student_id)
+
+    def _discard(self, student_id):
+        key = (-self[student_id], student_id)
+        del self._keys[bisect_left(self._keys, key)]
+        self._sum -= self[student_id]
+
+    def update(self, *args, **kwargs):
+        for student_id, missed in dict(*args, **kwargs).items():
+            self[student_id] = missed
+
+    def clear(self):
+        super().clear()
+        self._keys = []
+        self._sum = 0
+
+    def pop(self, student_id, *default):
+        if student_id in self:
+            missed = self[student_id]
+            del self[student_id]
+            return missed
+        return super().pop(student_id, *default)
+
+    def setdefault(self, student_id, missed=0):
+        if student_id not in self:
+            self[student_id] = missed
+        return self[student_id]
+
+    @property
+    def total_missed(self):
+        return self._sum
+
+    def ranked(self, start=0, stop=None):
+        """按缺交次数降序返回 [(学号, 缺交次数), ...]"""
+        return [(sid, -neg) for neg, sid in self._keys[start:stop]]
+
+    def top(self, n):
+        return self.ranked(0, n)
+
+    def count_at_least(self, missed):
+        """缺交次数不少于 missed 的人数"""
+        return bisect_left(self._keys, (-missed + 1,))
+
+    def at_least(self, missed):
+        return self.ranked(0, self.count_at_least(missed))
+
+    def percentile(self, p):
+        """缺交次数的第 p 百分位（0~100），无记录时返回 None"""
+        if not self._keys:
+            return None
+        rank = round((100 - p) / 100 * (len(self._keys) - 1))
+        return -self._keys[rank][0]
+
+
+def status_thresholds(total_required):
+    """返回（需关注, 严重缺交）对应的最少缺交次数：缺交率≥10% / ≥20%"""
+    return -(-10 * total_required // 100), -(-20 * total_required // 100)
+
+
+def status_label(missed, thresholds):
+    attention, severe = thresholds
+    return "严重缺交" if missed >= severe else "需关注" if missed >= attention else "正常"
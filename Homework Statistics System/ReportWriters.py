@@ -0,0 +1,164 @@
+import csv
+import gzip
+import json
+import os
+import re
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from xml.sax.saxutils import escape
+
+BUFFER_SIZE = 1 << 16
+COLUMNS = ('学号', '姓名', '缺交次数', '缺交率')
+UNSAFE_FILENAME = re.compile(r'[\\/:*?"<>|\x00-\x1f]')
+UNSAFE_SHEET_NAME = re.compile(r'[\\/:*?\[\]]')
+
+
+def safe_filename(text):
+    """去掉路径分隔符和 Windows 文件名中不允许的字符"""
+    return UNSAFE_FILENAME.sub("_", text).strip(" .") or "_"
+
+
+class ReportWriter(ABC):
+    """报告写入器基类：逐行写入，不在内存中拼接整个报告
+
+    子类实现 write_header / write_row / write_footer，
+    meta 为 {'title', 'generated', 'total_required', ...}。
+    """
+    extension = ""
+
+    def __init__(self, file_path, compress=False):
+        self.file_path = file_path + (".gz" if compress else "")
+        if compress:
+            self.f = gzip.open(self.file_path, "wt", encoding="utf-8", newline="")
+        else:
+            self.f = open(self.file_path, "w", encoding="utf-8", newline="",
+                          buffering=BUFFER_SIZE)
+
+    def write_header(self, meta):
+        pass
+
+    @abstractmethod
+    def write_row(self, sid, name, missed, rate):
+        pass
+
+    def write_footer(self):
+        pass
+
+    def close(self):
+        self.f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class TextReportWriter(ReportWriter):
+    extension = ".txt"
+
+    def write_header(self, meta):
+        self.f.write("{}\n".format(meta['title']))
+        self.f.write("生成时间: {}\n".format(meta['generated']))
+        self.f.write("总应交次数: {}\n".format(meta['total_required']))
+        self.f.write("-"*60 + "\n")
+        self.f.write("{:<10}{:<10}{:<12}{:<10}\n".format(*COLUMNS))
+
+    def write_row(self, sid, name, missed, rate):
+        self.f.write("{:<10}{:<10}{:<12}{:.1f}%\n".format(sid, name, missed, rate))
+
+
+class CsvReportWriter(ReportWriter):
+    extension = ".csv"
+
+    def write_header(self, meta):
+        self.writer = csv.writer(self.f)
+        self.writer.writerow(COLUMNS)
+
+    def write_row(self, sid, name, missed, rate):
+        self.writer.writerow((sid, name, missed, "{:.1f}".format(rate)))
+
+
+class XmlSpreadsheetWriter(ReportWriter):
+    """Excel 可直接打开的 SpreadsheetML (XML 2003) 表格"""
+    extension = ".xml"
+
+    def write_header(self, meta):
+        # Excel 的工作表名最长31个字符，且不能含 : \ / ? * [ ]
+        sheet_name = UNSAFE_SHEET_NAME.sub("_", meta['title'])[:31]
+        self.f.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                     '<?mso-application progid="Excel.Sheet"?>\n'
+                     '<Workbook xmlns="urn:schemas-microsoft-com:office:spreadsheet" '
+                     'xmlns:ss="urn:schemas-microsoft-com:office:spreadsheet">\n'
+                     '<Worksheet ss:Name="{}"><Table>\n'.format(escape(sheet_name)))
+        self._row([("String", c) for c in COLUMNS])
+
+    def _row(self, cells):
+        self.f.write("<Row>{}</Row>\n".format("".join(
+            '<Cell><Data ss:Type="{}">{}</Data></Cell>'.format(t, escape(str(v)))
+            for t, v in cells)))
+
+    def write_row(self, sid, name, missed, rate):
+        self._row((("String", sid), ("String", name), ("Number", missed),
+                   ("Number", round(rate, 1))))
+
+    def write_footer(self):
+        self.f.write("</Table></Worksheet>\n</Workbook>\n")
+
+
+class JsonReportWriter(ReportWriter):
+    extension = ".json"
+
+    def write_header(self, meta):
+        head = json.dumps(meta, ensure_ascii=False)
+        self.f.write(head[:-1] + ', "rows": [\n')
+        self.first = True
+
+    def write_row(self, sid, name, missed, rate):
+        if not self.first:
+            self.f.write(",\n")
+        self.first = False
+        self.f.write(json.dumps({'学号': sid, '姓名': name, '缺交次数': missed,
+                                 '缺交率': round(rate, 1)}, ensure_ascii=False))
+
+    def write_footer(self):
+        self.f.write("\n]}\n")
+
+
+WRITERS = {
+    'txt': TextReportWriter,
+    'csv': CsvReportWriter,
+    'xml': XmlSpreadsheetWriter,
+    'json': JsonReportWriter,
+}
+
+
+def write_report(base_path, fmt, meta, rows, compress=False):
+    """将 rows（(学号, 姓名, 缺交次数, 缺交率) 的可迭代对象）写成一种格式，返回文件路径"""
+    writer_cls = WRITERS[fmt]
+    with writer_cls(base_path + writer_cls.extension, compress) as writer:
+        writer.write_header(meta)
+        for row in rows:
+            writer.write_row(*row)
+        writer.write_footer()
+    return writer.file_path
+
+
+def render_reports(jobs, formats, compress=False, max_workers=None):
+    """并行生成多份报告
+
+    jobs 为 [(base_path, load), ...]，load() 在工作线程中调用，
+    返回 (meta, rows)，rows() 每次调用返回一个新的行迭代器
+    （每种格式各遍历一次），行边生成边写入。
+    返回生成的文件路径列表。
+    """
+    def render(job):
+        base_path, load = job
+        folder = os.path.dirname(base_path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        meta, rows = load()
+        return [write_report(base_path, fmt, meta, rows(), compress) for fmt in formats]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return [path for paths in pool.map(render, jobs) for path in paths]
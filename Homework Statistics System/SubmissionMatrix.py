@@ -0,0 +1,103 @@
+import numpy as np
+
+
+class SubmissionMatrix:
+    """学生 × 作业 的提交矩阵（1 表示已交）
+
+    按位存储：每个学生一行 uint8，每字节存 8 次作业（np.packbits 的高位
+    在前顺序），行和列都按容量倍增扩展。登记时只改对应字节的一位；
+    统计时把有效部分解包成布尔矩阵再做 NumPy 向量化运算，适用于全校
+    名单和数百次作业的规模。
+    """
+
+    def __init__(self, student_ids, capacity=64):
+        self.student_ids = list(student_ids)
+        self.index = {sid: i for i, sid in enumerate(self.student_ids)}
+        self.assignments = []
+        rows = max(len(self.student_ids), 1)
+        self._bits = np.zeros((rows, (capacity + 7) // 8), dtype=np.uint8)
+
+    @property
+    def n_assignments(self):
+        return len(self.assignments)
+
+    @property
+    def submitted(self):
+        """有效部分解包后的布尔矩阵（新数组，每格一字节）"""
+        return self._unpack(self._bits[:len(self.student_ids)])
+
+    def _unpack(self, bits):
+        return np.unpackbits(bits, axis=-1, count=self.n_assignments).astype(bool)
+
+    def _grow(self, rows, cols):
+        """把底层数组扩到至少 rows 行、能放下 cols 次作业（各自倍增）"""
+        old_rows, old_bytes = self._bits.shape
+        new_rows, new_bytes = old_rows, old_bytes
+        while new_rows < rows:
+            new_rows *= 2
+        while new_bytes * 8 < cols:
+            new_bytes *= 2
+        if (new_rows, new_bytes) != (old_rows, old_bytes):
+            grown = np.zeros((new_rows, new_bytes), dtype=np.uint8)
+            grown[:old_rows, :old_bytes] = self._bits
+            self._bits = grown
+
+    def add_assignment(self, name, submitted=True):
+        """新增一次作业，默认全员已交，返回作业列号"""
+        col = len(self.assignments)
+        self._grow(len(self.student_ids), col + 1)
+        if submitted:
+            self._bits[:len(self.student_ids), col >> 3] |= 0x80 >> (col & 7)
+        self.assignments.append(name)
+        return col
+
+    def add_student(self, student_id):
+        """新增一名学生（此前的作业均记为缺交），返回行号"""
+        if student_id in self.index:
+            return self.index[student_id]
+        row = len(self.student_ids)
+        self._grow(row + 1, self.n_assignments)
+        self.index[student_id] = row
+        self.student_ids.append(student_id)
+        return row
+
+    def mark_missing(self, col, student_ids):
+        """将一组学生在指定作业上标记为缺交"""
+        rows = [self.index[sid] for sid in student_ids]
+        self._bits[rows, col >> 3] &= ~np.uint8(0x80 >> (col & 7))
+
+    def completion_rates(self):
+        """每次作业的完成率（0~1）"""
+        if not self.student_ids:
+            return np.zeros(self.n_assignments)
+        return self.submitted.mean(axis=0)
+
+    def missing_list(self, student_id):
+        """某学生缺交的作业名称列表"""
+        cols = np.flatnonzero(~self._unpack(self._bits[self.index[student_id]]))
+        return [self.assignments[c] for c in cols]
+
+    def longest_missing_streaks(self):
+        """每位学生最长的连续缺交次数"""
+        missing = (~self.submitted).astype(np.int8)
+        padded = np.zeros((missing.shape[0], missing.shape[1] + 2), dtype=np.int8)
+        padded[:, 1:-1] = missing
+        edges = np.diff(padded, axis=1)
+        start_rows, start_cols = np.nonzero(edges == 1)
+        _, end_cols = np.nonzero(edges == -1)
+        longest = np.zeros(missing.shape[0], dtype=np.int64)
+        np.maximum.at(longest, start_rows, end_cols - start_cols)
+        return longest
+
+    def current_missing_streaks(self):
+        """每位学生截至最近一次作业的连续缺交次数"""
+        submitted_rev = self.submitted[:, ::-1]
+        has_submitted = submitted_rev.any(axis=1)
+        return np.where(has_submitted, submitted_rev.argmax(axis=1),
+                        self.n_assignments)
+
+    def streaks_at_least(self, length):
+        """最长连续缺交不少于 length 次的 (学号, 最长连续次数) 列表"""
+        longest = self.longest_missing_streaks()
+        rows = np.flatnonzero(longest >= length)
+        return [(self.student_ids[r], int(longest[r])) for r in rows]
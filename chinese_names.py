@@ -0,0 +1,581 @@
+import json
+import math
+import os
+import random
+from array import array
+from bisect import bisect_right, insort
+from collections import Counter
+
+# 姓氏/名字用字的权重数据
+WEIGHTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            "chinese_name_weights.json")
+
+# 姓氏元组（原始数据，含重复项；使用时经 CharPool 去重）
+first = (
+    '赵', '钱', '孙', '李', '周', '吴', '郑', '王', '冯', '陈', '褚', '卫', '蒋', '沈', '韩', '杨', '朱', '秦', '尤', '许', '何', '吕', '施', '张',
+    '孔', '曹', '严', '华', '金', '魏', '陶', '姜', '戚', '谢', '邹', '喻', '柏', '水', '窦', '章', '云', '苏', '潘', '葛', '奚', '范', '彭', '郎',
+    '鲁', '韦', '昌', '马', '苗', '凤', '花', '方', '俞', '任', '袁', '柳', '酆', '鲍', '史', '唐', '费', '廉', '岑', '薛', '雷', '贺', '倪', '汤',
+    '滕', '殷', '罗', '毕', '郝', '邬', '安', '常', '乐', '于', '时', '傅', '皮', '卞', '齐', '康', '伍', '余', '元', '卜', '顾', '孟', '平', '黄',
+    '和', '穆', '萧', '尹', '姚', '邵', '湛', '汪', '祁', '毛', '禹', '狄', '米', '贝', '明', '臧', '计', '伏', '成', '戴', '谈', '宋', '茅', '庞',
+    '熊', '纪', '舒', '屈', '项', '祝', '董', '梁', '杜', '阮', '蓝', '闵', '席', '季', '麻', '强', '贾', '路', '娄', '危', '江', '童', '颜', '郭',
+    '梅', '盛', '林', '刁', '钟', '徐', '邱', '骆', '高', '夏', '蔡', '田', '樊', '胡', '凌', '霍', '虞', '万', '支', '柯', '昝', '管', '卢', '莫',
+    '经', '房', '裘', '缪', '干', '解', '应', '宗', '丁', '宣', '贲', '邓', '郁', '单', '杭', '洪', '包', '诸', '左', '石', '崔', '吉', '钮', '龚',
+    '程', '嵇', '邢', '滑', '裴', '陆', '荣', '翁', '荀', '羊', '於', '惠', '甄', '麴', '家', '封', '芮', '羿', '储', '靳', '汲', '邴', '糜', '松',
+    '井', '段', '富', '巫', '乌', '焦', '巴', '弓', '牧', '隗', '山', '谷', '车', '侯', '宓', '蓬', '全', '郗', '班', '仰', '秋', '仲', '伊', '宫',
+    '宁', '仇', '栾', '暴', '甘', '钭', '厉', '戎', '祖', '武', '符', '刘', '景', '詹', '束', '龙', '叶', '幸', '司', '韶', '郜', '黎', '蓟', '薄',
+    '印', '宿', '白', '怀', '蒲', '邰', '从', '鄂', '索', '咸', '籍', '赖', '卓', '蔺', '屠', '蒙', '池', '乔', '阳', '郁', '胥', '能', '苍', '双',
+    '闻', '莘', '党', '翟', '谭', '贡', '劳', '逄', '姬', '申', '扶', '堵', '冉', '宰', '郦', '雍', '舄', '璩', '桑', '桂', '濮', '牛', '寿', '通',
+    '边', '扈', '燕', '冀', '郏', '浦', '尚', '农', '温', '别', '庄', '晏', '柴', '瞿', '阎', '充', '慕', '连', '茹', '习', '宦', '艾', '鱼', '容',
+    '向', '古', '易', '慎', '戈', '廖', '庾', '终', '暨', '居', '衡', '步', '都', '耿', '满', '弘', '匡', '国', '文', '寇', '广', '禄', '阙', '东',
+    '殴', '殳', '沃', '利', '蔚', '越', '夔', '隆', '师', '巩', '厍', '聂', '晁', '勾', '敖', '融', '冷', '訾', '辛', '阚', '那', '简', '饶', '空',
+    '曾', '毋', '沙', '乜', '养', '鞠', '须', '丰', '巢', '关', '蒯', '相', '查', '後', '荆', '红', '游', '竺', '权', '逯', '盖', '益', '桓', '公',
+    '万俟', '司马', '上官', '欧阳', '夏侯', '诸葛', '闻人', '东方', '赫连', '皇甫', '尉迟', '公羊', '澹台', '公冶', '宗政', '濮阳', '淳于', '单于', '太叔',
+    '申屠', '公孙', '仲孙', '轩辕', '令狐', '钟离', '宇文', '长孙', '慕容', '鲜于', '闾丘', '司徒', '司空', '亓官', '司寇', '仉', '督', '子车', '颛孙',
+    '端木', '巫马', '公西', '漆雕', '乐正', '壤驷', '公良', '拓跋', '夹谷', '宰父', '谷梁', '晋', '楚', '闫', '法', '汝', '鄢', '涂', '钦', '段干',
+    '百里', '东郭', '南门', '呼延', '归', '海', '羊舌', '微生', '岳', '帅', '缑', '亢', '况', '后', '有', '琴', '梁丘', '左丘', '东门', '西门', '商',
+    '牟', '佘', '佴', '伯', '赏', '南宫', '墨', '哈', '谯', '笪', '年', '爱', '阳', '佟', '第五', '言', '福', '百', '家', '姓', '终', '寸', '卓',
+    '蔺', '屠', '蒙', '池', '乔', '阳', '郁', '胥', '能', '苍', '双', '闻', '莘', '党', '翟', '谭', '贡', '劳', '逄', '姬', '申', '扶', '堵', '冉',
+    '宰', '郦', '雍', '却', '璩', '桑', '桂', '濮', '牛', '寿', '通', '边', '扈', '燕', '冀', '僪', '浦', '尚', '农', '温', '别', '庄', '晏', '柴',
+    '瞿', '阎', '充', '慕', '连', '茹', '习', '宦', '艾', '鱼', '容', '向', '古', '易', '慎', '戈', '庾', '终', '暨', '居', '衡', '步都', '耿', '满',
+    '弘', '匡', '国', '文', '寇', '广', '禄', '阙', '东欧', '殳', '沃', '利', '蔚', '越', '夔', '隆', '师', '巩', '厍', '聂晁', '勾', '敖', '融', '冷',
+    '訾', '辛', '阚', '那', '简', '饶', '空曾', '毋', '沙', '乜', '养', '鞠', '须', '丰', '巢', '关', '蒯', '相查', '后', '荆', '红', '游', '竺', '权',
+    '逮', '盍', '益', '桓', '公', '唱', '万俟', '司马', '上官', '欧阳', '夏侯', '诸葛', '闻人', '东方', '赫连', '皇甫', '尉迟', '公羊', '澹台', '公冶', '宗政',
+    '濮阳', '淳于', '单于', '太叔', '申屠', '公孙', '仲孙', '轩辕', '令狐', '钟离', '宇文', '长孙', '慕容', '司徒', '司空', '召', '有', '舜', '丛', '岳',
+    '寸', '贰', '皇', '侨', '彤', '竭', '端', '赫', '实', '甫', '集', '象', '翠', '狂', '辟', '典', '良', '函', '芒', '苦', '其', '京', '中', '夕',
+    '之', '蹇', '称', '诺', '来', '多', '繁', '戊', '朴', '回', '毓', '税', '荤', '靖', '绪', '愈', '硕', '牢', '买', '但', '巧', '枚', '撒', '泰',
+    '秘', '亥', '绍', '以', '壬', '森', '斋', '释', '奕', '姒', '朋', '求', '羽', '用', '占', '真', '穰', '翦', '闾', '漆', '贵', '代', '贯', '旁',
+    '崇', '栋', '告', '休', '褒', '谏', '锐', '皋', '闳', '在', '歧', '禾', '示', '是', '委', '钊', '频', '嬴', '呼', '大', '威', '昂', '律', '冒',
+    '保', '系', '抄', '定', '化', '莱', '校', '么', '抗', '祢', '綦', '悟', '宏', '功', '庚', '务', '敏', '捷', '拱', '兆', '丑', '丙', '畅', '苟',
+    '随', '类', '卯', '俟', '友', '答', '乙', '允', '甲', '留', '尾', '佼', '玄', '乘', '裔', '延', '植', '环', '矫', '赛', '昔', '侍', '度', '旷',
+    '遇', '偶', '前', '由', '咎', '塞', '敛', '受', '泷', '袭', '衅', '叔', '圣', '御', '夫', '仆', '镇', '藩', '邸', '府', '掌', '首', '员', '焉',
+    '戏', '可', '智', '尔', '凭', '悉', '进', '笃', '厚', '仁', '业', '肇', '资', '合', '仍', '九', '衷', '哀', '刑', '俎', '仵', '圭', '夷', '徭',
+    '蛮', '汗', '孛', '乾', '帖', '罕', '洛', '淦', '洋', '邶', '郸', '郯', '邗', '邛', '剑', '虢', '隋', '蒿', '茆', '菅', '苌', '树', '桐', '锁',
+    '钟', '机', '盘', '铎', '斛', '玉', '线', '针', '箕', '庹', '绳', '磨', '蒉', '瓮', '弭', '刀', '疏', '牵', '浑', '恽', '势', '世', '仝', '同',
+    '蚁', '止', '戢', '睢', '冼', '种', '凃肖', '己', '泣', '潜', '卷', '脱', '谬', '蹉', '赧', '浮', '顿', '说', '次', '错', '念', '夙', '斯', '完',
+    '丹', '表', '聊', '源', '姓', '吾', '寻', '展', '出', '不', '户', '闭', '才', '无', '书', '学', '愚', '本', '性', '雪', '霜', '烟', '寒', '少',
+    '字', '桥', '板', '斐', '独', '千', '诗', '嘉', '扬', '善', '揭', '祈', '析', '赤', '紫', '青', '柔', '刚', '奇', '拜', '佛', '陀', '弥', '阿',
+    '素', '长', '僧', '隐', '仙', '隽', '宇', '祭', '酒', '淡', '塔', '琦', '闪', '始', '星', '南', '天', '接', '波', '碧', '速', '禚', '腾', '潮',
+    '镜', '似', '澄', '潭', '謇', '纵', '渠', '奈', '风', '春', '濯', '沐', '茂', '英', '兰', '檀', '藤', '枝', '检', '生', '折', '登', '驹', '骑',
+    '貊', '虎', '肥', '鹿', '雀', '野', '禽', '飞', '节', '宜', '鲜', '粟', '栗', '豆', '帛', '官', '布', '衣', '藏', '宝', '钞', '银', '门', '盈',
+    '庆', '喜', '及', '普', '建', '营', '巨', '望', '希', '道', '载', '声', '漫', '犁', '力', '贸', '勤', '革', '改', '兴', '亓', '睦', '修', '信',
+    '闽', '北', '守', '坚', '勇', '汉', '练', '尉', '士', '旅', '五', '令', '将', '旗', '军', '行', '奉', '敬', '恭', '仪', '母', '堂', '丘', '义',
+    '礼', '慈', '孝', '理', '伦', '卿', '问', '永', '辉', '位', '让', '尧', '依', '犹', '介', '承', '市', '所', '苑', '杞', '剧', '第', '零', '谌',
+    '招', '续', '达', '忻', '六', '鄞', '战', '迟', '候', '宛', '励', '粘', '萨', '邝', '覃', '辜', '初', '楼', '城', '区', '局', '台', '原', '考',
+    '妫', '纳', '泉', '老', '清', '德', '卑', '过', '麦', '曲', '竹', '百', '福', '言', '第五', '佟', '爱', '年', '笪', '谯', '哈', '墨', '南宫', '赏',
+    '伯', '佴', '佘', '牟', '商', '西门', '东门', '左丘', '梁丘', '琴', '后', '况', '亢', '缑', '帅', '微生', '羊舌', '海', '归', '呼延', '南门', '东郭',
+    '百里', '钦', '鄢', '汝', '法', '闫', '楚', '晋', '谷梁', '宰父', '夹谷', '拓跋', '壤驷', '乐正', '漆雕', '公西', '巫马', '端木', '颛孙', '子车', '督',
+    '仉', '司寇', '亓官', '鲜于', '锺离', '盖', '逯', '库', '郏', '逢', '阴', '薄', '厉', '稽', '闾丘', '公良', '段干', '开', '光', '操', '瑞', '眭',
+    '泥', '运', '摩', '伟', '铁', '迮', '荔菲', '辗迟'
+)
+
+# 名字用字元组（原始数据，含重复项；使用时经 CharPool 去重）
+name_chars = (
+    '骏', '宇', '玄', '璀', '紫', '子', '全', '超', '益', '莉', '信', '美', '奎', '琪', '豪', '浩', '槐', '文', '巧', '治', '瑜', '雯', '诗', '涵',
+    '曦', '嵘', '天', '誉', '喜', '伟', '嘉', '欣', '卿', '钰', '勇', '寅', '天', '宸', '兵', '祥', '运', '昊', '泽', '仁', '淳', '轩', '子', '泳',
+    '瑶', '源', '杰', '正', '驿', '豪', '财', '熙', '海', '辉', '辉', '天', '华', '峻', '龙', '嘉', '诚', '嘉', '运', '财', '喜', '伟', '천', '俊',
+    '熙', '熙', '利', '君', '帝', '云', '海', '伟', '熙', '霞', '艳', '宗', '书', '文', '国', '熙', '林', '天', '录', '熙', '明', '俊', '敬', '贵',
+    '艺', '心', '艾', '悦', '思', '甜', '帅', '梅', '莲', '婷', '伯', '沁', '苹', '苗', '龙', '尔', '仕', '墨', '驿', '森', '桥', '丹', '东', '墨',
+    '满', '阳', '骏', '鹏', '毓', '昆', '金', '宇', '宇', '木', '金', '豪', '天', '洋', '宇', '捷', '治', '智', '浩', '泽', '搏', '朗', '朗', '桐',
+    '喜', '伊', '萱', '彤', '正', '裕', '馨', '湘', '锦', '湘', '玉', '元', '坤', '子', '侦', '山', '水', '茂', '阳', '海', '乐', '晨', '杰', '高',
+    '启', '夫', '玉', '舟', '凌', '璇', '雨', '扬', '晨', '亭', '艳', '昊', '洋', '晴', '雨', '雨', '晨', '雨', '辰', '骞', '娴', '颖', '晞', '朝',
+    '晓', '小', '蕾', '雯', '悦', '月', '秋', '绮', '书', '彤', '诗', '韬', '羿', '程', '惠', '忻'
+)
+
+# 拒绝采样的最大尝试次数，超过后退回到过滤候选列表，保证一定结束
+MAX_REJECTIONS = 32
+
+
+class CharPool:
+    """去重后的加权候选池
+
+    items 去重后保持原有顺序；weights 为 {候选: 正数权重}，未列出的
+    使用 default_weight。构建时生成 Walker 别名表（prob / alias 两个
+    数组），抽一个字只需一次 random，O(1)；排除个别
+    字时用拒绝采样，期望仍为 O(1)。
+    """
+
+    def __init__(self, items, weights=None, default_weight=1.0):
+        self.items = tuple(dict.fromkeys(items))
+        weights = weights or {}
+        self.weights = array('d', (float(weights.get(item, default_weight))
+                                   for item in self.items))
+        self.prob, self.alias = self._build_alias(self.weights)
+
+    @staticmethod
+    def _build_alias(weights):
+        """Vose 别名法：把 n 个权重拆成 n 个“本身 / 别名”各占一部分的桶"""
+        n = len(weights)
+        total = sum(weights)
+        scaled = [w * n / total for w in weights]
+        prob = array('d', bytes(8 * n))
+        alias = array('I', range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            prob[s] = scaled[s]
+            alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        for i in small + large:
+            prob[i] = 1.0
+        return prob, alias
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, item):
+        return item in self.items
+
+    def probabilities(self):
+        """{候选: 抽中概率}"""
+        total = sum(self.weights)
+        return {item: w / total for item, w in zip(self.items, self.weights)}
+
+    def _index(self, rng):
+        x = rng.random() * len(self.items)
+        i = int(x)
+        return i if x - i < self.prob[i] else self.alias[i]
+
+    def draw_many(self, rng, k):
+        """一次抽取 k 个候选（可重复，不做排除）
+
+        一个 random() 同时给出桶号（整数部分）和桶内位置（小数部分），
+        比 randrange 加 random 快一倍多。
+        """
+        items, prob, alias = self.items, self.prob, self.alias
+        n, rand = len(items), rng.random
+        xs = [rand() * n for _ in range(k)]
+        return [items[i] if x - i < prob[i] else items[alias[i]]
+                for x, i in zip(xs, map(int, xs))]
+
+    def draw(self, rng=random, exclude=""):
+        """抽取一个不在 exclude 中的候选，没有可选候选时抛出 ValueError"""
+        items = self.items
+        for _ in range(MAX_REJECTIONS):
+            item = items[self._index(rng)]
+            if item not in exclude:
+                return item
+        candidates = [i for i, item in enumerate(items) if item not in exclude]
+        if not candidates:
+            raise ValueError("没有符合条件的候选字")
+        return items[rng.choices(candidates, [self.weights[i] for i in candidates])[0]]
+
+
+def load_weights(path=WEIGHTS_PATH):
+    """读取姓氏/名字用字权重文件，文件不存在时返回空配置（即均匀分布）"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def build_pools(weights=None):
+    """按权重配置构建（全部姓氏, 单姓, 名字用字）三个候选池"""
+    weights = load_weights() if weights is None else weights
+    surname_weights = weights.get("surnames", {})
+    given_weights = weights.get("given", {})
+    surnames = list(first) + list(surname_weights)
+    default_surname = weights.get("default_surname_weight", 1.0)
+    return (
+        CharPool(surnames, surname_weights, default_surname),
+        CharPool([s for s in surnames if len(s) == 1], surname_weights, default_surname),
+        CharPool(list(name_chars) + list(given_weights), given_weights,
+                 weights.get("default_given_weight", 1.0)),
+    )
+
+
+SURNAME_POOL, SINGLE_SURNAME_POOL, GIVEN_POOL = build_pools()
+
+
+def check_distribution(pool, n=1000000, seed=0):
+    """抽取 n 次，返回各候选观测频数相对期望的最大 z 分数
+
+    z 分数 = (观测 - n·p) / sqrt(n·p·(1-p))；样本量足够大时，若实现
+    正确，最大值通常在 5 以内。
+    """
+    rng = random.Random(seed)
+    counts = Counter(pool.draw_many(rng, n))
+    worst = 0.0
+    for item, p in pool.probabilities().items():
+        expected = n * p
+        sd = math.sqrt(expected * (1 - p)) or 1.0
+        worst = max(worst, abs(counts.get(item, 0) - expected) / sd)
+    return worst
+
+
+def _surname_pool(length):
+    return SINGLE_SURNAME_POOL if length == 2 else SURNAME_POOL
+
+
+def _complete(surname, length, second, picks, rng):
+    """在姓氏后补齐名字用字
+
+    picks 为预先抽好的候选字迭代器；候选与排除规则冲突时单独重抽：
+    单姓时名字用字与姓及前面的字都不相同；复姓时第一个字不能出现在
+    姓中，第二个字与第一个字不同。
+    """
+    name = surname
+    compound = len(surname) >= 2
+    for k in range(length - len(surname)):
+        if k == 0 and second:
+            c = second
+        else:
+            exclude = name[-1] if compound and k else name
+            c = next(picks)
+            if c in exclude:
+                c = GIVEN_POOL.draw(rng, exclude)
+        name += c
+    return name
+
+
+def _check(length, surname, second=None):
+    if length not in (2, 3, 4):
+        raise ValueError("姓名字数只能是2、3或4")
+    if surname and len(surname) > 2:
+        raise ValueError("姓氏只能是1或2个字")
+    if surname and len(surname) >= length:
+        raise ValueError("{}字姓名的姓氏过长".format(length))
+    if second and len(second) != 1:
+        raise ValueError("第二个字只能是一个字")
+    if second and surname and second in surname:
+        raise ValueError("第二个字“{}”不能是姓氏中的字".format(second))
+
+
+def _surnames_with(pool, second):
+    """pool 中含有 second 的姓氏，随机抽姓时要排除"""
+    return [s for s in pool.items if second in s] if second else ()
+
+
+def generate_name(length, surname=None, second=None, rng=random):
+    """生成一个 length（2/3/4）字的姓名
+
+    surname 指定姓氏，second 指定紧跟姓氏的第一个名字用字；
+    无法满足条件时抛出 ValueError。
+    """
+    _check(length, surname, second)
+    pool = _surname_pool(length)
+    surname = surname or pool.draw(rng, _surnames_with(pool, second))
+    picks = iter(lambda: GIVEN_POOL.draw(rng), None)
+    return _complete(surname, length, second, picks, rng)
+
+
+class FingerprintSet:
+    """只保存 64 位指纹的紧凑哈希集合（开放寻址，array('Q') 存储）
+
+    每个元素约占 8~16 字节，远小于直接把字符串放进 set。不同姓名指纹
+    相同的概率极低，即便发生也只是少生成一个合法姓名。
+    """
+
+    def __init__(self, capacity=1024):
+        size = 1
+        while size < capacity * 2:
+            size <<= 1
+        self._table = array('Q', bytes(8 * size))
+        self._mask = size - 1
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def add(self, item):
+        """加入 item，原本不存在时返回 True"""
+        fp = (hash(item) & 0xFFFFFFFFFFFFFFFF) or 1
+        table, mask = self._table, self._mask
+        i = fp & mask
+        while table[i]:
+            if table[i] == fp:
+                return False
+            i = (i + 1) & mask
+        table[i] = fp
+        self._count += 1
+        if self._count * 10 > len(table) * 6:
+            self._grow()
+        return True
+
+    def _grow(self):
+        old = self._table
+        self._table = array('Q', bytes(16 * len(old)))
+        self._mask = len(self._table) - 1
+        table, mask = self._table, self._mask
+        for fp in old:
+            if fp:
+                i = fp & mask
+                while table[i]:
+                    i = (i + 1) & mask
+                table[i] = fp
+
+
+class NameSpace:
+    """给定字数、姓氏和第二字约束下全部合法姓名的集合
+
+    对每个姓氏，名字的每一位可选的字数只取决于已排除的字数，而与
+    具体选了哪个字无关，因此每个姓氏下的姓名数是各位可选数的乘积，
+    第 i 个姓名可以按混合进制直接解码出来（O(1)，无需枚举）。
+    """
+
+    def __init__(self, length, surname=None, second=None):
+        _check(length, surname, second)
+        self.length = length
+        self.second = second
+        self.chars = sorted(GIVEN_POOL.items)
+        self.char_index = {c: i for i, c in enumerate(self.chars)}
+        self.surnames = []
+        self.offsets = []
+        total = 0
+        for s in [surname] if surname else _surname_pool(length).items:
+            if second and second in s:
+                continue
+            n = self._count(s)
+            if n:
+                self.surnames.append(s)
+                self.offsets.append(total)
+                total += n
+        self.total = total
+        self.position = {s: i for i, s in enumerate(self.surnames)}
+        self._surname_excluded = {}
+
+    def __len__(self):
+        return self.total
+
+    def _excluded(self, text):
+        return sorted({self.char_index[c] for c in text if c in self.char_index})
+
+    def _ways(self, s, k, n_excluded):
+        """第 k 位可选的字数；n_excluded 为该位排除字中属于候选池的个数"""
+        if k == 0 and self.second:
+            return 1
+        return len(self.chars) - n_excluded
+
+    def _count(self, s):
+        n = 1
+        excluded = len(self._excluded(s + (self.second or "")))
+        for k in range(self.length - len(s)):
+            if len(s) >= 2:
+                n_excluded = len(self._excluded(s)) if k == 0 else (
+                    len(self._excluded(self.second)) if self.second else 1)
+            else:
+                n_excluded = (len(self._excluded(s)) if k == 0
+                              else excluded + k - (1 if self.second else 0))
+            n *= self._ways(s, k, n_excluded)
+        return n
+
+    def size_of(self, pos):
+        """第 pos 个姓氏下的姓名数"""
+        end = self.offsets[pos + 1] if pos + 1 < len(self.offsets) else self.total
+        return end - self.offsets[pos]
+
+    def name_at(self, index):
+        """第 index 个姓名（0 <= index < len(self)）"""
+        pos = bisect_right(self.offsets, index) - 1
+        return self.name_in(pos, index - self.offsets[pos])
+
+    def name_in(self, pos, r):
+        """第 pos 个姓氏下的第 r 个姓名（0 <= r < self.size_of(pos)）"""
+        s = self.surnames[pos]
+        index = self.char_index
+        base = self._surname_excluded.get(s)
+        if base is None:
+            base = self._surname_excluded[s] = self._excluded(s)
+        parts = []
+        for k in range(self.length - len(s)):
+            if k == 0 and self.second:
+                parts.append(self.second)
+                continue
+            if len(s) >= 2 and k:
+                excluded = self._excluded(parts[-1])
+            elif parts:  # 姓的排除字按姓氏缓存，这里只并入前面已选的字
+                excluded = base[:]
+                for c in parts:
+                    j = index.get(c)
+                    if j is not None and j not in excluded:
+                        insort(excluded, j)
+            else:
+                excluded = base
+            ways = len(self.chars) - len(excluded)
+            i = r % ways
+            r //= ways
+            for e in excluded:  # 跳过被排除的字，得到第 i 个可选字
+                if e <= i:
+                    i += 1
+                else:
+                    break
+            parts.append(self.chars[i])
+        return s + "".join(parts)
+
+
+class FeistelPermutation:
+    """[0, n) 上由种子决定的随机双射（Feistel 网络 + cycle walking）
+
+    不需要把 n 个数打乱存下来，第 j 个位置的值按需计算，期望 O(1)。
+    """
+
+    def __init__(self, n, rng, rounds=4):
+        self.n = n
+        bits = max(2, (n - 1).bit_length())
+        self.half = (bits + 1) // 2
+        self.mask = (1 << self.half) - 1
+        self.keys = [rng.getrandbits(32) for _ in range(rounds)]
+
+    def _round(self, x, key):
+        x = ((x ^ key) * 0x9E3779B1) & 0xFFFFFFFF
+        x ^= x >> 15
+        x = (x * 0x85EBCA77) & 0xFFFFFFFF
+        return (x ^ (x >> 13)) & self.mask
+
+    def _encrypt(self, x):
+        left, right = x >> self.half, x & self.mask
+        for key in self.keys:
+            left, right = right, left ^ self._round(right, key)
+        return (left << self.half) | right
+
+    def __call__(self, j):
+        x = self._encrypt(j)
+        while x >= self.n:
+            x = self._encrypt(x)
+        return x
+
+
+class SurnameCursors:
+    """unique 抽样时的补位：抽到重复的姓名，就改取同一姓氏下下一个没出现过的姓名
+
+    每个姓氏第一次补位时才确定自己的随机顺序 (a*j + b) mod n（a 与 n 互素，
+    是 [0, n) 上的双射），之后只记住走到第几个，不会反复撞上重复。姓氏下的
+    姓名取完后按权重改抽其他姓氏，所以补出来的姓名姓氏仍按权重分布，名字
+    用字则是等概率的。
+    """
+
+    def __init__(self, space, pool, rng):
+        self.space = space
+        self.pool = pool
+        self.rng = rng
+        self.orders = {}
+        self.exhausted = set()
+
+    def _order(self, pos):
+        n = self.space.size_of(pos)
+        a = 1
+        if n > 2:
+            a = self.rng.randrange(1, n)
+            while math.gcd(a, n) != 1:
+                a = self.rng.randrange(1, n)
+        return [a, self.rng.randrange(n), 0, n]
+
+    def next_unseen(self, s, seen):
+        """s 姓下一个未出现过的姓名，并记入 seen"""
+        while True:
+            pos = None if s in self.exhausted else self.space.position.get(s)
+            if pos is not None:
+                order = self.orders.get(pos)
+                if order is None:
+                    order = self.orders[pos] = self._order(pos)
+                a, b, j, n = order
+                while j < n:
+                    name = self.space.name_in(pos, (a * j + b) % n)
+                    j += 1
+                    if seen.add(name):
+                        order[2] = j
+                        return name
+                order[2] = j
+            self.exhausted.add(s)
+            s = self.pool.draw(self.rng, self.exhausted)
+
+
+# 请求的不重复姓名数超过姓名空间的这个比例时，直接改用全空间随机排列
+ENUMERATE_RATIO = 0.5
+
+
+def generate_names(count, length, surname=None, second=None, seed=None,
+                   unique=False, batch_size=65536):
+    """逐个产出 count 个姓名（生成器），参数含义同 generate_name
+
+    每批先按权重一次性抽出整批的姓氏和候选字，再逐个套用排除规则。
+    unique 为 True 时先计算姓名空间大小，请求数超过空间时直接报错；
+    抽到重复的姓名时由 SurnameCursors 换成同姓氏下未出现过的姓名，
+    每次抽样都能产出一个姓名，未取完的姓氏仍按权重分布。请求数超过空间的
+    ENUMERATE_RATIO 时，改为按 FeistelPermutation 随机顺序解码整个空间，
+    各姓名等概率。seed 相同则结果相同。
+    """
+    space = NameSpace(length, surname, second)
+    if not len(space):
+        raise ValueError("没有符合条件的姓名")
+    if unique and count > len(space):
+        raise ValueError("符合条件的姓名只有{}个，无法生成{}个不重复的姓名".format(
+            len(space), count))
+
+    rng = random.Random(seed)
+    if unique and count > len(space) * ENUMERATE_RATIO:
+        permutation = FeistelPermutation(len(space), rng)
+        for j in range(count):
+            yield space.name_at(permutation(j))
+        return
+
+    pool = _surname_pool(length)
+    excluded = _surnames_with(pool, second)
+    seen = FingerprintSet(min(count, 1 << 20)) if unique else None
+    cursors = SurnameCursors(space, pool, rng) if unique else None
+    produced = 0
+    while produced < count:
+        size = min(batch_size, count - produced)
+        surnames = [surname] * size if surname else pool.draw_many(rng, size)
+        picks = iter(GIVEN_POOL.draw_many(rng, size * (length - 1)))
+        for s in surnames:
+            if s in excluded:
+                s = pool.draw(rng, excluded)
+            name = _complete(s, length, second, picks, rng)
+            if seen is not None and not seen.add(name):
+                name = cursors.next_unseen(s, seen)
+            yield name
+        produced += size
+
+
+def main():
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="批量生成简体中文姓名")
+    parser.add_argument("-n", "--count", type=int, default=10, help="生成数量")
+    parser.add_argument("-l", "--length", type=int, choices=(2, 3, 4), default=3, help="姓名字数")
+    parser.add_argument("--surname", help="指定姓氏")
+    parser.add_argument("--second", help="指定第二个字（紧跟姓氏的字）")
+    parser.add_argument("--seed", type=int, help="随机种子，相同种子生成相同结果")
+    parser.add_argument("--unique", action="store_true", help="保证姓名不重复")
+    parser.add_argument("-o", "--output", help="输出文件，默认输出到标准输出")
+    parser.add_argument("--check", action="store_true",
+                        help="抽样一百万次，检验经验分布与权重是否一致")
+    args = parser.parse_args()
+    try:
+        _check(args.length, args.surname, args.second)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.check:
+        ok = True
+        for label, pool in (("姓氏", SURNAME_POOL), ("名字用字", GIVEN_POOL)):
+            z = check_distribution(pool)
+            ok = ok and z < 5
+            print("{}：{}个候选，最大z分数 {:.2f}".format(label, len(pool), z))
+        sys.exit(0 if ok else 1)
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        batch = []
+        for name in generate_names(args.count, args.length, args.surname, args.second,
+                                   args.seed, args.unique):
+            batch.append(name)
+            if len(batch) == 65536:
+                out.write("\n".join(batch) + "\n")
+                batch = []
+        if batch:
+            out.write("\n".join(batch) + "\n")
+    except ValueError as e:
+        print("错误：{}".format(e), file=sys.stderr)
+        sys.exit(1)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
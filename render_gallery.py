@@ -0,0 +1,182 @@
+"""Render every turtle drawing in the repository for the gallery page
+
+Finds the "Draw ... .py" scripts (top level and one folder down, e.g. the
+MTR map), renders each one headlessly with turtle_headless in a separate
+worker process, and writes the images to an output folder.
+
+Each output is keyed by a hash of the script, every repo-local module it
+imported when it was last rendered (recorded in the manifest), the .json
+files in a script's own folder, the renderer sources and the render options.
+Drawings whose key has not changed since the last run are skipped, so a
+rebuild only spends time on what was edited, and a full rebuild uses every
+core.
+
+    python render_gallery.py                    # PNG into gallery/
+    python render_gallery.py --formats png,svg --scale 0.5 --jobs 4
+    python render_gallery.py --force            # ignore the cache
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+RENDERER_FILES = ["turtle_headless.py", "turtle_vector.py"]
+MANIFEST = "manifest.json"
+
+
+def discover(root=ROOT):
+    """Drawing scripts, sorted: root/Draw *.py and root/*/Draw *.py."""
+    scripts = glob.glob(os.path.join(root, "Draw *.py")) + glob.glob(os.path.join(root, "*", "Draw *.py"))
+    return sorted(scripts)
+
+
+def _dependencies(script, root=ROOT, modules=()):
+    """Files whose contents decide what script draws.
+
+    modules are the repo-local modules (paths relative to root) the script
+    imported last time it ran, as recorded by render_one().
+    """
+    files = [script] + [os.path.join(root, name) for name in RENDERER_FILES]
+    files += [os.path.join(root, name) for name in modules]
+    folder = os.path.dirname(script)
+    if os.path.abspath(folder) != os.path.abspath(root):
+        # scripts that live in their own folder may load data files from it
+        files += glob.glob(os.path.join(folder, "*.json"))
+    return sorted(set(os.path.abspath(f) for f in files))
+
+
+def source_key(script, options, root=ROOT, modules=()):
+    digest = hashlib.sha256()
+    for path in _dependencies(script, root, modules):
+        digest.update(os.path.relpath(path, root).encode("utf-8"))
+        try:
+            with open(path, "rb") as f:
+                digest.update(hashlib.sha256(f.read()).digest())
+        except OSError:   # a recorded module was removed: the key changes
+            digest.update(b"missing")
+    digest.update(json.dumps(options, sort_keys=True).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def output_names(script, formats):
+    stem = os.path.splitext(os.path.basename(script))[0]
+    return [stem + "." + fmt for fmt in formats]
+
+
+def _local_modules(root=ROOT):
+    """{module name: source path} for loaded modules that live under root."""
+    root = os.path.join(os.path.abspath(root), "")
+    local = {}
+    for name, module in list(sys.modules.items()):
+        path = getattr(module, "__file__", None)
+        if path and os.path.abspath(path).startswith(root):
+            local[name] = os.path.abspath(path)
+    return local
+
+
+def render_one(script, out_dir, formats, scale, root=ROOT):
+    """Worker: run the script once and save it in every requested format.
+
+    Returns (outputs, seconds, modules), modules being the repo-local
+    modules the script imported, relative to root.
+    """
+    import turtle_headless
+
+    # workers are reused: forget helpers an earlier drawing imported, so this
+    # script imports (and records) everything it needs itself
+    keep = {os.path.abspath(os.path.join(root, name)) for name in RENDERER_FILES}
+    keep.add(os.path.abspath(__file__))
+    for name, path in _local_modules(root).items():
+        if path not in keep:
+            del sys.modules[name]
+    before = set(_local_modules(root))
+
+    start = time.perf_counter()
+    screen = turtle_headless.run_script(script)
+    outputs = []
+    for name in output_names(script, formats):
+        path = os.path.join(out_dir, name)
+        turtle_headless.save(screen, path, scale=scale)
+        outputs.append(name)
+    modules = sorted(os.path.relpath(path, root) for name, path in _local_modules(root).items()
+                     if name not in before)
+    return outputs, time.perf_counter() - start, modules
+
+
+def load_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(out_dir, manifest):
+    path = os.path.join(out_dir, MANIFEST)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+
+def build(out_dir, formats=("png",), scale=1.0, jobs=None, force=False, root=ROOT):
+    """Render what changed; returns {script name: "cached" | "rendered" | error text}."""
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = load_manifest(out_dir)
+    options = {"formats": list(formats), "scale": scale}
+    results, pending = {}, {}
+    for script in discover(root):
+        name = os.path.relpath(script, root)
+        entry = manifest.get(name)
+        key = source_key(script, options, root, entry.get("modules", []) if entry else [])
+        if (not force and entry and entry["key"] == key
+                and all(os.path.exists(os.path.join(out_dir, o)) for o in entry["outputs"])):
+            results[name] = "cached"
+        else:
+            pending[name] = script
+
+    if pending:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = {pool.submit(render_one, script, out_dir, list(formats), scale, root): name
+                       for name, script in pending.items()}
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    outputs, seconds, modules = future.result()
+                except Exception as e:   # one broken drawing should not stop the rest
+                    results[name] = "error: {}: {}".format(type(e).__name__, e)
+                    manifest.pop(name, None)
+                    continue
+                manifest[name] = {"key": source_key(pending[name], options, root, modules),
+                                  "modules": modules, "outputs": outputs,
+                                  "seconds": round(seconds, 3)}
+                results[name] = "rendered"
+        save_manifest(out_dir, manifest)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render all turtle drawings headlessly, in parallel")
+    parser.add_argument("-o", "--out", default=os.path.join(ROOT, "gallery"), help="output folder")
+    parser.add_argument("--formats", default="png", help="comma separated: png, svg, pdf")
+    parser.add_argument("--scale", type=float, default=1.0, help="PNG scale, e.g. 0.25 for thumbnails")
+    parser.add_argument("-j", "--jobs", type=int, help="worker processes (default: all cores)")
+    parser.add_argument("--force", action="store_true", help="re-render even if nothing changed")
+    args = parser.parse_args()
+
+    formats = [f.strip().lower() for f in args.formats.split(",") if f.strip()]
+    start = time.perf_counter()
+    results = build(args.out, formats, args.scale, args.jobs, args.force)
+    for name in sorted(results):
+        print("{:<10} {}".format(results[name].split(":")[0], name)
+              + ("" if ":" not in results[name] else "  " + results[name].split(":", 1)[1].strip()))
+    print("{} drawings, {} rendered, {:.2f}s".format(
+        len(results), sum(r == "rendered" for r in results.values()), time.perf_counter() - start))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""Seedable Sakura tree generator for "Draw Sakura Tree.py"
+
+grow() walks the branching with an explicit stack instead of recursion and
+stores the result in flat arrays: one (x0, y0, x1, y1) segment, pen width
+and grey shade per branch, and one (x, y, heading) tip per blossom. The
+random draws happen in the same order as the original recursive tree(), so
+random.seed(s) before tree(12, 100) and grow(12, 100, seed=s) give the same
+tree.
+
+The arrays can then be drawn in one pass with animation off (draw), or
+written straight into turtle_headless's display list (record) for PNG, SVG
+or PDF output without going through the turtle calls at all:
+
+    python sakura_tree.py --depth 16 --seed 7 -o sakura.png
+"""
+import argparse
+import math
+import random
+import time
+from array import array
+
+LEAF_COLOR = "pink"
+LEAF_RADIUS = 3
+
+
+class Tree:
+    """Branch and blossom geometry, in drawing order."""
+
+    def __init__(self):
+        self.branches = array("d")   # x0, y0, x1, y1 per branch
+        self.widths = array("d")     # pen width per branch
+        self.shades = array("B")     # grey level 0-255 per branch
+        self.leaves = array("d")     # x, y, heading per blossom
+
+    def __len__(self):
+        return len(self.widths)
+
+    def leaf_count(self):
+        return len(self.leaves) // 3
+
+
+def grow(depth=12, length=100, seed=None, origin=(-100, -300), heading=90):
+    """Precompute a tree of the given depth (2 ** depth blossoms).
+
+    Each branch splits into a right branch turned 10-25 degrees and a left
+    one turned 10-25 degrees the other way, both 70-95% as long; lighter
+    shades go to branches facing the upper left, as if lit from there.
+    """
+    rng = random.Random(seed)
+    tree = Tree()
+    branches, widths, shades, leaves = tree.branches, tree.widths, tree.shades, tree.leaves
+    stack = [(origin[0], origin[1], heading, depth, length)]
+    while stack:
+        x, y, h, n, l = stack.pop()
+        a = math.radians(h)
+        x1, y1 = x + l * math.cos(a), y + l * math.sin(a)
+        shade = math.cos(math.radians(h + 45)) / 8 + 0.25
+        branches.extend((x, y, x1, y1))
+        widths.append(n / 3)
+        shades.append(int(round(shade * 255)))
+        if n > 0:
+            b = rng.random() * 15 + 10   # right branch turn
+            c = rng.random() * 15 + 10   # left branch turn
+            d = l * (rng.random() * 0.25 + 0.7)
+            # pushed left first so the right subtree is finished before it, as in tree()
+            stack.append((x1, y1, h + c, n - 1, d))
+            stack.append((x1, y1, h - b, n - 1, d))
+        else:
+            leaves.extend((x1, y1, h))
+    return tree
+
+
+def draw(t, tree, leaf_color=LEAF_COLOR, leaf_radius=LEAF_RADIUS):
+    """Draw all branches, then all blossoms, with animation off and one update().
+
+    t is the turtle module (or anything with its functions); pen size and
+    colour are only changed when they differ from the previous branch.
+    """
+    t.tracer(0, 0)
+    t.hideturtle()
+    t.penup()
+    width = shade = None
+    branches = tree.branches
+    for i in range(len(tree)):
+        if tree.widths[i] != width:
+            width = tree.widths[i]
+            t.pensize(width)
+        if tree.shades[i] != shade:
+            shade = tree.shades[i]
+            t.pencolor("#{0:02x}{0:02x}{0:02x}".format(shade))
+        t.goto(branches[4 * i], branches[4 * i + 1])
+        t.pendown()
+        t.goto(branches[4 * i + 2], branches[4 * i + 3])
+        t.penup()
+
+    t.pencolor(leaf_color)
+    t.pensize(1)
+    leaves = tree.leaves
+    for i in range(0, len(leaves), 3):
+        t.goto(leaves[i], leaves[i + 1])
+        t.setheading(leaves[i + 2] - 90)
+        t.pendown()
+        t.circle(leaf_radius)
+        t.penup()
+    t.update()
+
+
+def record(tree, screen=None, leaf_color=LEAF_COLOR, leaf_radius=LEAF_RADIUS):
+    """Add the tree to a turtle_headless screen's display list directly.
+
+    Produces the same ops draw() would record, without a turtle call per
+    segment; blossoms stay true arcs for SVG and PDF.
+    """
+    import turtle_headless
+
+    display = (screen or turtle_headless.Screen()).display
+    branches = tree.branches
+    for i in range(len(tree)):
+        g = tree.shades[i]
+        display.add(("stroke", [(branches[4 * i], branches[4 * i + 1]),
+                                (branches[4 * i + 2], branches[4 * i + 3])],
+                     (g, g, g), tree.widths[i]))
+
+    rgb = turtle_headless.parse_color((leaf_color,), 1.0)
+    steps = 1 + int(min(11 + leaf_radius / 6.0, 59.0))   # chords turtle.circle would use
+    leaves = tree.leaves
+    for i in range(0, len(leaves), 3):
+        x, y, h = leaves[i], leaves[i + 1], leaves[i + 2]
+        a = math.radians(h)
+        cx, cy = x + leaf_radius * math.cos(a), y + leaf_radius * math.sin(a)
+        start = math.degrees(math.atan2(y - cy, x - cx))
+        arc = turtle_headless.Arc(cx, cy, leaf_radius, start, 360.0, steps)
+        display.add(("stroke", [(x, y), arc], rgb, 1))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render a Sakura tree without the turtle window")
+    parser.add_argument("--depth", type=int, default=12, help="branching depth (default 12)")
+    parser.add_argument("--length", type=float, default=100, help="trunk length")
+    parser.add_argument("--seed", type=int, help="random seed; the same seed gives the same tree")
+    parser.add_argument("-o", "--output", default="sakura.png", help=".png, .svg or .pdf")
+    args = parser.parse_args()
+
+    import turtle_headless
+
+    start = time.perf_counter()
+    tree = grow(args.depth, args.length, args.seed)
+    grown = time.perf_counter()
+    turtle_headless.reset_state()
+    screen = turtle_headless.Screen()
+    record(tree, screen)
+    turtle_headless.save(screen, args.output)
+    print("{} branches, {} blossoms: grown in {:.2f}s, saved {} in {:.2f}s".format(
+        len(tree), tree.leaf_count(), grown - start, args.output, time.perf_counter() - grown))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Precomputed paths for the procedural turtle drawings (Draw Rose.py)
+
+A forward/turn loop such as
+
+    for x in range(1, 400):
+        pencolor(randint(0, 255), randint(0, 255), randint(0, 255))
+        fd(50 + x)
+        rt(90.911)
+
+is really a fixed list of vertices and a colour per segment. walk() and
+spiral() compute the vertices up front into a flat array('d')
+[x0, y0, x1, y1, ...], random_colors() the colours into an array('B')
+[r, g, b, ...], and draw_path() renders both in a single pass with the
+tracer off; record_path() writes them straight into a turtle_headless
+display list instead. Only the standard library is needed, like the
+drawing scripts themselves.
+
+    python spiral_geometry.py --count 600 --first 1 --turn -121 --seed 1 -o spiral.png
+"""
+import argparse
+import math
+import random
+from array import array
+from numbers import Number
+
+
+def walk(lengths, turns, x=0.0, y=0.0, heading=0.0):
+    """Vertices visited by fd(lengths[i]) followed by left(turns[i]).
+
+    turns is a sequence or one angle for every step (negative turns
+    right). Headings are computed from the running sum, not by rotating a
+    vector step by step, so long walks do not drift.
+    Returns array('d') [x0, y0, x1, y1, ...] with len(lengths) + 1 points.
+    """
+    if isinstance(turns, Number):
+        turns = [turns] * len(lengths)
+    points = array("d", (x, y))
+    for length, turn in zip(lengths, turns):
+        a = math.radians(heading)
+        x += length * math.cos(a)
+        y += length * math.sin(a)
+        points.append(x)
+        points.append(y)
+        heading += turn
+    return points
+
+
+def spiral(count, first, step=1.0, turn=-90.0, x=0.0, y=0.0, heading=0.0):
+    """Spiral of count segments whose lengths grow first, first + step, ...
+
+    A turn a little off 90 (or 120, 72, ...) degrees makes the polygon
+    rotate slowly as it grows, which is what gives Draw Rose.py its petals.
+    """
+    return walk([first + step * i for i in range(count)], turn, x, y, heading)
+
+
+def random_colors(count, seed=None, rng=None):
+    """count random RGB triples as array('B') [r, g, b, ...].
+
+    Draws r, g, b per colour in that order, so random.seed(s) with three
+    randint(0, 255) calls per segment gives the same colours as seed=s.
+    """
+    rng = rng or random.Random(seed)
+    return array("B", (rng.randint(0, 255) for _ in range(3 * count)))
+
+
+def _hex(colors, i):
+    return "#{:02x}{:02x}{:02x}".format(colors[3 * i], colors[3 * i + 1], colors[3 * i + 2])
+
+
+def draw_path(t, points, colors=None, width=None):
+    """Draw the polyline with one colour per segment (or the current pen
+    colour when colors is None), animation off and a single update().
+
+    t is the turtle module or anything with its functions.
+    """
+    t.tracer(0, 0)
+    t.hideturtle()
+    if width is not None:
+        t.pensize(width)
+    t.penup()
+    t.goto(points[0], points[1])
+    t.pendown()
+    color = None
+    for i in range(len(points) // 2 - 1):
+        if colors is not None:
+            c = _hex(colors, i)
+            if c != color:
+                t.pencolor(c)
+                color = c
+        t.goto(points[2 * i + 2], points[2 * i + 3])
+    t.penup()
+    t.update()
+
+
+def record_path(points, colors=None, screen=None, width=1, default="black"):
+    """Add the same strokes draw_path() would to a turtle_headless screen,
+    without a turtle call per segment."""
+    import turtle_headless
+
+    display = (screen or turtle_headless.Screen()).display
+    pairs = [(points[i], points[i + 1]) for i in range(0, len(points), 2)]
+    if colors is None:
+        rgb = turtle_headless.parse_color((default,), 1.0)
+        display.add(("stroke", pairs, rgb, width))
+        return
+    run, rgb = [pairs[0]], None
+    for i in range(len(pairs) - 1):
+        c = (colors[3 * i], colors[3 * i + 1], colors[3 * i + 2])
+        if c != rgb and rgb is not None:
+            # a colour change starts a new stroke, as turtle's pencolor() does
+            display.add(("stroke", run, rgb, width))
+            run = [pairs[i]]
+        rgb = c
+        run.append(pairs[i + 1])
+    display.add(("stroke", run, rgb, width))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render a coloured spiral without the turtle window")
+    parser.add_argument("--count", type=int, default=399, help="number of segments")
+    parser.add_argument("--first", type=float, default=51, help="length of the first segment")
+    parser.add_argument("--step", type=float, default=1, help="growth per segment")
+    parser.add_argument("--turn", type=float, default=-90.911, help="left turn per segment (negative: right)")
+    parser.add_argument("--seed", type=int, help="colour seed")
+    parser.add_argument("-o", "--output", default="spiral.png", help=".png, .svg or .pdf")
+    args = parser.parse_args()
+
+    import turtle_headless
+
+    turtle_headless.reset_state()
+    screen = turtle_headless.Screen()
+    screen.bgcolor("black")
+    record_path(spiral(args.count, args.first, args.step, args.turn),
+                random_colors(args.count, args.seed), screen)
+    turtle_headless.save(screen, args.output)
+    print("Saved: {}".format(args.output))
+
+
+if __name__ == "__main__":
+    main()
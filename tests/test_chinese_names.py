@@ -0,0 +1,42 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chinese_names  # noqa: E402
+from chinese_names import CharPool, check_distribution, generate_names  # noqa: E402
+
+
+class CheckDistributionTest(unittest.TestCase):
+    def test_weighted_pools_match_their_weights(self):
+        for pool in (chinese_names.SURNAME_POOL, chinese_names.GIVEN_POOL):
+            self.assertLess(check_distribution(pool, n=200000, seed=0), 5)
+
+    def test_wrong_weights_are_detected(self):
+        # 抽样按 1:1 进行，但声称的概率是 9:1，z 分数应远超 5
+        pool = CharPool("甲乙")
+        pool.probabilities = lambda: {"甲": 0.9, "乙": 0.1}
+        self.assertGreater(check_distribution(pool, n=10000, seed=0), 5)
+
+    def test_same_seed_same_result(self):
+        pool = chinese_names.GIVEN_POOL
+        self.assertEqual(check_distribution(pool, n=10000, seed=7),
+                         check_distribution(pool, n=10000, seed=7))
+
+
+class GenerateNamesTest(unittest.TestCase):
+    def test_unique_names_are_distinct_and_seeded(self):
+        names = list(generate_names(50000, 3, seed=1, unique=True))
+        self.assertEqual(len(set(names)), 50000)
+        self.assertEqual(names, list(generate_names(50000, 3, seed=1, unique=True)))
+
+    def test_unique_names_exhaust_one_surname(self):
+        n = len(chinese_names.NameSpace(3, "王"))
+        names = set(generate_names(n, 3, "王", seed=1, unique=True))
+        self.assertEqual(len(names), n)
+        self.assertTrue(all(name[0] == "王" and "王" not in name[1:] for name in names))
+
+
+if __name__ == "__main__":
+    unittest.main()
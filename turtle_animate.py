@@ -0,0 +1,424 @@
+"""Replay a turtle drawing as an animation: animated PNG (APNG) or GIF
+
+turtle_headless records every operation together with the distance the
+turtle had travelled when it happened (DisplayList.times). A Timeline
+replays that at a constant pen speed: frame k shows every op that started
+before its time, with the stroke in progress cut off part-way, and fills
+appearing when end_fill() completed them, exactly as the Tk window builds
+the picture up.
+
+Frames are rendered in parallel, each worker taking a run of consecutive
+frames. Only the rectangle that changed since the previous frame is kept
+(delta frames), identical frames are merged into a longer delay, and the
+result is written as APNG (exact colours) or GIF (up to 256 colours,
+otherwise a fixed 6x7x6 colour cube):
+
+    python turtle_animate.py "Draw Doraemon with Python.py"
+    python turtle_animate.py "Draw Rose.py" -o rose.png --fps 25 --duration 6
+    python turtle_animate.py "Draw Sakura Tree.py" 7 --duration 10
+
+As with turtle_headless.py, arguments that are not options of this tool
+go to the script (use ``--`` before script options).
+
+tracer() and speed() are ignored, so drawings that switch animation off
+still animate here.
+"""
+import argparse
+import math
+import os
+import struct
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import turtle_headless
+from turtle_headless import Arc
+
+DEFAULT_FPS = 20
+DEFAULT_SPEED = 1500   # turtle units travelled per second of animation
+DEFAULT_HOLD = 2.0     # seconds the finished drawing stays on the last frame
+
+
+def path_length(path):
+    """Distance the turtle travels along a path (arcs along their chords)."""
+    total = 0.0
+    x, y = path[0]
+    for node in path[1:]:
+        if isinstance(node, Arc):
+            total += node.length()
+            x, y = node.end()
+        else:
+            total += math.hypot(node[0] - x, node[1] - y)
+            x, y = node
+    return total
+
+
+def truncate(path, length):
+    """The first length units of a path; an arc is cut after its last
+    complete chord plus part of the next one, as turtle animates it."""
+    out = [path[0]]
+    x, y = path[0]
+    for node in path[1:]:
+        if isinstance(node, Arc):
+            seg = node.length()
+            if seg <= length:
+                out.append(node)
+                length -= seg
+                x, y = node.end()
+                continue
+            chord = seg / node.steps
+            done = min(int(length / chord), node.steps - 1)
+            if done:
+                out.append(node._replace(sweep=node.sweep * done / node.steps, steps=done))
+            x, y = out[-1].end() if done else (x, y)
+            nx, ny = node.points()[done]
+            f = (length - done * chord) / chord
+            out.append((x + (nx - x) * f, y + (ny - y) * f))
+            return out
+        seg = math.hypot(node[0] - x, node[1] - y)
+        if seg <= length:
+            out.append(node)
+            length -= seg
+            x, y = node
+            continue
+        f = length / seg
+        out.append((x + (node[0] - x) * f, y + (node[1] - y) * f))
+        return out
+    return out
+
+
+class Timeline:
+    """A recorded screen as (ops, start times, stroke lengths), with a fixed frame box."""
+
+    def __init__(self, screen, size=None, margin=20, scale=1.0):
+        display = screen.display
+        self.ops = list(display.ops)
+        self.times = list(display.times)
+        self.lengths = [path_length(op[1]) if op[0] == "stroke" else 0.0 for op in self.ops]
+        # when each op reaches its final look (a fill's time already is its end_fill)
+        self.done = [t + l for t, l in zip(self.times, self.lengths)]
+        self.duration = max(self.done or [0.0])
+        # the finished drawing decides the canvas, so every frame has the same size
+        self.box = turtle_headless.frame(screen, size, margin)
+        self.bg = screen._bgcolor
+        self.scale = scale
+
+    def ops_at(self, t, first=0, last=None):
+        """Ops[first:last] as visible once the turtle has travelled t units."""
+        out = []
+        for i in range(first, len(self.ops) if last is None else last):
+            op, start = self.ops[i], self.times[i]
+            if op[0] == "fill":
+                if op[1] and start <= t:
+                    out.append(op)
+                continue
+            if start > t:
+                break   # apart from fills, ops were added in clock order
+            if op[0] == "stroke" and start + self.lengths[i] > t:
+                op = (op[0], truncate(op[1], t - start)) + op[2:]
+            out.append(op)
+        return out
+
+    def render(self, t):
+        """One frame, drawn from scratch."""
+        return turtle_headless.paint(self.ops_at(t), self.box, self.bg, self.scale)
+
+
+class Painter:
+    """Renders a Timeline at increasing times without redrawing everything.
+
+    Ops that have reached their final look are painted once into a base
+    raster, in list order so the z-order is kept; a pending fill holds the
+    base back until its end_fill. Each frame is the base plus the ops
+    still in progress.
+    """
+
+    def __init__(self, timeline):
+        self.timeline = timeline
+        self.base = turtle_headless.paint([], timeline.box, timeline.bg, timeline.scale)
+        self.committed = 0
+
+    def render(self, t):
+        tl = self.timeline
+        k = self.committed
+        while k < len(tl.ops) and tl.done[k] <= t:
+            k += 1
+        if k > self.committed:
+            turtle_headless.paint(tl.ops_at(t, self.committed, k), tl.box, tl.bg, tl.scale, self.base)
+            self.committed = k
+        frame = self.base.copy()
+        return turtle_headless.paint(tl.ops_at(t, k), tl.box, tl.bg, tl.scale, frame)
+
+
+def _first_diff(a, b):
+    """Index of the first differing byte of two unequal rows (binary search
+    on slice comparisons, which run in C)."""
+    lo, hi = 0, len(a)
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if a[:mid] == b[:mid]:
+            lo = mid
+        else:
+            hi = mid
+    return lo
+
+
+def _last_diff(a, b):
+    lo, hi = 0, len(a)
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if a[mid:] == b[mid:]:
+            hi = mid
+        else:
+            lo = mid
+    return lo
+
+
+def delta(previous, current):
+    """(x, y, w, h, rgb bytes) covering every pixel that changed, or None."""
+    rows = [y for y, (a, b) in enumerate(zip(previous.rows, current.rows)) if a != b]
+    if not rows:
+        return None
+    y0, y1 = rows[0], rows[-1] + 1
+    x0 = min(_first_diff(previous.rows[y], current.rows[y]) for y in rows) // 3
+    x1 = max(_last_diff(previous.rows[y], current.rows[y]) for y in rows) // 3 + 1
+    data = b"".join(bytes(current.rows[y][x0 * 3:x1 * 3]) for y in range(y0, y1))
+    return x0, y0, x1 - x0, y1 - y0, data
+
+
+_timeline = None
+
+
+def _init_worker(timeline):
+    global _timeline
+    _timeline = timeline
+
+
+def _render_run(baseline, times):
+    """Worker: delta frames for consecutive times; baseline is the time of
+    the frame before the run, or None to emit the first frame in full."""
+    painter = Painter(_timeline)
+    previous = None if baseline is None else painter.render(baseline)
+    out = []
+    for t in times:
+        current = painter.render(t)
+        if previous is None:
+            out.append((0, 0, current.width, current.height,
+                        b"".join(bytes(row) for row in current.rows)))
+        else:
+            out.append(delta(previous, current))
+        previous = current
+    return out
+
+
+def frame_times(timeline, fps=DEFAULT_FPS, speed=DEFAULT_SPEED, duration=None):
+    """Clock values for frames 0..n, spread evenly over the drawing."""
+    seconds = duration if duration is not None else timeline.duration / speed
+    count = max(1, int(math.ceil(seconds * fps)))
+    return [timeline.duration * k / count for k in range(count + 1)]
+
+
+def render_frames(timeline, times, fps=DEFAULT_FPS, hold=DEFAULT_HOLD, jobs=None):
+    """[(x, y, w, h, rgb bytes, delay ms)], the first frame full size.
+
+    Consecutive frames are split into runs, one per task, so each worker
+    only renders one extra frame (the baseline) per run.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    runs = max(1, min(len(times), jobs * 4))
+    bounds = [len(times) * i // runs for i in range(runs + 1)]
+    tasks = [(times[a - 1] if a else None, times[a:b]) for a, b in zip(bounds, bounds[1:]) if b > a]
+    if jobs == 1:
+        _init_worker(timeline)
+        results = [_render_run(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                 initargs=(timeline,)) as pool:
+            results = list(pool.map(_render_run, *zip(*tasks)))
+
+    step = int(round(1000.0 / fps))
+    frames = []
+    for rect in (rect for run in results for rect in run):
+        if rect is None:
+            frames[-1][5] += step   # nothing changed: show the last frame longer
+        else:
+            frames.append(list(rect) + [step])
+    frames[-1][5] += int(hold * 1000)
+    return [tuple(f) for f in frames]
+
+
+# ---------------------------------------------------------------------------
+# APNG
+# ---------------------------------------------------------------------------
+
+def _chunk(tag, data):
+    return (struct.pack(">I", len(data)) + tag + data
+            + struct.pack(">I", zlib.crc32(tag + data) & 0xffffffff))
+
+
+def to_apng(width, height, frames):
+    """Animated PNG; later frames are sub-rectangles drawn over the previous one."""
+    out = [b"\x89PNG\r\n\x1a\n",
+           _chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)),
+           _chunk(b"acTL", struct.pack(">II", len(frames), 0))]
+    seq = 0
+    for i, (x, y, w, h, data, delay) in enumerate(frames):
+        # dispose_op NONE, blend_op SOURCE: the rectangle replaces what was there
+        out.append(_chunk(b"fcTL", struct.pack(">IIIIIHHBB", seq, w, h, x, y,
+                                               min(delay, 65535), 1000, 0, 0)))
+        seq += 1
+        stride = w * 3
+        raw = zlib.compress(b"".join(b"\x00" + data[r * stride:(r + 1) * stride]
+                                     for r in range(h)), 6)
+        if i == 0:
+            out.append(_chunk(b"IDAT", raw))
+        else:
+            out.append(_chunk(b"fdAT", struct.pack(">I", seq) + raw))
+            seq += 1
+    out.append(_chunk(b"IEND", b""))
+    return b"".join(out)
+
+
+# ---------------------------------------------------------------------------
+# GIF
+# ---------------------------------------------------------------------------
+
+def _triples(data):
+    """(r, g, b) tuples of packed RGB bytes, split by C-level slicing."""
+    return zip(data[0::3], data[1::3], data[2::3])
+
+
+def gif_palette(frames):
+    """(palette bytes, {(r, g, b): index}) covering every pixel of frames.
+
+    Uses the exact colours when there are at most 256 of them, otherwise
+    a 6x7x6 colour cube (green gets the extra level, the eye is most
+    sensitive to it).
+    """
+    colors = set()
+    for frame in frames:
+        colors.update(_triples(frame[4]))
+    if len(colors) <= 256:
+        ordered = sorted(colors)
+        return b"".join(bytes(c) for c in ordered), {c: i for i, c in enumerate(ordered)}
+    palette = b"".join(bytes((r * 255 // 5, g * 255 // 6, b * 255 // 5))
+                       for r in range(6) for g in range(7) for b in range(6))
+    return palette, {c: (c[0] * 6 // 256) * 42 + (c[1] * 7 // 256) * 6 + c[2] * 6 // 256
+                     for c in colors}
+
+
+def lzw(indices, min_size=8):
+    """GIF LZW compression of a list of palette indices (each < 256)."""
+    clear, end = 1 << min_size, (1 << min_size) + 1
+    out = bytearray()
+    size = min_size + 1
+    bits, nbits = clear, size
+    table = {}
+    get = table.get
+    next_code = end + 1
+    prefix = indices[0]
+    for c in indices[1:]:
+        key = prefix << 8 | c
+        code = get(key)
+        if code is not None:
+            prefix = code
+            continue
+        bits |= prefix << nbits
+        nbits += size
+        if next_code < 4096:
+            table[key] = next_code
+            next_code += 1
+            if next_code > (1 << size) and size < 12:
+                size += 1
+        else:
+            bits |= clear << nbits
+            nbits += size
+            table.clear()
+            next_code = end + 1
+            size = min_size + 1
+        if nbits >= 64:
+            # codes are packed LSB first; flush whole bytes in batches
+            out += (bits & 0xffffffffffffffff).to_bytes(8, "little")
+            bits >>= 64
+            nbits -= 64
+        prefix = c
+    bits |= prefix << nbits
+    nbits += size
+    bits |= end << nbits
+    nbits += size
+    out += bits.to_bytes((nbits + 7) // 8, "little")
+    return bytes(out)
+
+
+def gif_image(frame, index, min_size=8):
+    """Graphic control extension, image descriptor and LZW data of one frame."""
+    x, y, w, h, data, delay = frame
+    packed = lzw(list(map(index.__getitem__, _triples(data))), min_size)
+    # browsers treat delays under 20 ms as 100 ms; disposal 1 leaves the frame in place
+    return (struct.pack("<BBBBHBB", 0x21, 0xf9, 4, 0x04, max(2, int(round(delay / 10.0))), 0, 0)
+            + struct.pack("<BHHHHB", 0x2c, x, y, w, h, 0)
+            + bytes((min_size,))
+            + b"".join(bytes((len(packed[i:i + 255]),)) + packed[i:i + 255]
+                       for i in range(0, len(packed), 255))
+            + b"\x00")
+
+
+def to_gif(width, height, frames, jobs=None):
+    """Looping GIF89a of delta frames; frames are compressed in parallel."""
+    palette, index = gif_palette(frames)
+    bits = max(2, (len(palette) // 3 - 1).bit_length())
+    palette += b"\x00" * (3 * (1 << bits) - len(palette))
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1:
+        images = [gif_image(frame, index, bits) for frame in frames]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            images = list(pool.map(gif_image, frames, repeat(index), repeat(bits)))
+    return b"".join([b"GIF89a", struct.pack("<HHBBB", width, height, 0x80 | (bits - 1), 0, 0),
+                     palette, b"\x21\xff\x0bNETSCAPE2.0\x03\x01\x00\x00\x00"]
+                    + images + [b"\x3b"])
+
+
+def save(timeline, output, fps=DEFAULT_FPS, speed=DEFAULT_SPEED, duration=None,
+         hold=DEFAULT_HOLD, jobs=None):
+    """Render and write the animation; .gif writes GIF, anything else APNG."""
+    frames = render_frames(timeline, frame_times(timeline, fps, speed, duration), fps, hold, jobs)
+    width, height = frames[0][2], frames[0][3]
+    if os.path.splitext(output)[1].lower() == ".gif":
+        data = to_gif(width, height, frames, jobs)
+    else:
+        data = to_apng(width, height, frames)
+    with open(output, "wb") as f:
+        f.write(data)
+    return frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record a turtle script as an animated GIF or APNG")
+    parser.add_argument("script", help="turtle drawing script to run")
+    parser.add_argument("-o", "--output",
+                        help="output file; .gif for GIF, otherwise APNG (default: script name + .gif)")
+    parser.add_argument("--fps", type=float, default=DEFAULT_FPS, help="frames per second")
+    parser.add_argument("--speed", type=float, default=DEFAULT_SPEED,
+                        help="turtle units drawn per second")
+    parser.add_argument("--duration", type=float, help="total drawing time in seconds (overrides --speed)")
+    parser.add_argument("--hold", type=float, default=DEFAULT_HOLD, help="seconds to show the result")
+    parser.add_argument("--scale", type=float, default=1.0, help="image scale, e.g. 0.5")
+    parser.add_argument("--size", help="fixed canvas size WxH centred on the origin")
+    parser.add_argument("-j", "--jobs", type=int, help="worker processes (default: all cores)")
+    parser.add_argument("script_args", nargs="*",
+                        help="arguments passed on to the script (after -- if they start with -)")
+    args = parser.parse_intermixed_args()
+
+    output = args.output or os.path.splitext(os.path.basename(args.script))[0] + ".gif"
+    size = tuple(int(v) for v in args.size.lower().split("x")) if args.size else None
+    start = time.perf_counter()
+    timeline = Timeline(turtle_headless.run_script(args.script, args.script_args), size, scale=args.scale)
+    frames = save(timeline, output, args.fps, args.speed, args.duration, args.hold, args.jobs)
+    print("Saved: {} ({} frames, {:.1f}s of animation, rendered in {:.1f}s)".format(
+        output, len(frames), sum(f[5] for f in frames) / 1000.0, time.perf_counter() - start))
+
+
+if __name__ == "__main__":
+    main()
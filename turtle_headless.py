@@ -0,0 +1,907 @@
+"""Headless drop-in replacement for the turtle module
+
+Records every drawing call into a display list instead of animating it in
+a Tk window, then rasterizes the result straight to PNG with a pure-Python
+scanline renderer (no Tk, no animation delay).
+
+Run any of the drawing scripts through it:
+
+    python turtle_headless.py "Draw Rose.py" -o rose.png
+    python turtle_headless.py "Draw Sakura Tree.py" 7 14 -o sakura.png
+
+Options may come before or after the script; every other argument is
+passed on to the script, and anything after ``--`` goes to the script even
+if it looks like an option.
+
+An .svg or .pdf output name writes a vector file instead (see
+turtle_vector.py), with circle() arcs kept as real arcs.
+
+The script is executed with this module installed as ``turtle``, so both
+``import turtle as t`` and ``from turtle import *`` pick it up unchanged.
+"""
+import argparse
+import math
+import os
+import runpy
+import struct
+import sys
+import unicodedata
+import zlib
+from collections import namedtuple
+
+# Tk (X11) values, so e.g. "green" is #00ff00 as in the real turtle window
+COLORS = {
+    "black": (0, 0, 0), "white": (255, 255, 255), "red": (255, 0, 0),
+    "green": (0, 255, 0), "blue": (0, 0, 255), "yellow": (255, 255, 0),
+    "cyan": (0, 255, 255), "magenta": (255, 0, 255), "orange": (255, 165, 0),
+    "purple": (160, 32, 240), "pink": (255, 192, 203), "brown": (165, 42, 42),
+    "gray": (190, 190, 190), "grey": (190, 190, 190),
+    "lightgray": (211, 211, 211), "lightgrey": (211, 211, 211),
+    "darkgray": (169, 169, 169), "darkgrey": (169, 169, 169),
+    "gold": (255, 215, 0), "lightgoldenrod": (238, 221, 130),
+    "lightblue": (173, 216, 230), "skyblue": (135, 206, 235),
+    "darkblue": (0, 0, 139), "navy": (0, 0, 128), "lime": (0, 255, 0),
+    "darkgreen": (0, 100, 0), "lightgreen": (144, 238, 144),
+    "darkred": (139, 0, 0), "violet": (238, 130, 238), "tan": (210, 180, 140),
+    "beige": (245, 245, 220), "salmon": (250, 128, 114), "tomato": (255, 99, 71),
+    "coral": (255, 127, 80), "crimson": (220, 20, 60), "hotpink": (255, 105, 180),
+    "deeppink": (255, 20, 147), "lightpink": (255, 182, 193),
+    "chocolate": (210, 105, 30), "sienna": (160, 82, 45), "maroon": (176, 48, 96),
+    "olive": (128, 128, 0), "teal": (0, 128, 128), "turquoise": (64, 224, 208),
+    "indigo": (75, 0, 130), "silver": (192, 192, 192), "ivory": (255, 255, 240),
+    "khaki": (240, 230, 140), "wheat": (245, 222, 179), "snow": (255, 250, 250),
+    "firebrick": (178, 34, 34), "orchid": (218, 112, 214), "plum": (221, 160, 221),
+    "steelblue": (70, 130, 180), "royalblue": (65, 105, 225),
+    "deepskyblue": (0, 191, 255), "dodgerblue": (30, 144, 255),
+    "forestgreen": (34, 139, 34), "seagreen": (46, 139, 87),
+    "yellowgreen": (154, 205, 50), "greenyellow": (173, 255, 47),
+    "orangered": (255, 69, 0), "slateblue": (106, 90, 205),
+    "darkslategray": (47, 79, 79), "darkslategrey": (47, 79, 79),
+}
+
+
+class TurtleGraphicsError(Exception):
+    """Same name as turtle's own error so scripts can catch it unchanged."""
+
+
+def parse_color(args, colormode):
+    """Convert any turtle colour spec (name, #hex, tuple, r, g, b) to an RGB tuple."""
+    if len(args) == 1:
+        args = args[0]
+    if isinstance(args, str):
+        name = args.lower().replace(" ", "")
+        if name in COLORS:
+            return COLORS[name]
+        if name.startswith("#") and len(name) in (4, 7):
+            digits = name[1:]
+            if len(digits) == 3:
+                digits = "".join(c * 2 for c in digits)
+            try:
+                return tuple(int(digits[i:i + 2], 16) for i in (0, 2, 4))
+            except ValueError:
+                pass
+        raise TurtleGraphicsError("bad color string: {}".format(args))
+    try:
+        r, g, b = args
+    except (TypeError, ValueError):
+        raise TurtleGraphicsError("bad color arguments: {}".format(args))
+    if colormode == 1.0:
+        r, g, b = (x * 255 for x in (r, g, b))
+    if not all(0 <= x <= 255 for x in (r, g, b)):
+        raise TurtleGraphicsError("bad color sequence: {}".format(args))
+    return int(round(r)), int(round(g)), int(round(b))
+
+
+class Arc(namedtuple("Arc", "cx cy radius start sweep steps")):
+    """Circular arc path node from circle(): centre, radius, start angle and
+    signed sweep in degrees (counter-clockwise positive), plus the number of
+    chords turtle itself would draw for it."""
+
+    def end(self):
+        a = math.radians(self.start + self.sweep)
+        return self.cx + self.radius * math.cos(a), self.cy + self.radius * math.sin(a)
+
+    def points(self):
+        """The chord vertices turtle.circle visits, excluding the start point."""
+        step = self.sweep / self.steps
+        return [(self.cx + self.radius * math.cos(math.radians(self.start + step * i)),
+                 self.cy + self.radius * math.sin(math.radians(self.start + step * i)))
+                for i in range(1, self.steps + 1)]
+
+    def length(self):
+        """Distance along the chords, i.e. how far the turtle travels."""
+        chord = 2 * self.radius * math.sin(math.radians(abs(self.sweep)) / self.steps / 2)
+        return chord * self.steps
+
+
+def flatten(path):
+    """Path of (x, y) points and Arc nodes -> plain list of points."""
+    points = []
+    for node in path:
+        if isinstance(node, Arc):
+            points.extend(node.points())
+        else:
+            points.append(node)
+    return points
+
+
+def text_width(text, px):
+    """Rough advance of text at px pixels: full width for CJK, 0.6em otherwise."""
+    return sum(px if unicodedata.east_asian_width(c) in "WF" else 0.6 * px for c in text)
+
+
+class DisplayList:
+    """Recorded drawing operations, in z-order
+
+    ops are tuples:
+        ("stroke", path, rgb, width)     open path
+        ("fill", path, rgb)              filled path (even-odd rule)
+        ("dot", (x, y), diameter, rgb)
+        ("text", (x, y), text, rgb, font, align)
+
+    A path starts with an (x, y) point; the rest are points (straight
+    segments) or Arc nodes, so circle() survives as a true arc for vector
+    output and is only flattened when rasterized.
+
+    clock is the distance the turtles have travelled so far, pen up or
+    down; times[i] is the clock when ops[i] started (for a fill: when it
+    was completed by end_fill), which is what turtle_animate replays.
+    """
+
+    def __init__(self):
+        self.ops = []
+        self.times = []
+        self.clock = 0.0
+
+    def add(self, op):
+        self.ops.append(op)
+        self.times.append(self.clock)
+        return len(self.ops) - 1
+
+    def bounds(self):
+        """(xmin, ymin, xmax, ymax) of everything drawn, or None."""
+        xs, ys = [], []
+        for op in self.ops:
+            kind = op[0]
+            if kind in ("stroke", "fill"):
+                if not op[1]:
+                    continue
+                # a full circle's box is its centre +- radius, no need to flatten it
+                points = []
+                for node in op[1]:
+                    if isinstance(node, Arc) and abs(node.sweep) >= 360:
+                        points += [(node.cx - node.radius, node.cy - node.radius),
+                                   (node.cx + node.radius, node.cy + node.radius)]
+                    elif isinstance(node, Arc):
+                        points += node.points()
+                    else:
+                        points.append(node)
+                pad = op[3] / 2 if kind == "stroke" else 0
+                xs += [min(p[0] for p in points) - pad, max(p[0] for p in points) + pad]
+                ys += [min(p[1] for p in points) - pad, max(p[1] for p in points) + pad]
+            elif kind == "dot":
+                (x, y), r = op[1], op[2] / 2
+                xs += [x - r, x + r]
+                ys += [y - r, y + r]
+            elif kind == "text":
+                (x, y), text, font, align = op[1], op[2], op[4], op[5]
+                px = abs(font[1]) * 4 / 3.0 if len(font) > 1 else 11
+                rows = text.split("\n")
+                width = max(text_width(row, px) for row in rows)
+                left = x - width * {"center": 0.5, "right": 1.0}.get(align, 0.0)
+                xs += [left, left + width]
+                ys += [y, y + px * 1.2 * len(rows)]
+        if not xs:
+            return None
+        return min(xs), min(ys), max(xs), max(ys)
+
+
+class _Screen:
+    """The single drawing surface shared by all turtles."""
+
+    def __init__(self):
+        self.display = DisplayList()
+        self.turtles = []
+        self._bgcolor = (255, 255, 255)
+        self._colormode = 1.0
+        self._size = None
+        self._title = ""
+
+    # -- state that affects output --
+    def bgcolor(self, *args):
+        if not args:
+            return self._bgcolor
+        self._bgcolor = parse_color(args, self._colormode)
+
+    def colormode(self, cmode=None):
+        if cmode is None:
+            return self._colormode
+        if cmode == 1.0:
+            self._colormode = 1.0
+        elif cmode == 255:
+            self._colormode = 255
+        else:
+            raise TurtleGraphicsError("colormode must be 1.0 or 255")
+
+    def setup(self, width=None, height=None, startx=None, starty=None):
+        if isinstance(width, int) and isinstance(height, int):
+            self._size = (width, height)
+
+    def screensize(self, canvwidth=None, canvheight=None, bg=None):
+        if bg is not None:
+            self.bgcolor(bg)
+        if canvwidth is None and canvheight is None:
+            return self._size or (400, 300)
+
+    def title(self, titlestring):
+        self._title = titlestring
+
+    def window_width(self):
+        return (self._size or (800, 600))[0]
+
+    def window_height(self):
+        return (self._size or (800, 600))[1]
+
+    def clear(self):
+        self.display = DisplayList()
+        self.turtles = []
+
+    def reset(self):
+        for t in self.turtles:
+            t.reset()
+
+    def turtles_(self):
+        return list(self.turtles)
+
+    # -- animation / event loop: nothing to do headlessly --
+    def tracer(self, n=None, delay=None):
+        return 0 if n is None else None
+
+    def update(self):
+        pass
+
+    def delay(self, delay=None):
+        return 0 if delay is None else None
+
+    def mainloop(self):
+        pass
+
+    done = mainloop
+
+    def exitonclick(self):
+        pass
+
+    def bye(self):
+        pass
+
+    def listen(self, xdummy=None, ydummy=None):
+        pass
+
+    def onscreenclick(self, fun, btn=1, add=None):
+        pass
+
+    onclick = onscreenclick
+
+    def onkey(self, fun, key):
+        pass
+
+    onkeyrelease = onkey
+
+    def onkeypress(self, fun, key=None):
+        pass
+
+    def ontimer(self, fun, t=0):
+        pass
+
+    def getcanvas(self):
+        return None
+
+
+_screen = None
+
+
+def Screen():
+    global _screen
+    if _screen is None:
+        _screen = _Screen()
+    return _screen
+
+
+class Turtle:
+    """Turtle with the navigation/pen API of turtle.Turtle, recording instead of drawing."""
+
+    def __init__(self, shape="classic", undobuffersize=1000, visible=True, screen=None):
+        self.screen = screen or Screen()
+        self.screen.turtles.append(self)
+        self.reset()
+
+    def reset(self):
+        self._x, self._y = 0.0, 0.0
+        self._heading = 0.0
+        self._down = True
+        self._pencolor = (0, 0, 0)
+        self._fillcolor = (0, 0, 0)
+        self._pensize = 1
+        self._visible = True
+        self._speed = 3
+        self._stroke = None
+        self._fill_path = None
+        self._fill_index = None
+
+    # -- internal drawing --
+    def _colormode(self):
+        return self.screen._colormode
+
+    def _flush(self):
+        """Close the polyline being built so the next segment starts a new op."""
+        self._stroke = None
+
+    def _move(self, x, y, node=None):
+        """Go to (x, y) along node (an Arc), or in a straight line when node is None."""
+        if node is None:
+            node = (x, y)
+            self.screen.display.clock += math.hypot(x - self._x, y - self._y)
+        else:
+            self.screen.display.clock += node.length()
+        if self._down:
+            if self._stroke is None:
+                self._stroke = [(self._x, self._y)]
+                self.screen.display.add(("stroke", self._stroke, self._pencolor, self._pensize))
+            self._stroke.append(node)
+        if self._fill_path is not None:
+            self._fill_path.append(node)
+        self._x, self._y = x, y
+
+    def _rotate(self, angle):
+        self._heading = (self._heading + angle) % 360.0
+
+    # -- motion --
+    def forward(self, distance):
+        a = math.radians(self._heading)
+        self._move(self._x + distance * math.cos(a), self._y + distance * math.sin(a))
+
+    fd = forward
+
+    def back(self, distance):
+        self.forward(-distance)
+
+    bk = backward = back
+
+    def right(self, angle):
+        self._rotate(-angle)
+
+    rt = right
+
+    def left(self, angle):
+        self._rotate(angle)
+
+    lt = left
+
+    def goto(self, x, y=None):
+        if y is None:
+            x, y = x
+        self._move(float(x), float(y))
+
+    setpos = setposition = goto
+
+    def setx(self, x):
+        self._move(float(x), self._y)
+
+    def sety(self, y):
+        self._move(self._x, float(y))
+
+    def setheading(self, to_angle):
+        self._heading = float(to_angle) % 360.0
+
+    seth = setheading
+
+    def home(self):
+        self.goto(0, 0)
+        self.setheading(0)
+
+    def circle(self, radius, extent=None, steps=None):
+        """Recorded as a true arc; rasterizing uses turtle.circle's own chords,
+        so the PNG matches the Tk window."""
+        if extent is None:
+            extent = 360.0
+        if steps is None:
+            frac = abs(extent) / 360.0
+            steps = 1 + int(min(11 + abs(radius) / 6.0, 59.0) * frac)
+        if radius == 0:
+            self._rotate(extent)
+            return
+        h = math.radians(self._heading)
+        cx, cy = self._x - radius * math.sin(h), self._y + radius * math.cos(h)
+        start = math.degrees(math.atan2(self._y - cy, self._x - cx))
+        sweep = extent if radius > 0 else -extent
+        arc = Arc(cx, cy, abs(radius), start, sweep, steps)
+        x, y = arc.end()
+        self._move(x, y, arc)
+        self._rotate(sweep)
+
+    def dot(self, size=None, *color):
+        if size is None:
+            size = max(self._pensize + 4, 2 * self._pensize)
+        rgb = parse_color(color, self._colormode()) if color else self._pencolor
+        self.screen.display.add(("dot", (self._x, self._y), size, rgb))
+        self._flush()
+
+    def stamp(self):
+        return 0
+
+    def clearstamps(self, n=None):
+        pass
+
+    def undo(self):
+        pass
+
+    def speed(self, speed=None):
+        if speed is None:
+            return self._speed
+        self._speed = speed
+
+    # -- state queries --
+    def position(self):
+        return (self._x, self._y)
+
+    pos = position
+
+    def xcor(self):
+        return self._x
+
+    def ycor(self):
+        return self._y
+
+    def heading(self):
+        return self._heading
+
+    def towards(self, x, y=None):
+        if y is None:
+            x, y = x
+        return math.degrees(math.atan2(y - self._y, x - self._x)) % 360.0
+
+    def distance(self, x, y=None):
+        if y is None:
+            x, y = x
+        return math.hypot(x - self._x, y - self._y)
+
+    def degrees(self, fullcircle=360.0):
+        pass
+
+    # -- pen --
+    def pendown(self):
+        self._down = True
+
+    pd = down = pendown
+
+    def penup(self):
+        self._down = False
+        self._flush()
+
+    pu = up = penup
+
+    def isdown(self):
+        return self._down
+
+    def pensize(self, width=None):
+        if width is None:
+            return self._pensize
+        self._pensize = width
+        self._flush()
+
+    width = pensize
+
+    def pencolor(self, *args):
+        if not args:
+            return self._pencolor
+        self._pencolor = parse_color(args, self._colormode())
+        self._flush()
+
+    def fillcolor(self, *args):
+        if not args:
+            return self._fillcolor
+        self._fillcolor = parse_color(args, self._colormode())
+
+    def color(self, *args):
+        if not args:
+            return self._pencolor, self._fillcolor
+        if len(args) == 2:
+            self.pencolor(args[0])
+            self.fillcolor(args[1])
+        else:
+            self.pencolor(*args)
+            self.fillcolor(*args)
+
+    def begin_fill(self):
+        # The fill is created now so that later strokes are drawn on top of it, as in Tk.
+        self._fill_path = [(self._x, self._y)]
+        self._fill_index = self.screen.display.add(("fill", [], self._fillcolor))
+        self._flush()
+
+    def end_fill(self):
+        if self._fill_path is not None and len(flatten(self._fill_path)) > 2:
+            self.screen.display.ops[self._fill_index] = ("fill", self._fill_path, self._fillcolor)
+            self.screen.display.times[self._fill_index] = self.screen.display.clock
+        self._fill_path = None
+        self._fill_index = None
+
+    def filling(self):
+        return self._fill_path is not None
+
+    def write(self, arg, move=False, align="left", font=("Arial", 8, "normal")):
+        self.screen.display.add(("text", (self._x, self._y), str(arg), self._pencolor,
+                                 font, align.lower()))
+
+    # -- visibility / shape: no visual effect headlessly --
+    def hideturtle(self):
+        self._visible = False
+
+    ht = hideturtle
+
+    def showturtle(self):
+        self._visible = True
+
+    st = showturtle
+
+    def isvisible(self):
+        return self._visible
+
+    def shape(self, name=None):
+        return "classic" if name is None else None
+
+    def shapesize(self, *args, **kwargs):
+        pass
+
+    turtlesize = shapesize
+
+    def onclick(self, fun, btn=1, add=None):
+        pass
+
+    def getscreen(self):
+        return self.screen
+
+    def clear(self):
+        self._flush()
+
+
+Pen = RawTurtle = RawPen = Turtle
+
+_pen = None
+
+
+def getturtle():
+    global _pen
+    if _pen is None:
+        _pen = Turtle()
+    return _pen
+
+
+getpen = getturtle
+
+_TURTLE_METHODS = [
+    "forward", "fd", "back", "bk", "backward", "right", "rt", "left", "lt", "goto",
+    "setpos", "setposition", "setx", "sety", "setheading", "seth", "home", "circle",
+    "dot", "stamp", "clearstamps", "undo", "speed", "position", "pos", "xcor", "ycor",
+    "heading", "towards", "distance", "degrees", "pendown", "pd", "down", "penup",
+    "pu", "up", "isdown", "pensize", "width", "pencolor", "fillcolor", "color",
+    "begin_fill", "end_fill", "filling", "write", "hideturtle", "ht", "showturtle",
+    "st", "isvisible", "shape", "shapesize", "turtlesize", "getscreen", "reset",
+]
+_SCREEN_METHODS = [
+    "bgcolor", "colormode", "setup", "screensize", "title", "window_width",
+    "window_height", "tracer", "update", "delay", "mainloop", "done", "exitonclick",
+    "bye", "listen", "onscreenclick", "onkey", "onkeyrelease", "onkeypress", "ontimer",
+    "getcanvas",
+]
+
+
+def _make_turtle_function(name):
+    def func(*args, **kwargs):
+        return getattr(getturtle(), name)(*args, **kwargs)
+    func.__name__ = name
+    return func
+
+
+def _make_screen_function(name):
+    def func(*args, **kwargs):
+        return getattr(Screen(), name)(*args, **kwargs)
+    func.__name__ = name
+    return func
+
+
+for _name in _TURTLE_METHODS:
+    globals()[_name] = _make_turtle_function(_name)
+for _name in _SCREEN_METHODS:
+    globals()[_name] = _make_screen_function(_name)
+
+
+def clear():
+    getturtle().clear()
+
+
+def clearscreen():
+    Screen().clear()
+
+
+def resetscreen():
+    Screen().reset()
+
+
+__all__ = (["Turtle", "Pen", "RawTurtle", "RawPen", "Screen", "TurtleGraphicsError",
+            "getturtle", "getpen", "clear", "clearscreen", "resetscreen"]
+           + _TURTLE_METHODS + _SCREEN_METHODS)
+
+
+def reset_state():
+    """Forget the current screen and default turtle (used between renders)."""
+    global _screen, _pen
+    _screen = None
+    _pen = None
+
+
+# ---------------------------------------------------------------------------
+# Rasterizer
+# ---------------------------------------------------------------------------
+
+class Raster:
+    """RGB image as one bytearray per row; all drawing is done with span fills."""
+
+    def __init__(self, width, height, bg):
+        self.width, self.height = width, height
+        row = bytes(bg) * width
+        self.rows = [bytearray(row) for _ in range(height)]
+        self._discs = {}
+
+    def copy(self):
+        other = Raster.__new__(Raster)
+        other.width, other.height = self.width, self.height
+        other.rows = [bytearray(row) for row in self.rows]
+        other._discs = self._discs
+        return other
+
+    def span(self, y, x0, x1, rgb):
+        """Fill pixels [x0, x1) of row y."""
+        if 0 <= y < self.height:
+            x0, x1 = max(x0, 0), min(x1, self.width)
+            if x1 > x0:
+                self.rows[y][x0 * 3:x1 * 3] = bytes(rgb) * (x1 - x0)
+
+    def polygon(self, points, rgb):
+        """Even-odd scanline fill; pixels are sampled at their centres."""
+        if len(points) < 3:
+            return
+        edges = []
+        n = len(points)
+        for i in range(n):
+            (x0, y0), (x1, y1) = points[i], points[(i + 1) % n]
+            if y0 == y1:
+                continue
+            if y0 > y1:
+                x0, y0, x1, y1 = x1, y1, x0, y0
+            edges.append((y0, y1, x0, (x1 - x0) / (y1 - y0)))
+        if not edges:
+            return
+        edges.sort()
+        ymin = max(int(math.floor(edges[0][0])), 0)
+        ymax = min(int(math.ceil(max(e[1] for e in edges))), self.height - 1)
+        active = []
+        next_edge = 0
+        for y in range(ymin, ymax + 1):
+            yc = y + 0.5
+            while next_edge < len(edges) and edges[next_edge][0] <= yc:
+                active.append(edges[next_edge])
+                next_edge += 1
+            active = [e for e in active if e[1] > yc]
+            xs = sorted(x0 + (yc - y0) * slope for y0, y1, x0, slope in active if y0 <= yc)
+            for i in range(0, len(xs) - 1, 2):
+                self.span(y, int(math.ceil(xs[i] - 0.5)), int(math.ceil(xs[i + 1] - 0.5)), rgb)
+
+    def disc(self, cx, cy, radius, rgb):
+        if radius <= 0.5:
+            self.span(int(cy), int(cx), int(cx) + 1, rgb)
+            return
+        key = round(radius * 2) / 2
+        offsets = self._discs.get(key)
+        if offsets is None:
+            r = int(math.ceil(key))
+            offsets = []
+            for dy in range(-r, r + 1):
+                half = key * key - (dy + 0.5 - 0.5) ** 2
+                if half >= 0:
+                    dx = math.sqrt(half)
+                    offsets.append((dy, int(round(-dx)), int(round(dx)) + 1))
+            self._discs[key] = offsets
+        ix, iy = int(round(cx)), int(round(cy))
+        for dy, x0, x1 in offsets:
+            self.span(iy + dy, ix + x0, ix + x1, rgb)
+
+    def thin_segment(self, x0, y0, x1, y1, rgb, width):
+        """DDA line for pens up to 3px: one short run per step, far cheaper than a quad."""
+        dx, dy = x1 - x0, y1 - y0
+        steps = int(max(abs(dx), abs(dy))) + 1
+        sx, sy = dx / steps, dy / steps
+        lo = (width - 1) // 2
+        hi = width - lo
+        rows, w, h = self.rows, self.width, self.height
+        if abs(dx) >= abs(dy):
+            pixel = bytes(rgb)
+            for i in range(steps + 1):
+                x, y = int(x0 + sx * i), int(y0 + sy * i)
+                if 0 <= x < w:
+                    for yy in range(max(y - lo, 0), min(y + hi, h)):
+                        rows[yy][x * 3:x * 3 + 3] = pixel
+        else:
+            run = bytes(rgb) * width
+            for i in range(steps + 1):
+                x, y = int(x0 + sx * i) - lo, int(y0 + sy * i)
+                if 0 <= y < h and 0 <= x and x + width <= w:
+                    rows[y][x * 3:(x + width) * 3] = run
+                else:
+                    self.span(y, x, x + width, rgb)
+
+    def polyline(self, points, rgb, width):
+        """Thick polyline with round caps and joins, like Tk's turtle lines."""
+        half = max(width, 1) / 2.0
+        if width <= 3:
+            for (x0, y0), (x1, y1) in zip(points, points[1:]):
+                self.thin_segment(x0, y0, x1, y1, rgb, max(int(round(width)), 1))
+            if len(points) == 1:
+                self.disc(points[0][0], points[0][1], half, rgb)
+            return
+        for (x0, y0), (x1, y1) in zip(points, points[1:]):
+            dx, dy = x1 - x0, y1 - y0
+            length = math.hypot(dx, dy)
+            if length < 1e-9:
+                continue
+            nx, ny = -dy / length * half, dx / length * half
+            self.polygon([(x0 + nx, y0 + ny), (x1 + nx, y1 + ny),
+                          (x1 - nx, y1 - ny), (x0 - nx, y0 - ny)], rgb)
+        if half > 1:
+            for x, y in points:
+                self.disc(x, y, half, rgb)
+        elif len(points) == 1 or all(p == points[0] for p in points):
+            self.disc(points[0][0], points[0][1], half, rgb)
+
+    def to_png(self):
+        raw = b"".join(b"\x00" + bytes(row) for row in self.rows)
+
+        def chunk(kind, data):
+            body = kind + data
+            return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body))
+
+        return (b"\x89PNG\r\n\x1a\n"
+                + chunk(b"IHDR", struct.pack(">IIBBBBB", self.width, self.height, 8, 2, 0, 0, 0))
+                + chunk(b"IDAT", zlib.compress(raw, 6))
+                + chunk(b"IEND", b""))
+
+
+def frame(screen, size=None, margin=20):
+    """Visible region (xmin, ymin, xmax, ymax) in turtle coordinates.
+
+    size=(w, h) gives a fixed canvas centred on the origin, as the Tk window
+    would; otherwise the canvas is fitted to the drawing plus margin.
+    """
+    if size is None:
+        xmin, ymin, xmax, ymax = screen.display.bounds() or (-200, -150, 200, 150)
+        return (math.floor(xmin) - margin, math.floor(ymin) - margin,
+                math.ceil(xmax) + margin, math.ceil(ymax) + margin)
+    return -size[0] / 2, -size[1] / 2, size[0] / 2, size[1] / 2
+
+
+def render(screen=None, size=None, margin=20, scale=1.0):
+    """Rasterize a screen's display list and return the Raster.
+
+    scale shrinks or enlarges the whole picture, pen sizes included
+    (0.25 gives a quarter-size thumbnail).
+    """
+    screen = screen or Screen()
+    return paint(screen.display.ops, frame(screen, size, margin), screen._bgcolor, scale)
+
+
+def paint(ops, box, bg, scale=1.0, raster=None):
+    """Rasterize ops over box = (xmin, ymin, xmax, ymax) onto a new Raster,
+    or on top of raster when one is given."""
+    xmin, ymin, xmax, ymax = box
+    if raster is None:
+        width = max(int((xmax - xmin) * scale), 1)
+        height = max(int((ymax - ymin) * scale), 1)
+        raster = Raster(width, height, bg)
+
+    def to_pixels(points):
+        return [((x - xmin) * scale, (ymax - y) * scale) for x, y in points]
+
+    for op in ops:
+        kind = op[0]
+        if kind == "fill":
+            raster.polygon(to_pixels(flatten(op[1])), op[2])
+        elif kind == "stroke":
+            raster.polyline(to_pixels(flatten(op[1])), op[2], op[3] * scale)
+        elif kind == "dot":
+            (x, y), = to_pixels([op[1]])
+            raster.disc(x, y, op[2] * scale / 2.0, op[3])
+        # "text" ops are recorded but not rasterized: there is no font renderer.
+    return raster
+
+
+def run_script(path, argv=()):
+    """Execute a turtle script against this module and return its screen.
+
+    The script sees sys.argv == [path, *argv], as if run from the shell.
+    """
+    reset_state()
+    module = sys.modules[__name__]
+    saved = sys.modules.get("turtle")
+    sys.modules["turtle"] = module
+    old_cwd, old_path, old_argv = os.getcwd(), list(sys.path), sys.argv
+    script_dir = os.path.dirname(os.path.abspath(path))
+    try:
+        os.chdir(script_dir)
+        sys.path.insert(0, script_dir)
+        sys.argv = [path] + list(argv)
+        try:
+            runpy.run_path(os.path.abspath(path), run_name="__main__")
+        except SystemExit:
+            pass
+    finally:
+        os.chdir(old_cwd)
+        sys.path[:] = old_path
+        sys.argv = old_argv
+        if saved is not None:
+            sys.modules["turtle"] = saved
+        else:
+            del sys.modules["turtle"]
+    return Screen()
+
+
+def install(output=None, size=None):
+    """Make ``import turtle`` resolve to this module from now on.
+
+    With output set, the drawing is written there when the interpreter
+    exits, so a script only needs ``import turtle_headless;
+    turtle_headless.install("out.png")`` before its own imports.
+    """
+    sys.modules["turtle"] = sys.modules[__name__]
+    if output:
+        import atexit
+        atexit.register(lambda: save(Screen(), output, size))
+
+
+def save(screen, output, size=None, scale=1.0):
+    """Write the drawing to output; .svg and .pdf are vector, anything else PNG
+    (at the given scale)."""
+    ext = os.path.splitext(output)[1].lower()
+    if ext in (".svg", ".pdf"):
+        import turtle_vector
+        data = turtle_vector.to_svg(screen, size) if ext == ".svg" else turtle_vector.to_pdf(screen, size)
+    else:
+        data = render(screen, size, scale=scale).to_png()
+    with open(output, "wb") as f:
+        f.write(data)
+    return output
+
+
+def render_script(path, output, size=None, argv=()):
+    return save(run_script(path, argv), output, size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render a turtle script to PNG/SVG/PDF without Tk")
+    parser.add_argument("script", help="turtle drawing script to run")
+    parser.add_argument("-o", "--output",
+                        help="output file, format from its extension (default: script name + .png)")
+    parser.add_argument("--size", help="fixed canvas size WxH centred on the origin")
+    parser.add_argument("script_args", nargs="*",
+                        help="arguments passed on to the script (after -- if they start with -)")
+    args = parser.parse_intermixed_args()
+    # run as a script this module is __main__; let turtle_vector's import find it
+    # instead of loading a second copy with its own Arc class and Screen
+    sys.modules.setdefault("turtle_headless", sys.modules[__name__])
+
+    output = args.output or os.path.splitext(os.path.basename(args.script))[0] + ".png"
+    size = tuple(int(v) for v in args.size.lower().split("x")) if args.size else None
+    render_script(args.script, output, size, args.script_args)
+    print("Saved: {}".format(output))
+
+
+if __name__ == "__main__":
+    main()
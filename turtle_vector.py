@@ -0,0 +1,237 @@
+"""SVG and PDF output for drawings recorded by turtle_headless
+
+Works straight from the display list: circle() arcs stay arcs (SVG "A"
+commands, cubic Béziers in PDF) instead of the chords the Tk window draws,
+so the files are resolution-independent and stay small even for large
+pictures.
+
+    python turtle_headless.py "Draw Bing Duen Duen with Python.py" -o bdd.svg
+    python turtle_headless.py "Draw MTR route_map (2025)/Draw MTR route_map (2025).py" -o mtr.pdf
+"""
+import math
+import zlib
+
+from turtle_headless import Arc, Screen, frame
+
+
+def _num(v):
+    """Shortest fixed-point form: 12.5 instead of 12.500000."""
+    text = "{:.2f}".format(v).rstrip("0").rstrip(".")
+    return "0" if text == "-0" else text
+
+
+def _hex(rgb):
+    return "#{:02x}{:02x}{:02x}".format(*rgb)
+
+
+def _split(arc, max_sweep):
+    """Break an arc into pieces of at most max_sweep degrees: [(a0, a1), ...]."""
+    pieces = max(1, int(math.ceil(abs(arc.sweep) / max_sweep - 1e-9)))
+    step = arc.sweep / pieces
+    return [(arc.start + step * i, arc.start + step * (i + 1)) for i in range(pieces)]
+
+
+def _point_on(arc, angle):
+    a = math.radians(angle)
+    return arc.cx + arc.radius * math.cos(a), arc.cy + arc.radius * math.sin(a)
+
+
+def _runs(ops):
+    """Yield ops with consecutive same-style strokes merged into
+    ("strokes", [path, ...], rgb, width), so recursive drawings such as the
+    Sakura tree become a handful of path elements rather than thousands."""
+    run = None
+    for op in ops:
+        if op[0] == "stroke" and len(op[1]) > 1:
+            if run is not None and run[2:] == op[2:]:
+                run[1].append(op[1])
+                continue
+            if run is not None:
+                yield run
+            run = ("strokes", [op[1]], op[2], op[3])
+            continue
+        if run is not None:
+            yield run
+            run = None
+        yield op
+    if run is not None:
+        yield run
+
+
+def _font(font):
+    family = font[0] if len(font) > 0 else "Arial"
+    size = font[1] if len(font) > 1 else 8
+    style = font[2].lower() if len(font) > 2 else "normal"
+    return family, abs(size), "bold" in style, "italic" in style
+
+
+# ---------------------------------------------------------------------------
+# SVG
+# ---------------------------------------------------------------------------
+
+def svg_path(path, xmin, ymax):
+    """SVG path data, flipping y so turtle's upward y points up on the page."""
+    x, y = path[0]
+    parts = ["M{} {}".format(_num(x - xmin), _num(ymax - y))]
+    for node in path[1:]:
+        if isinstance(node, Arc):
+            r = _num(node.radius)
+            # counter-clockwise in turtle space is counter-clockwise on the
+            # flipped page too, which SVG calls sweep-flag 0
+            flag = 0 if node.sweep > 0 else 1
+            for _, a1 in _split(node, 180):
+                x, y = _point_on(node, a1)
+                parts.append("A{} {} 0 0 {} {} {}".format(
+                    r, r, flag, _num(x - xmin), _num(ymax - y)))
+        else:
+            x, y = node
+            parts.append("L{} {}".format(_num(x - xmin), _num(ymax - y)))
+    return "".join(parts)
+
+
+def _escape(text):
+    return (text.replace("&", "&amp;").replace("<", "&lt;")
+            .replace(">", "&gt;").replace('"', "&quot;"))
+
+
+def to_svg(screen=None, size=None, margin=20):
+    """SVG document (bytes) for a screen's display list."""
+    screen = screen or Screen()
+    xmin, ymin, xmax, ymax = frame(screen, size, margin)
+    width, height = xmax - xmin, ymax - ymin
+    out = ['<svg xmlns="http://www.w3.org/2000/svg" width="{w}" height="{h}" '
+           'viewBox="0 0 {w} {h}">'.format(w=_num(width), h=_num(height)),
+           '<rect width="100%" height="100%" fill="{}"/>'.format(_hex(screen._bgcolor)),
+           '<g fill="none" stroke-linecap="round" stroke-linejoin="round">']
+    anchors = {"left": "start", "center": "middle", "right": "end"}
+    for op in _runs(screen.display.ops):
+        kind = op[0]
+        if kind == "strokes":
+            out.append('<path d="{}" stroke="{}" stroke-width="{}"/>'.format(
+                "".join(svg_path(path, xmin, ymax) for path in op[1]),
+                _hex(op[2]), _num(max(op[3], 1))))   # Tk draws width 0 as 1px
+        elif kind == "fill" and op[1]:
+            out.append('<path d="{}Z" fill="{}" fill-rule="evenodd"/>'.format(
+                svg_path(op[1], xmin, ymax), _hex(op[2])))
+        elif kind == "dot":
+            (x, y), diameter, rgb = op[1], op[2], op[3]
+            out.append('<circle cx="{}" cy="{}" r="{}" fill="{}"/>'.format(
+                _num(x - xmin), _num(ymax - y), _num(diameter / 2.0), _hex(rgb)))
+        elif kind == "text":
+            (x, y), text, rgb, font, align = op[1:]
+            family, pt, bold, italic = _font(font)
+            # like Tk, the last line sits on the anchor and earlier lines stack upwards
+            rows = text.split("\n")
+            leading = pt * 4 / 3.0 * 1.2
+            spans = "".join('<tspan x="{}" y="{}">{}</tspan>'.format(
+                _num(x - xmin), _num(ymax - y - leading * (len(rows) - 1 - i)), _escape(row))
+                for i, row in enumerate(rows))
+            out.append('<text fill="{}" font-family="{}" font-size="{}pt"{}{} '
+                       'text-anchor="{}">{}</text>'.format(
+                           _hex(rgb), _escape(family), pt,
+                           ' font-weight="bold"' if bold else "",
+                           ' font-style="italic"' if italic else "",
+                           anchors.get(align, "start"), spans))
+    out.append("</g></svg>\n")
+    return "\n".join(out).encode("utf-8")
+
+
+# ---------------------------------------------------------------------------
+# PDF
+# ---------------------------------------------------------------------------
+
+PDF_FONTS = {
+    (False, False): "Helvetica", (True, False): "Helvetica-Bold",
+    (False, True): "Helvetica-Oblique", (True, True): "Helvetica-BoldOblique",
+}
+
+
+def pdf_path(path, xmin, ymin):
+    """PDF path operators; arcs become cubic Béziers of at most 90 degrees."""
+    x, y = path[0]
+    parts = ["{} {} m".format(_num(x - xmin), _num(y - ymin))]
+    for node in path[1:]:
+        if isinstance(node, Arc):
+            for a0, a1 in _split(node, 90):
+                k = 4.0 / 3.0 * math.tan(math.radians(a1 - a0) / 4.0) * node.radius
+                (x0, y0), (x3, y3) = _point_on(node, a0), _point_on(node, a1)
+                r0, r1 = math.radians(a0), math.radians(a1)
+                x1, y1 = x0 - k * math.sin(r0), y0 + k * math.cos(r0)
+                x2, y2 = x3 + k * math.sin(r1), y3 - k * math.cos(r1)
+                parts.append(" ".join(_num(v) for v in (
+                    x1 - xmin, y1 - ymin, x2 - xmin, y2 - ymin, x3 - xmin, y3 - ymin)) + " c")
+        else:
+            x, y = node
+            parts.append("{} {} l".format(_num(x - xmin), _num(y - ymin)))
+    return "\n".join(parts)
+
+
+def _pdf_color(rgb, op):
+    return "{} {} {} {}".format(*(_num(c / 255.0) for c in rgb), op)
+
+
+def _pdf_text(text):
+    raw = text.encode("latin-1", "replace").decode("latin-1")
+    return raw.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def pdf_content(screen, xmin, ymin, xmax, ymax):
+    out = [_pdf_color(screen._bgcolor, "rg"),
+           "0 0 {} {} re f".format(_num(xmax - xmin), _num(ymax - ymin)),
+           "1 J 1 j"]
+    for op in _runs(screen.display.ops):
+        kind = op[0]
+        if kind == "strokes":
+            out += [_pdf_color(op[2], "RG"), "{} w".format(_num(op[3]))]
+            out += [pdf_path(path, xmin, ymin) for path in op[1]]
+            out.append("S")
+        elif kind == "fill" and op[1]:
+            out += [_pdf_color(op[2], "rg"), pdf_path(op[1], xmin, ymin), "h f*"]
+        elif kind == "dot":
+            (x, y), diameter, rgb = op[1], op[2], op[3]
+            r = diameter / 2.0
+            disc = [(x + r, y), Arc(x, y, r, 0.0, 360.0, 1)]
+            out += [_pdf_color(rgb, "rg"), pdf_path(disc, xmin, ymin), "h f"]
+        elif kind == "text":
+            (x, y), text, rgb, font, align = op[1:]
+            _, pt, bold, italic = _font(font)
+            rows = text.split("\n")
+            out.append(_pdf_color(rgb, "rg"))
+            for i, row in enumerate(rows):
+                # no font metrics here: approximate Helvetica's average advance
+                shift = {"center": 0.5, "right": 1.0}.get(align, 0.0) * 0.55 * pt * len(row)
+                out.append("BT /F{} {} Tf {} {} Td ({}) Tj ET".format(
+                    list(PDF_FONTS).index((bold, italic)) + 1, pt, _num(x - xmin - shift),
+                    _num(y - ymin + pt * 1.2 * (len(rows) - 1 - i)), _pdf_text(row)))
+    return "\n".join(out).encode("latin-1")
+
+
+def to_pdf(screen=None, size=None, margin=20):
+    """Single-page PDF document (bytes), one PDF point per turtle unit."""
+    screen = screen or Screen()
+    xmin, ymin, xmax, ymax = frame(screen, size, margin)
+    content = zlib.compress(pdf_content(screen, xmin, ymin, xmax, ymax), 9)
+    fonts = " ".join("/F{} {} 0 R".format(i + 1, 5 + i) for i in range(len(PDF_FONTS)))
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {} {}] /Contents 4 0 R "
+        "/Resources << /Font << {} >> >> >>".format(
+            _num(xmax - xmin), _num(ymax - ymin), fonts).encode("latin-1"),
+        b"<< /Length " + str(len(content)).encode() + b" /Filter /FlateDecode >>\nstream\n"
+        + content + b"\nendstream",
+    ] + ["<< /Type /Font /Subtype /Type1 /BaseFont /{} /Encoding /WinAnsiEncoding >>".format(
+        name).encode("latin-1") for name in PDF_FONTS.values()]
+
+    data = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(data))
+        data += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(data)
+    data += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        data += b"%010d 00000 n \n" % offset
+    data += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%EOF\n" % (
+        len(objects) + 1, xref)
+    return bytes(data)